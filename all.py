@@ -1,11 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
-from openai import OpenAI
-import anthropic
 import subprocess
-import google.generativeai as genai
-from playwright.sync_api import sync_playwright
-import os
+
+from providers import get_openai_client, get_claude_client, get_gemini_model
+from aoc_fast import PROMPT_DOC_STDIN as AOC_FAST_DOC
+from forkserver import helpers_env
 
 # =========================
 # 0. Modèles & config
@@ -17,31 +14,47 @@ GPT_MODEL = "o3"
 # GEMINI_MODEL = "gemini-2.5-pro"
 GEMINI_MODEL = "gemini-2.5-flash"
 
-# Config Gemini (nécessite GEMINI_API_KEY dans les variables d'env)
-genai.configure(api_key=os.environ.get("GOOGLE_API_KEY", ""))
+# Les clients LLM sont importés et créés à la demande (voir providers.py)
 
 
 # =========================
 # 1. Scraping
 # =========================
 
-def fetch_and_save_to_file(url: str, selector: str, output_file: str = "input.txt") -> None:
+def fetch_and_save_to_file(url: str, selector: str, output_file: str = "input.txt",
+                           context=None, settle_ms: int = 2000) -> int | None:
     """
     Ouvre une page avec la session edge_state.json,
     récupère le texte du selecteur CSS donné
     et l'ajoute à output_file.
+    - context : contexte Playwright déjà ouvert (navigateur chaud, cf. unlock_scheduler.py) ;
+      sinon un navigateur est lancé puis fermé
+    - settle_ms : délai laissé au JS de la page (0 pour du texte brut comme /input)
+    Retourne le statut HTTP de la réponse principale (None si inconnue).
     """
+    if context is not None:
+        return _save_page_text(context, url, selector, output_file, settle_ms)
+
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         context = browser.new_context(storage_state="edge_state.json")
+        try:
+            return _save_page_text(context, url, selector, output_file, settle_ms)
+        finally:
+            browser.close()
 
-        page = context.new_page()
 
+def _save_page_text(context, url: str, selector: str, output_file: str, settle_ms: int) -> int | None:
+    page = context.new_page()
+    try:
         # On récupère la réponse principale
         response = page.goto(url)
 
         # Petit délai si la page charge du JS
-        page.wait_for_timeout(2000)
+        if settle_ms:
+            page.wait_for_timeout(settle_ms)
 
         if not response:
             print("❓ Impossible d'obtenir la réponse principale")
@@ -73,7 +86,9 @@ def fetch_and_save_to_file(url: str, selector: str, output_file: str = "input.tx
         else:
             print("⚠️ Aucun contenu à écrire dans le fichier.")
 
-        browser.close()
+        return response.status if response else None
+    finally:
+        page.close()
 
 def scrape_text(url, selector=None):
     """
@@ -82,6 +97,9 @@ def scrape_text(url, selector=None):
     - selector : sélecteur CSS pour cibler une zone précise (optionnel)
     """
 
+    import requests
+    from bs4 import BeautifulSoup
+
     headers = {
         "User-Agent": "Mozilla/5.0"
     }
@@ -124,9 +142,9 @@ def read_text_file(path, encoding="utf-8"):
 # 3. Clients LLM
 # =========================
 
-openai_client = OpenAI()                # utilise OPENAI_API_KEY
-claude_client = anthropic.Anthropic()   # utilise ANTHROPIC_API_KEY
-gemini_model = genai.GenerativeModel(GEMINI_MODEL)  # utilise GEMINI_API_KEY
+# get_openai_client()              : utilise OPENAI_API_KEY
+# get_claude_client()              : utilise ANTHROPIC_API_KEY
+# get_gemini_model(GEMINI_MODEL)   : utilise GOOGLE_API_KEY
 
 
 COMMON_INSTRUCTION = """
@@ -148,7 +166,7 @@ OUTPUT CONSTRAINTS (VERY IMPORTANT):
 
 SUMMARY:
 - Response = only a full Python 3 script, with zero markdown, zero backticks, and zero surrounding text.
-"""
+""" + AOC_FAST_DOC
 
 def remove_code_fences(text):
     lines = text.strip().splitlines()
@@ -181,7 +199,7 @@ Voici l'énoncé du problème (incluant éventuellement des exemples) :
 {problem_statement}
 """
 
-    response = openai_client.responses.create(
+    response = get_openai_client().responses.create(
         model=GPT_MODEL,
         input=[{"role": "user", "content": prompt}],
     )
@@ -207,7 +225,7 @@ Voici l'énoncé du problème (incluant éventuellement des exemples) :
 {problem_statement}
 """
 
-    resp = claude_client.messages.create(
+    resp = get_claude_client().messages.create(
         model=CLAUDE_MODEL,
         max_tokens=8192,
         messages=[
@@ -243,7 +261,7 @@ Voici l'énoncé du problème (incluant éventuellement des exemples) :
 {problem_statement}
 """
 
-    resp = gemini_model.generate_content(prompt)
+    resp = get_gemini_model(GEMINI_MODEL).generate_content(prompt)
 
     # Sur le client google.generativeai, le texte principal est en resp.text
     code = resp.text or ""
@@ -274,7 +292,8 @@ def execute_generated_code(input_text: str, filename: str) -> str:
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True
+        text=True,
+        env=helpers_env(),   # import aoc_fast
     )
 
     stdout, stderr = process.communicate(input_text)
@@ -289,7 +308,7 @@ def execute_generated_code(input_text: str, filename: str) -> str:
 # 6. Pipeline complet AoC (Partie 1, duel/truel Claude vs ChatGPT vs Gemini)
 # =========================
 
-def solve_advent_of_code_with_all(problem_url: str, input_path: str):
+def solve_advent_of_code_with_all(problem_url: str, input_path: str, problem_text: str | None = None):
     """
     - Scrap l'énoncé AoC
     - Lit l'input local
@@ -297,11 +316,13 @@ def solve_advent_of_code_with_all(problem_url: str, input_path: str):
     - Sauvegarde les trois solvers
     - Exécute les trois solvers sur le même input
     - Affiche les trois réponses
+    problem_text : énoncé déjà récupéré (ex. à l'ouverture, par unlock_scheduler.py)
     """
     selector = "article.day-desc"
 
-    print("Scraping de l'énoncé sur :", problem_url)
-    problem_text = scrape_text(problem_url, selector)
+    if problem_text is None:
+        print("Scraping de l'énoncé sur :", problem_url)
+        problem_text = scrape_text(problem_url, selector)
 
     print("Lecture de l'input depuis :", input_path)
     input_text = read_text_file(input_path)
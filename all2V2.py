@@ -1,12 +1,25 @@
 
-import requests
-from bs4 import BeautifulSoup
-from openai import OpenAI
-import anthropic
+import argparse
 import subprocess
 import os
-import google.generativeai as genai
-from google.api_core.exceptions import GoogleAPIError
+import math
+import re
+import time
+import tempfile
+import hashlib
+import threading
+from queue import Queue, Empty
+
+from providers import get_openai_client, get_claude_client, get_gemini_model, gemini_api_error
+from results_store import ResultsStore, RESULTS_DB_PATH, code_hash
+from interpreters import available_interpreters, compatible_interpreters, DEFAULT_INTERPRETER
+from normalize import normalized_hash
+from aoc_fast import PROMPT_DOC as AOC_FAST_DOC
+from forkserver import ForkServer, helpers_env
+from job_queue import open_queue, run_remote, QUEUE_URL_ENV
+from dag import Stage, ArtifactCache, ARTIFACT_DIR, run_dag, value_hash
+from prompt_compaction import compact_part1, pick_smaller
+from model_router import route, answers_settled
 
 # =========================
 # 1. Modèles & Scraping
@@ -15,9 +28,7 @@ CLAUDE_MODEL = "claude-sonnet-4-20250514"
 GPT_MODEL = "o3-mini"
 GEMINI_MODEL = "gemini-2.5-flash"
 
-# Config Gemini (utilise GOOGLE_API_KEY)
-genai.configure(api_key=os.environ.get("GOOGLE_API_KEY", ""))
-gemini_model = genai.GenerativeModel(GEMINI_MODEL)
+# Les clients (et Gemini, via GOOGLE_API_KEY) sont créés à la demande : voir providers.py
 
 
 def remove_code_fences(text: str) -> str:
@@ -32,17 +43,26 @@ def remove_code_fences(text: str) -> str:
     return "\n".join(cleaned)
 
 
-def scrape_text(url: str, selector: str | None = None) -> str:
+def fetch_page_html(url: str) -> str:
+    import requests
+    headers = {"User-Agent": "Mozilla/5.0"}
+    response = requests.get(url, headers=headers)
+    response.raise_for_status()
+    return response.text
+
+
+def scrape_text(url: str, selector: str | None = None, html: str | None = None) -> str:
     """
     Scrape le texte d'une page web.
     - url : URL de la page à scraper
     - selector : sélecteur CSS pour cibler une zone précise (optionnel)
+    - html : HTML déjà téléchargé (évite une seconde requête)
     """
-    headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
+    if html is None:
+        html = fetch_page_html(url)
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
 
     if not selector:
         return soup.get_text(separator="\n", strip=True)
@@ -51,6 +71,53 @@ def scrape_text(url: str, selector: str | None = None) -> str:
     return "\n\n".join([el.get_text(strip=True) for el in elements])
 
 
+def extract_example_from_html(html: str, selector: str = "article.day-desc") -> tuple[str | None, str | None]:
+    """
+    Extrait l'exemple travaillé de l'énoncé AoC :
+    - l'input d'exemple = premier <pre><code> précédé d'un paragraphe qui parle d'"example"
+      (à défaut, le premier <pre><code>) ;
+    - la réponse attendue = dernier <code><em>...</em></code> de l'article (convention AoC).
+    Retourne (input d'exemple, réponse attendue), chaque élément pouvant valoir None.
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    articles = soup.select(selector)
+    if not articles:
+        return None, None
+    article = articles[0]
+
+    blocks = article.select("pre > code")
+    example_input = None
+    for block in blocks:
+        previous = block.parent.find_previous_sibling("p")
+        if previous is not None and "example" in previous.get_text().lower():
+            example_input = block.get_text()
+            break
+    if example_input is None and blocks:
+        example_input = blocks[0].get_text()
+
+    answers = article.select("code em")
+    expected = answers[-1].get_text(strip=True) if answers else None
+    return example_input, expected
+
+
+def extract_expected_answer_from_text(text: str) -> str | None:
+    """
+    Réponse de l'exemple dans un énoncé texte (enonce2.txt) : dernier nombre du
+    dernier paragraphe avant la question finale ("... is 10 + 12 + 11 = 33.").
+    """
+    if "--- Part Two ---" in text:
+        text = text.split("--- Part Two ---", 1)[1]
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    # La question finale se termine par "?"
+    while paragraphs and paragraphs[-1].endswith("?"):
+        paragraphs.pop()
+    if not paragraphs:
+        return None
+    numbers = re.findall(r"-?\d+", paragraphs[-1])
+    return numbers[-1] if numbers else None
+
+
 # =========================
 # 2. Lecture fichier input / énoncé
 # =========================
@@ -75,8 +142,9 @@ def read_text_file(path: str, encoding: str = "utf-8") -> str | None:
 # 3. Clients LLM
 # =========================
 
-openai_client = OpenAI()                 # utilise OPENAI_API_KEY
-claude_client = anthropic.Anthropic()    # utilise ANTHROPIC_API_KEY
+# get_openai_client()  : utilise OPENAI_API_KEY
+# get_claude_client()  : utilise ANTHROPIC_API_KEY
+# get_gemini_model()   : utilise GOOGLE_API_KEY
 
 # 🔁 Nouvelle consigne : lire 'input.txt' dans le même répertoire que le script généré
 COMMON_INSTRUCTION_PART2 = r"""
@@ -114,15 +182,71 @@ The response must be ONLY raw executable Python code.
 
 SUMMARY:
 Output = a single fully executable Python 3 script that reads from `input.txt` in the same directory, prints ONLY the final answer, with zero markdown/prose/extraneous characters.
-"""
+""" + AOC_FAST_DOC
 
 
-# =========================
-# 3.a Génération de code PARTIE 2 avec ChatGPT (OpenAI)
-# =========================
+# Échelle d'effort de raisonnement : génération en "low", puis un cran de plus
+# à chaque tour de suivi provoqué par un exemple faux ou un crash.
+# OpenAI (modèles o* / gpt-5) : reasoning.effort ; Claude : extended thinking
+# (budget par niveau) ; Gemini : pas de réglage dans le SDK utilisé.
+REASONING_LADDER = True
+REASONING_EFFORTS = ("low", "medium", "high")
+ESCALATE_EFFORT_ON = {"wrong_example", "failed"}
+CLAUDE_THINKING_BUDGETS = {"low": None, "medium": 4000, "high": 16000}   # tokens (None = sans thinking)
+CLAUDE_MAX_OUTPUT_TOKENS = 8192
+# Au-delà (~21,3k tokens : 10 min estimées à 128k tokens/h), le SDK Anthropic
+# refuse un appel non streamé : on passe alors par messages.stream
+CLAUDE_NON_STREAMING_MAX_TOKENS = 21000
+
+
+def initial_effort() -> str | None:
+    return REASONING_EFFORTS[0] if REASONING_LADDER else None
+
+
+def next_effort(effort: str | None) -> str | None:
+    if effort is None:
+        return None
+    return REASONING_EFFORTS[min(REASONING_EFFORTS.index(effort) + 1, len(REASONING_EFFORTS) - 1)]
+
+
+def openai_reasoning_args(effort: str | None) -> dict:
+    if effort is None or not GPT_MODEL.startswith(("o1", "o3", "o4", "gpt-5")):
+        return {}
+    return {"reasoning": {"effort": effort}}
+
+
+def claude_create(**kwargs):
+    """messages.create, ou messages.stream (réponse finale) quand max_tokens dépasse la limite non streamée."""
+    client = get_claude_client()
+    if kwargs.get("max_tokens", 0) <= CLAUDE_NON_STREAMING_MAX_TOKENS:
+        return client.messages.create(**kwargs)
+    with client.messages.stream(**kwargs) as stream:
+        return stream.get_final_message()
+
+
+def claude_thinking_args(effort: str | None) -> dict:
+    budget = CLAUDE_THINKING_BUDGETS.get(effort) if effort else None
+    if budget is None:
+        return {"max_tokens": CLAUDE_MAX_OUTPUT_TOKENS}
+    return {"max_tokens": CLAUDE_MAX_OUTPUT_TOKENS + budget,
+            "thinking": {"type": "enabled", "budget_tokens": budget}}
+
+
+# Budget (tokens) de l'énoncé partie 1 envoyé aux modèles : le récit et les
+# exemples déroulés sont retirés au-delà (voir prompt_compaction.py). None = énoncé complet.
+PART1_TOKEN_BUDGET: int | None = 1000
 
-def generate_solver_code_gpt_part2(problem_part1_text: str, problem_part2_text: str) -> str:
-    prompt = f"""
+
+def add_usage(usage: dict | None, input_tokens: int | None, output_tokens: int | None) -> None:
+    """Cumule les tokens consommés dans `usage` (si fourni) ; les champs absents comptent pour 0."""
+    if usage is None:
+        return
+    usage["input_tokens"] = usage.get("input_tokens", 0) + (input_tokens or 0)
+    usage["output_tokens"] = usage.get("output_tokens", 0) + (output_tokens or 0)
+
+
+def build_part2_prompt(problem_part1_text: str, problem_part2_text: str) -> str:
+    return f"""
 Here is PART 1 (context):
 -----------------------------------------
 {problem_part1_text}
@@ -131,13 +255,33 @@ Here is PART 2 (to implement):
 -----------------------------------------
 {problem_part2_text}
 """
-    response = openai_client.responses.create(
+
+
+# =========================
+# 3.a Génération de code PARTIE 2 avec ChatGPT (OpenAI)
+# =========================
+
+def generate_solver_code_gpt_part2(problem_part1_text: str, problem_part2_text: str, usage: dict | None = None,
+                                   effort: str | None = None) -> str:
+    prompt = build_part2_prompt(problem_part1_text, problem_part2_text)
+    response = get_openai_client().responses.create(
         model=GPT_MODEL,  # ou "gpt-5.1" si tu l'as
         input=[
             {"role": "system", "content": COMMON_INSTRUCTION_PART2},
             {"role": "user", "content": prompt}
         ],
+        **openai_reasoning_args(effort),
     )
+    add_openai_usage(usage, response)
+    return extract_openai_text(response)
+
+
+def add_openai_usage(usage: dict | None, response) -> None:
+    u = getattr(response, "usage", None)
+    add_usage(usage, getattr(u, "input_tokens", None), getattr(u, "output_tokens", None))
+
+
+def extract_openai_text(response) -> str:
     code = getattr(response, "output_text", None)
     if not code:
         # Fallback extraction if SDK variant returns structured content
@@ -155,26 +299,34 @@ Here is PART 2 (to implement):
 # 3.b Génération de code PARTIE 2 avec Claude (Anthropic)
 # =========================
 
-def generate_solver_code_claude_part2(problem_part1_text: str, problem_part2_text: str) -> str:
-    prompt = f"""
-Here is PART 1 (context):
------------------------------------------
-{problem_part1_text}
+# Consigne système marquée "cache_control" : le même préfixe est réutilisé
+# par les tours de réparation, qui profitent ainsi du prompt caching.
+CLAUDE_SYSTEM_PART2 = [
+    {"type": "text", "text": COMMON_INSTRUCTION_PART2, "cache_control": {"type": "ephemeral"}}
+]
 
-Here is PART 2 (to implement):
------------------------------------------
-{problem_part2_text}
-"""
-    resp = claude_client.messages.create(
+
+def generate_solver_code_claude_part2(problem_part1_text: str, problem_part2_text: str, usage: dict | None = None,
+                                      effort: str | None = None) -> str:
+    prompt = build_part2_prompt(problem_part1_text, problem_part2_text)
+    resp = claude_create(
         model=CLAUDE_MODEL,
-        # max_tokens=8192,
-        system=COMMON_INSTRUCTION_PART2,   # ✅ top-level
+        system=CLAUDE_SYSTEM_PART2,   # ✅ top-level (le rôle "system" n'existe pas dans messages)
         messages=[
-            {"role": "system", "content": COMMON_INSTRUCTION_PART2},
             {"role": "user", "content": prompt}
         ],
+        **claude_thinking_args(effort),
     )
+    add_claude_usage(usage, resp)
+    return extract_claude_text(resp)
+
 
+def add_claude_usage(usage: dict | None, resp) -> None:
+    u = getattr(resp, "usage", None)
+    add_usage(usage, getattr(u, "input_tokens", None), getattr(u, "output_tokens", None))
+
+
+def extract_claude_text(resp) -> str:
     parts = []
     for block in resp.content:
         if block.type == "text":
@@ -187,23 +339,26 @@ Here is PART 2 (to implement):
 # 3.c Génération de code PARTIE 2 avec Gemini
 # =========================
 
-def generate_solver_code_gemini_part2(problem_part1_text: str, problem_part2_text: str) -> str:
-    prompt = f"""
-{COMMON_INSTRUCTION_PART2}
-Here is PART 1 (context):
------------------------------------------
-{problem_part1_text}
+def build_gemini_part2_prompt(problem_part1_text: str, problem_part2_text: str) -> str:
+    # Gemini n'a pas de rôle système ici : la consigne est préfixée au prompt
+    return COMMON_INSTRUCTION_PART2 + build_part2_prompt(problem_part1_text, problem_part2_text)
 
-Here is PART 2 (to implement):
------------------------------------------
-{problem_part2_text}
-"""
+
+def add_gemini_usage(usage: dict | None, resp) -> None:
+    u = getattr(resp, "usage_metadata", None)
+    add_usage(usage, getattr(u, "prompt_token_count", None), getattr(u, "candidates_token_count", None))
+
+
+def generate_solver_code_gemini_part2(problem_part1_text: str, problem_part2_text: str, usage: dict | None = None,
+                                      effort: str | None = None) -> str:
+    prompt = build_gemini_part2_prompt(problem_part1_text, problem_part2_text)
     try:
-        resp = gemini_model.generate_content(prompt)
+        resp = get_gemini_model(GEMINI_MODEL).generate_content(prompt)
+        add_gemini_usage(usage, resp)
         code = resp.text or ""
         code = remove_code_fences(code)
         return code
-    except GoogleAPIError as e:
+    except gemini_api_error() as e:
         print("⚠️ Gemini PARTIE 2 : erreur API (quota, modèle, etc.). On ignore Gemini pour cette exécution.")
         print(e)
         return ""
@@ -213,6 +368,119 @@ Here is PART 2 (to implement):
         return ""
 
 
+# =========================
+# 3.d Réparation : on renvoie stderr au même modèle (tour de suivi)
+# =========================
+
+MAX_REPAIR_ATTEMPTS = 2          # tours de réparation max par fournisseur
+REPAIR_INPUT_SAMPLE_CHARS = 1500  # extrait de input.txt joint au message de réparation
+
+
+def build_repair_message(stderr: str, input_text: str | None) -> str:
+    sample = (input_text or "")[:REPAIR_INPUT_SAMPLE_CHARS]
+    return f"""
+The script you wrote crashed when run on the real input.
+
+TRACEBACK / STDERR:
+-----------------------------------------
+{stderr.strip() or "(no stderr, but the script printed nothing)"}
+
+INPUT SAMPLE (first {REPAIR_INPUT_SAMPLE_CHARS} characters of input.txt):
+-----------------------------------------
+{sample}
+
+Fix the script. Same constraints as before: output ONLY the complete raw Python 3 script, no markdown, no prose.
+"""
+
+
+def build_example_message(example_input: str, expected: str, got: str, stderr: str) -> str:
+    return f"""
+The script you wrote gives a wrong result on the worked example from the problem statement.
+
+EXAMPLE INPUT (contents of input.txt):
+-----------------------------------------
+{example_input}
+-----------------------------------------
+EXPECTED OUTPUT: {expected}
+ACTUAL OUTPUT: {got or "(nothing)"}
+STDERR:
+{stderr.strip() or "(empty)"}
+
+Fix the script. Same constraints as before: output ONLY the complete raw Python 3 script, no markdown, no prose.
+"""
+
+
+def build_performance_message(timings: list[tuple[int, float]], total_lines: int,
+                              budget: float, projected: float | None) -> str:
+    observed = "\n".join(f"- {n} input lines: {t:.2f}s" for n, t in timings) or "- (no completed prefix run)"
+    projection = f"{projected:.1f}s" if projected is not None else "over the budget (a run timed out)"
+    return f"""
+The script you wrote is too slow. It must finish in under {budget:.0f} seconds on the full input ({total_lines} lines).
+
+OBSERVED RUNTIMES ON GROWING PREFIXES OF input.txt:
+{observed}
+Projected runtime on the full input: {projection}
+
+This suggests a brute-force or exponential approach. Rethink the algorithm's complexity:
+avoid enumerating states one by one, prefer linear algebra / integer programming (e.g. PuLP, scipy.optimize.milp),
+dynamic programming, memoization or problem decomposition.
+
+Same constraints as before: output ONLY the complete raw Python 3 script, no markdown, no prose.
+"""
+
+
+def repair_solver_code_gpt_part2(problem_part1_text: str, problem_part2_text: str, code: str, repair_message: str,
+                                 usage: dict | None = None, effort: str | None = None) -> str:
+    # Même préfixe que la génération initiale => prompt caching côté OpenAI
+    prompt = build_part2_prompt(problem_part1_text, problem_part2_text)
+    response = get_openai_client().responses.create(
+        model=GPT_MODEL,
+        input=[
+            {"role": "system", "content": COMMON_INSTRUCTION_PART2},
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": code},
+            {"role": "user", "content": repair_message},
+        ],
+        **openai_reasoning_args(effort),
+    )
+    add_openai_usage(usage, response)
+    return extract_openai_text(response)
+
+
+def repair_solver_code_claude_part2(problem_part1_text: str, problem_part2_text: str, code: str, repair_message: str,
+                                    usage: dict | None = None, effort: str | None = None) -> str:
+    prompt = build_part2_prompt(problem_part1_text, problem_part2_text)
+    resp = claude_create(
+        model=CLAUDE_MODEL,
+        system=CLAUDE_SYSTEM_PART2,
+        messages=[
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": code},
+            {"role": "user", "content": repair_message},
+        ],
+        **claude_thinking_args(effort),
+    )
+    add_claude_usage(usage, resp)
+    return extract_claude_text(resp)
+
+
+def repair_solver_code_gemini_part2(problem_part1_text: str, problem_part2_text: str, code: str, repair_message: str,
+                                    usage: dict | None = None, effort: str | None = None) -> str:
+    prompt = build_gemini_part2_prompt(problem_part1_text, problem_part2_text)
+    try:
+        chat = get_gemini_model(GEMINI_MODEL).start_chat(history=[
+            {"role": "user", "parts": [prompt]},
+            {"role": "model", "parts": [code]},
+        ])
+        resp = chat.send_message(repair_message)
+        add_gemini_usage(usage, resp)
+        return remove_code_fences(resp.text or "")
+    except gemini_api_error() as e:
+        print("⚠️ Gemini PARTIE 2 : erreur API pendant la réparation.")
+        print(e)
+        return ""
+
+
 # =========================
 # 4. Sauvegarde du code généré
 # =========================
@@ -226,126 +494,960 @@ def save_code_to_file(code: str, filename: str):
 # 5. Exécution du code généré (lit input.txt dans son répertoire)
 # =========================
 
-def execute_generated_code(filename: str) -> str:
+EXAMPLE_TIMEOUT = 2.0                   # secondes max sur l'exemple de l'énoncé
+SOLVER_TIME_BUDGET = 60.0               # secondes max pour un solveur sur l'input complet
+SCALING_PROBE_FRACTIONS = (0.125, 0.25, 0.5)  # préfixes de l'input utilisés pour mesurer la croissance
+SCALING_MIN_LINES = 16                  # en dessous, pas de sondage (input trop petit)
+SCALING_MIN_SIGNIFICANT_TIME = 0.2      # en dessous, le temps mesuré est surtout le démarrage de Python
+
+
+# CPython préchargé (aoc_fast, numpy, scipy) : un fork par exécution au lieu d'un
+# démarrage complet de l'interpréteur (cf. forkserver.py). POSIX uniquement.
+FORKSERVER_ENABLED = hasattr(os, "fork")
+
+_forkserver: ForkServer | None = None
+_forkserver_lock = threading.Lock()
+
+
+def get_forkserver() -> ForkServer:
+    global _forkserver
+    with _forkserver_lock:
+        if _forkserver is None or not _forkserver.alive():
+            _forkserver = ForkServer(scratch_dir=tmpfs_root())
+        return _forkserver
+
+
+def shutdown_forkserver() -> None:
+    global _forkserver
+    with _forkserver_lock:
+        if _forkserver is not None:
+            _forkserver.close()
+            _forkserver = None
+
+
+def start_generated_code(filename: str, command: str = "python"):
     """
-    Exécute le script Python généré. Le script généré lit lui-même 'input.txt'
-    dans son répertoire (selon la consigne). On ne lui passe pas stdin.
-    Retourne la sortie (stdout).
+    Lance le script (cwd = son répertoire, qui contient input.txt) avec
+    l'interpréteur `command` ; CPython passe par le forkserver si activé.
+    Retourne un subprocess.Popen (ou un ForkedProcess, même interface).
     """
+    if FORKSERVER_ENABLED and command in ("python", available_interpreters().get(DEFAULT_INTERPRETER)):
+        return get_forkserver().start(os.path.abspath(filename))
     # S'assure que le cwd contient le script et potentiellement input.txt
     cwd = os.path.dirname(os.path.abspath(filename)) or os.getcwd()
-
-    process = subprocess.Popen(
-        ["python", filename],
+    return subprocess.Popen(
+        [command, filename],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
-        cwd=cwd
+        cwd=cwd,
+        env=helpers_env(),   # import aoc_fast
     )
 
-    stdout, stderr = process.communicate()
+
+def run_generated_code(filename: str, timeout: float | None = None, command: str = "python") -> tuple[int, str, str]:
+    """
+    Exécute le script Python généré (sans stdin, il lit 'input.txt' lui-même).
+    Retourne (code de retour, stdout, stderr).
+    Lève subprocess.TimeoutExpired (processus tué) si timeout est dépassé.
+    """
+    process = start_generated_code(filename, command)
+
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        raise
+    return process.returncode, (stdout or "").strip(), stderr or ""
+
+
+def execute_generated_code(filename: str) -> str:
+    """
+    Exécute le script Python généré. Le script généré lit lui-même 'input.txt'
+    dans son répertoire (selon la consigne). On ne lui passe pas stdin.
+    Retourne la sortie (stdout).
+    """
+    _, stdout, stderr = run_generated_code(filename)
 
     if stderr:
         print(f"⚠️ Erreur dans le code généré ({filename}) :", stderr)
 
-    return (stdout or "").strip()
+    return stdout
 
 
-# =========================
-# 6. Pipeline complet AoC PARTIE 2 (GPT + Claude + Gemini)
-# =========================
+# Mode "mémoire" : chaque exécution a son propre répertoire sur tmpfs et l'input
+# est partagé via un fichier tmpfs en lecture seule par processus (lien symbolique,
+# jamais recopié par candidat). Rien n'est écrit dans le répertoire du projet.
+IN_MEMORY_EXECUTION = True
+
+_shared_inputs: set[str] = set()
+_shared_inputs_lock = threading.Lock()
 
-def solve_advent_of_code_part2_with_all(problem_url: str, input_path: str, part2_path: str):
+
+def tmpfs_root() -> str:
+    """/dev/shm (tmpfs) si disponible, sinon le répertoire temporaire du système."""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def share_input(input_text: str) -> str:
     """
-    - Scrap l’énoncé AoC (partie 1)
-    - Lit l’énoncé spécifique de la partie 2 depuis un fichier (enonce2.txt)
-    - (Le script généré lira 'input.txt' lui-même dans son répertoire)
-    - Demande à GPT, Claude et Gemini de générer un solver Python pour la PARTIE 2
-    - Sauvegarde les trois solvers
-    - Exécute les trois solvers (sans stdin)
-    - Affiche les trois réponses
+    Écrit input_text une seule fois sur tmpfs (nom = pid + hash du contenu), en
+    lecture seule, et renvoie son chemin. Les appels suivants du même processus
+    avec le même contenu (autres candidats, autres fournisseurs) réutilisent le
+    même fichier. Le pid dans le nom évite qu'un autre processus (pipeline,
+    worker de la file) supprime un fichier encore utilisé ici.
     """
-    selector = "article.day-desc"
+    digest = hashlib.sha256(input_text.encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(tmpfs_root(), f"aoc_input_{os.getpid()}_{digest}.txt")
+    with _shared_inputs_lock:
+        if not _shared_inputs:
+            sweep_stale_inputs()
+        if path not in _shared_inputs or not os.path.exists(path):
+            tmp_path = f"{path}.tmp"
+            save_code_to_file(input_text, tmp_path)
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, path)   # atomique : pas de lecture d'un fichier à moitié écrit
+            _shared_inputs.add(path)
+    return path
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True   # processus d'un autre utilisateur : on n'y touche pas
+    return True
+
+
+def sweep_stale_inputs() -> None:
+    """
+    Supprime les aoc_input_* laissés sur tmpfs par des processus terminés
+    (crash, kill -9) et les anciens noms sans pid.
+    """
+    root = tmpfs_root()
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith("aoc_input_"):
+            continue
+        owner = name[len("aoc_input_"):].split("_", 1)[0]
+        if "_" in name[len("aoc_input_"):] and owner.isdigit() and _pid_alive(int(owner)):
+            continue
+        try:
+            os.remove(os.path.join(root, name))
+        except OSError:
+            pass
 
-    print("Scraping de l'énoncé (partie 1) sur :", problem_url)
-    problem_part1_text = scrape_text(problem_url, selector)
 
-    print("Lecture de l'énoncé PARTIE 2 depuis :", part2_path)
-    problem_part2_text = read_text_file(part2_path) or ""
+def cleanup_shared_inputs() -> None:
+    """Supprime les fichiers d'input partagés créés par ce processus (et seulement eux)."""
+    with _shared_inputs_lock:
+        for path in _shared_inputs:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        _shared_inputs.clear()
 
-    # Optionnel : lecture locale de l'input pour validation humaine
-    # (le script généré ne lira pas cette variable, c'est pour debug)
-    print("Lecture de l'input depuis :", input_path)
-    input_text_debug = read_text_file(input_path)
-    if input_text_debug is None:
-        print("⚠️ Attention : 'input.txt' introuvable. Placez-le dans le même répertoire que ce programme et les scripts générés.")
 
-    # ========= ChatGPT =========
-    result_gpt = None
-    try:
-        print("\n=== [ChatGPT] Génération du code solveur PARTIE 2... ===\n")
-        code_gpt = generate_solver_code_gpt_part2(problem_part1_text, problem_part2_text)
-        filename_gpt = "generated_solution_part2_gpt.py"
-        save_code_to_file(code_gpt, filename_gpt)
-        print(f"[ChatGPT] Code généré et sauvegardé dans {filename_gpt}\n")
-
-        print("[ChatGPT] Exécution du solveur (lit input.txt dans le même répertoire)...\n")
-        result_gpt = execute_generated_code(filename_gpt)
-        print(f"[ChatGPT] Réponse : {result_gpt}\n")
-    except Exception as e:
-        print(f"❌ Erreur pipeline ChatGPT PARTIE 2 : {e}")
+def prepare_run_dir(code: str, shared_input: str) -> tempfile.TemporaryDirectory:
+    """Répertoire privé (tmpfs) avec solution.py et input.txt -> input partagé."""
+    tmp = tempfile.TemporaryDirectory(prefix="aoc_run_", dir=tmpfs_root())
+    save_code_to_file(code, os.path.join(tmp.name, "solution.py"))
+    os.symlink(shared_input, os.path.join(tmp.name, "input.txt"))
+    return tmp
+
+
+def run_code_on_input(code: str, input_text: str, timeout: float,
+                      command: str = "python") -> tuple[int, str, str, float]:
+    """
+    Exécute `code` dans un répertoire privé (tmpfs) dont 'input.txt' est un lien
+    vers l'input partagé correspondant à input_text.
+    Retourne (code de retour, stdout, stderr, durée en secondes).
+    """
+    with prepare_run_dir(code, share_input(input_text)) as tmp:
+        start = time.perf_counter()
+        returncode, stdout, stderr = run_generated_code(os.path.join(tmp, "solution.py"), timeout=timeout,
+                                                        command=command)
+        return returncode, stdout, stderr, time.perf_counter() - start
+
+
+# Course CPython / PyPy sur l'input complet (si plusieurs interpréteurs compatibles)
+INTERPRETER_RACE = True
+
+
+def choose_interpreters(code: str, store: ResultsStore | None = None) -> list[str]:
+    """
+    Interpréteurs à lancer pour ce code : le vainqueur historique (même hash)
+    s'il est encore compatible, sinon tous les compatibles (course), CPython
+    par défaut si aucun ne l'est (l'erreur d'import remontera à la réparation).
+    """
+    compatible = compatible_interpreters(code) or [DEFAULT_INTERPRETER]
+    known = store.fastest_interpreter(code_hash(code)) if store else None
+    if known in compatible:
+        return [known]
+    return compatible if INTERPRETER_RACE else compatible[:1]
+
+
+def race_on_input(code: str, input_text: str, timeout: float,
+                  interpreters: list[str]) -> tuple[int, str, str, float, str]:
+    """
+    Lance le code sous chaque interpréteur en parallèle (répertoires privés,
+    même input partagé). Le premier run réussi (code 0, sortie non vide)
+    gagne et les autres sont tués ; sinon on rend le dernier échec.
+    Retourne (code de retour, stdout, stderr, durée, interpréteur).
+    Lève subprocess.TimeoutExpired si rien n'a fini dans le timeout.
+    """
+    commands = available_interpreters()
+    shared = share_input(input_text)
+    dirs = [prepare_run_dir(code, shared) for _ in interpreters]
+    results: Queue = Queue()
+    procs: list[subprocess.Popen] = []
+    threads: list[threading.Thread] = []
+
+    def wait(name: str, process: subprocess.Popen) -> None:
+        stdout, stderr = process.communicate()
+        results.put((name, process.returncode, (stdout or "").strip(), stderr or "",
+                     time.perf_counter() - start))
 
-    # ========= Claude =========
-    result_claude = None
     try:
-        print("\n=== [Claude] Génération du code solveur PARTIE 2... ===\n")
-        code_claude = generate_solver_code_claude_part2(problem_part1_text, problem_part2_text)
-        filename_claude = "generated_solution_part2_claude.py"
-        save_code_to_file(code_claude, filename_claude)
-        print(f"[Claude] Code généré et sauvegardé dans {filename_claude}\n")
-
-        print("[Claude] Exécution du solveur (lit input.txt dans le même répertoire)...\n")
-        result_claude = execute_generated_code(filename_claude)
-        print(f"[Claude] Réponse : {result_claude}\n")
-    except Exception as e:
-        print(f"❌ Erreur pipeline Claude PARTIE 2 : {e}")
+        start = time.perf_counter()
+        for name, tmp in zip(interpreters, dirs):
+            process = start_generated_code(os.path.join(tmp.name, "solution.py"),
+                                           commands.get(name, "python"))
+            procs.append(process)
+            threads.append(threading.Thread(target=wait, args=(name, process), daemon=True))
+            threads[-1].start()
+        failure = None
+        for _ in procs:
+            remaining = max(0.0, timeout - (time.perf_counter() - start))
+            try:
+                name, returncode, stdout, stderr, elapsed = results.get(timeout=remaining)
+            except Empty:
+                raise subprocess.TimeoutExpired(interpreters, timeout)
+            if returncode == 0 and stdout:
+                return returncode, stdout, stderr, elapsed, name
+            failure = (returncode, stdout, stderr, elapsed, name)
+        return failure
+    finally:
+        for process in procs:
+            if process.poll() is None:
+                process.kill()
+        for thread in threads:
+            thread.join()
+        for tmp in dirs:
+            tmp.cleanup()
+
+
+# Mémo des exécutions, clé (hash du code normalisé, hash de l'input, interpréteur) :
+# en mémoire pour le run courant, et dans la table `executions` du ResultsStore
+# d'un run à l'autre. Un candidat identique à un autre (aux espaces, commentaires,
+# docstrings et noms de variables locales près) n'est jamais réexécuté.
+_execution_memo: dict[tuple[str, str, str], dict] = {}
+_memo_locks: dict[tuple[str, str], threading.Lock] = {}
+_memo_registry_lock = threading.Lock()
+
+
+def _memo_get(key: tuple[str, str], interpreter: str, store: ResultsStore | None) -> dict | None:
+    entry = _execution_memo.get((*key, interpreter))
+    if entry is None and store is not None:
+        entry = store.cached_execution(*key, interpreter)
+        if entry is not None:
+            _execution_memo[(*key, interpreter)] = entry
+    return entry
+
+
+def _memo_put(key: tuple[str, str], interpreter: str, store: ResultsStore | None, **entry) -> None:
+    """
+    Mémorise un résultat déterministe seulement : run terminé avec le code 0, ou
+    timeout (avec le budget expiré). Un crash, un OOM ou un enfant du forkserver
+    tué (-9) peut être transitoire : il n'est pas gardé et sera réexécuté.
+    """
+    entry = {"returncode": None, "stdout": None, "stderr": None, "timed_out": False, **entry}
+    if not entry["timed_out"] and entry["returncode"] != 0:
+        return
+    _execution_memo[(*key, interpreter)] = entry
+    if store is not None:
+        store.record_execution(normalized_hash=key[0], input_hash=key[1], interpreter=interpreter, **entry)
 
-    # ========= Gemini =========
-    result_gemini = None
+
+# Exécution déportée : si AOC_QUEUE_URL est défini (chemin SQLite ou redis://...),
+# les exécutions sont déposées dans la file et faites par des workers
+# (python job_queue.py worker), éventuellement sur d'autres machines.
+EXECUTION_QUEUE_URL: str | None = os.environ.get(QUEUE_URL_ENV)
+
+_execution_queue = None
+_execution_queue_lock = threading.Lock()
+
+
+def get_execution_queue():
+    global _execution_queue
+    with _execution_queue_lock:
+        if _execution_queue is None:
+            _execution_queue = open_queue(EXECUTION_QUEUE_URL)
+        return _execution_queue
+
+
+def memoized_run(code: str, input_text: str, timeout: float, interpreters: list[str],
+                 store: ResultsStore | None = None, local: bool = False) -> tuple[int, str, str, float, str]:
+    """
+    run_code_on_input / race_on_input avec mémo. Réutilise le run réussi le plus
+    rapide déjà connu ; sinon n'exécute que les interpréteurs sans résultat
+    exploitable (un timeout mémorisé ne compte que si son budget était >= timeout ;
+    les échecs ne sont pas mémorisés, cf. _memo_put).
+    Deux candidats identiques lancés en parallèle attendent l'un l'autre.
+    Avec EXECUTION_QUEUE_URL (et local=False), l'exécution passe par la file de jobs,
+    et se fait localement si aucun worker n'est vivant (ou si le worker échoue).
+    Retourne (code de retour, stdout, stderr, durée, interpréteur) ;
+    lève subprocess.TimeoutExpired comme run_generated_code.
+    """
+    key = (normalized_hash(code), hashlib.sha256(input_text.encode("utf-8")).hexdigest())
+    with _memo_registry_lock:
+        lock = _memo_locks.setdefault(key, threading.Lock())
+    with lock:
+        done, pending = [], []
+        for name in interpreters:
+            entry = _memo_get(key, name, store)
+            if entry is None or (entry["timed_out"] and entry["elapsed"] < timeout):
+                pending.append(name)
+            elif not entry["timed_out"] and entry["elapsed"] <= timeout:
+                done.append((entry["returncode"], entry["stdout"], entry["stderr"], entry["elapsed"], name))
+        succeeded = [r for r in done if r[0] == 0 and r[1]]
+        if succeeded:
+            return min(succeeded, key=lambda r: r[3])
+        if not pending:
+            if done:
+                return done[0]
+            raise subprocess.TimeoutExpired(interpreters, timeout)
+        try:
+            result = None
+            if EXECUTION_QUEUE_URL and not local:
+                try:
+                    result = run_remote(get_execution_queue(), code, input_text, timeout, pending)
+                except RuntimeError as e:
+                    print(f"⚠️ File d'exécution indisponible ({e}) : exécution locale.")
+            if result is None and len(pending) > 1:
+                result = race_on_input(code, input_text, timeout, pending)
+            elif result is None:
+                command = available_interpreters().get(pending[0], "python")
+                result = (*run_code_on_input(code, input_text, timeout, command), pending[0])
+        except subprocess.TimeoutExpired:
+            for name in pending:
+                _memo_put(key, name, store, elapsed=timeout, timed_out=True)
+            raise
+        returncode, stdout, stderr, elapsed, name = result
+        _memo_put(key, name, store, returncode=returncode, stdout=stdout, stderr=stderr, elapsed=elapsed)
+        return result
+
+
+def run_candidate(code: str, filename: str, input_text: str | None, timeout: float,
+                  interpreters: list[str] | None = None,
+                  store: ResultsStore | None = None) -> tuple[int, str, str, float, str]:
+    """
+    Exécution sur l'input complet : en mémoire (IN_MEMORY_EXECUTION) ou, à défaut,
+    via le fichier generated_solution_* à côté de input.txt (mode historique).
+    En mémoire, plusieurs interpréteurs font la course (race_on_input) et le
+    résultat est mémorisé (memoized_run).
+    Retourne (code de retour, stdout, stderr, durée, interpréteur).
+    """
+    interpreters = interpreters or [DEFAULT_INTERPRETER]
+    if IN_MEMORY_EXECUTION and input_text is not None:
+        return memoized_run(code, input_text, timeout, interpreters, store)
+    command = available_interpreters().get(interpreters[0], "python")
+    save_code_to_file(code, filename)
+    start = time.perf_counter()
+    returncode, stdout, stderr = run_generated_code(filename, timeout=timeout, command=command)
+    return returncode, stdout, stderr, time.perf_counter() - start, interpreters[0]
+
+
+def validate_on_example(code: str, example: tuple[str, str] | None,
+                        store: ResultsStore | None = None) -> tuple[bool, str, str]:
+    """
+    Pré-validation rapide : exécute le solveur sur l'exemple de l'énoncé avec un
+    timeout serré (EXAMPLE_TIMEOUT). Retourne (ok, sortie obtenue, stderr).
+    Sans exemple exploitable, le candidat passe.
+    """
+    if not example:
+        return True, "", ""
+    example_input, expected = example
     try:
-        print("\n=== [Gemini] Génération du code solveur PARTIE 2... ===\n")
-        code_gemini = generate_solver_code_gemini_part2(problem_part1_text, problem_part2_text)
+        returncode, stdout, stderr, _, _ = memoized_run(code, example_input, EXAMPLE_TIMEOUT,
+                                                        [DEFAULT_INTERPRETER], store)
+    except subprocess.TimeoutExpired:
+        return False, "", f"Timed out after {EXAMPLE_TIMEOUT:.0f}s on the tiny example input (far too slow)."
+    got = stdout.splitlines()[-1].strip() if stdout else ""
+    return returncode == 0 and got == expected, got, stderr
 
-        if code_gemini.strip():
-            filename_gemini = "generated_solution_part2_gemini.py"
-            save_code_to_file(code_gemini, filename_gemini)
-            print(f"[Gemini] Code généré et sauvegardé dans {filename_gemini}\n")
 
-            print("[Gemini] Exécution du solveur (lit input.txt dans le même répertoire)...\n")
-            result_gemini = execute_generated_code(filename_gemini)
-            print(f"[Gemini] Réponse : {result_gemini}\n")
+def probe_scaling(code: str, input_text: str, budget: float,
+                  store: ResultsStore | None = None) -> tuple[list[tuple[int, float]], float | None]:
+    """
+    Exécute le solveur sur des préfixes croissants de l'input et extrapole
+    le temps sur l'input complet (loi de puissance sur les deux derniers points).
+    Retourne (mesures [(nb lignes, secondes)], temps projeté) ; le temps projeté
+    vaut None si on ne peut rien conclure, math.inf si un préfixe a déjà expiré.
+    """
+    lines = input_text.splitlines()
+    total = len(lines)
+    if total < SCALING_MIN_LINES:
+        return [], None
+
+    timings: list[tuple[int, float]] = []
+    for fraction in SCALING_PROBE_FRACTIONS:
+        n = max(1, int(total * fraction))
+        try:
+            returncode, _, _, elapsed, _ = memoized_run(
+                code, "\n".join(lines[:n]) + "\n", budget * fraction, [DEFAULT_INTERPRETER], store)
+        except subprocess.TimeoutExpired:
+            return timings, math.inf
+        if returncode != 0:
+            # Un préfixe n'est pas forcément une entrée valide (grilles, blocs...)
+            return timings, None
+        timings.append((n, elapsed))
+
+    significant = [(n, t) for n, t in timings if t >= SCALING_MIN_SIGNIFICANT_TIME]
+    if len(significant) < 2:
+        return timings, None
+    (n1, t1), (n2, t2) = significant[-2], significant[-1]
+    exponent = max(1.0, math.log(t2 / t1) / math.log(n2 / n1)) if t2 > t1 else 1.0
+    return timings, t2 * (total / n2) ** exponent
+
+
+def execute_with_repair(label: str, code: str, filename: str, repair_fn,
+                        problem_part1_text: str, problem_part2_text: str,
+                        input_text: str | None, example: tuple[str, str] | None = None,
+                        usage: dict | None = None, store: ResultsStore | None = None,
+                        effort: str | None = None, generation: dict | None = None) -> dict:
+    """
+    Sauvegarde et exécute le solveur.
+    - exemple de l'énoncé faux ou trop lent : rejet immédiat, le modèle reçoit
+      l'exemple, la sortie attendue et la sortie obtenue ;
+    - crash (code retour non nul ou sortie vide) : le traceback est renvoyé au modèle ;
+    - lenteur (croissance projetée ou SOLVER_TIME_BUDGET dépassé) : les temps
+      mesurés sont renvoyés au modèle avec une indication de complexité.
+    Au plus MAX_REPAIR_ATTEMPTS tours de suivi.
+    Le run complet se fait sous l'interpréteur choisi par choose_interpreters
+    (course CPython / PyPy, ou vainqueur connu de `store`) ; toutes les
+    exécutions passent par le mémo (memoized_run), persistant si `store` est fourni.
+    Effort de raisonnement : `effort` est celui qui a produit `code` ; il monte
+    d'un cran (REASONING_EFFORTS) avant un tour de suivi dû à un exemple faux ou
+    à un crash. Chaque tentative est notée dans candidate["attempts"] :
+    {"attempt", "effort", "model_time", "input_tokens", "output_tokens", "status"},
+    `generation` donnant temps et tokens de la génération initiale.
+    Retourne le candidat {"provider", "filename", "code", "answer", "elapsed", "status", "interpreter", "attempts"}.
+    """
+    candidate = {"provider": label, "filename": filename, "code": code,
+                 "answer": None, "elapsed": None, "status": "failed", "interpreter": None, "attempts": []}
+    total_lines = len((input_text or "").splitlines())
+    usage = usage if usage is not None else {"input_tokens": 0, "output_tokens": 0}
+    cost = dict(generation or {"model_time": None, "input_tokens": 0, "output_tokens": 0})
+
+    for attempt in range(MAX_REPAIR_ATTEMPTS + 1):
+        candidate["code"] = code
+        example_ok, got, example_stderr = validate_on_example(code, example, store)
+        timings, projected = [], None
+        if example_ok and input_text:
+            timings, projected = probe_scaling(code, input_text, SOLVER_TIME_BUDGET, store)
+
+        if not example_ok:
+            print(f"❌ [{label}] Exemple de l'énoncé non validé (attendu {example[1]}, obtenu {got or '∅'}).\n")
+            candidate["status"] = "wrong_example"
+            message = build_example_message(example[0], example[1], got, example_stderr)
+        elif projected is not None and projected > SOLVER_TIME_BUDGET:
+            print(f"🐢 [{label}] Croissance trop forte : {timings}, projection {projected:.1f}s > {SOLVER_TIME_BUDGET:.0f}s\n")
+            candidate["status"] = "slow"
+            message = build_performance_message(timings, total_lines, SOLVER_TIME_BUDGET, projected)
         else:
-            print("[Gemini] Aucun code généré (quota / modèle / erreur). On saute l'exécution.\n")
+            interpreters = choose_interpreters(code, store)
+            print(f"[{label}] Exécution du solveur {filename} sur l'input complet ({' / '.join(interpreters)})...\n")
+            try:
+                returncode, stdout, stderr, elapsed, interpreter = run_candidate(
+                    code, filename, input_text, SOLVER_TIME_BUDGET, interpreters, store)
+            except subprocess.TimeoutExpired:
+                print(f"🐢 [{label}] Budget de {SOLVER_TIME_BUDGET:.0f}s dépassé ({filename}).\n")
+                candidate["status"] = "timeout"
+                message = build_performance_message(timings, total_lines, SOLVER_TIME_BUDGET, None)
+            else:
+                if returncode == 0 and stdout:
+                    candidate.update(answer=stdout, elapsed=elapsed, status="ok", interpreter=interpreter)
+                    candidate["attempts"].append(dict(cost, attempt=attempt, effort=effort, status="ok"))
+                    return candidate
+                print(f"⚠️ [{label}] Erreur dans le code généré ({filename}) :", stderr)
+                candidate["status"] = "failed"
+                message = build_repair_message(stderr, input_text)
+
+        candidate["attempts"].append(dict(cost, attempt=attempt, effort=effort, status=candidate["status"]))
+        if attempt == MAX_REPAIR_ATTEMPTS:
+            break
+
+        if candidate["status"] in ESCALATE_EFFORT_ON:
+            effort = next_effort(effort)
+        level = f", effort {effort}" if effort else ""
+        print(f"🔧 [{label}] Tour de suivi {attempt + 1}/{MAX_REPAIR_ATTEMPTS} : renvoi au modèle ({candidate['status']}{level})...\n")
+        before = dict(usage)
+        start = time.perf_counter()
+        try:
+            code = repair_fn(problem_part1_text, problem_part2_text, code, message, usage=usage, effort=effort)
+            failure = None if code.strip() else "no_code"
+        except Exception as e:
+            print(f"❌ [{label}] Erreur API pendant le tour de suivi : {e}")
+            failure = "error"
+        cost = {"model_time": time.perf_counter() - start,
+                "input_tokens": usage["input_tokens"] - before["input_tokens"],
+                "output_tokens": usage["output_tokens"] - before["output_tokens"]}
+        if failure:
+            # La tentative est notée ; le candidat garde le statut du dernier code exécuté
+            if failure == "no_code":
+                print(f"[{label}] Réponse vide du modèle, abandon.\n")
+            candidate["attempts"].append(dict(cost, attempt=attempt + 1, effort=effort, status=failure))
+            break
+
+    return candidate
+
+
+def select_fastest_correct(candidates: list[dict]) -> dict | None:
+    """
+    Retient la réponse majoritaire parmi les candidats terminés, puis, parmi
+    ceux qui la donnent, le plus rapide (temps mesuré, pas ordre d'appel).
+    """
+    done = [c for c in candidates if c["status"] == "ok"]
+    if not done:
+        return None
+    votes: dict[str, int] = {}
+    for c in done:
+        votes[c["answer"]] = votes.get(c["answer"], 0) + 1
+    best_votes = max(votes.values())
+    agreeing = [c for c in done if votes[c["answer"]] == best_votes]
+    return min(agreeing, key=lambda c: c["elapsed"])
+
+
+# =========================
+# 6. Pipeline complet AoC PARTIE 2 (GPT + Claude + Gemini)
+# =========================
+
+# (libellé, modèle, générateur, réparateur, fichier du solveur)
+PROVIDERS_PART2 = [
+    ("ChatGPT", GPT_MODEL, generate_solver_code_gpt_part2, repair_solver_code_gpt_part2, "generated_solution_part2_gpt.py"),
+    ("Claude", CLAUDE_MODEL, generate_solver_code_claude_part2, repair_solver_code_claude_part2, "generated_solution_part2_claude.py"),
+    ("Gemini", GEMINI_MODEL, generate_solver_code_gemini_part2, repair_solver_code_gemini_part2, "generated_solution_part2_gemini.py"),
+]
+
+
+def generate_candidate_part2(label: str, generate_fn, filename: str,
+                             problem_part1_text: str, problem_part2_text: str) -> dict:
+    """
+    Génération seule : {"code" (None si vide), "usage", "generation_time", "effort", "status"}.
+    Une exception du générateur est notée (status "error") au lieu de remonter.
+    """
+    usage = {"input_tokens": 0, "output_tokens": 0}
+    effort = initial_effort()
+    print(f"\n=== [{label}] Génération du code solveur PARTIE 2... ===\n")
+    start = time.perf_counter()
+    try:
+        code = generate_fn(problem_part1_text, problem_part2_text, usage=usage, effort=effort)
+        status = "ok"
     except Exception as e:
-        print(f"❌ Erreur pipeline Gemini PARTIE 2 : {e}")
+        print(f"❌ [{label}] Erreur API pendant la génération : {e}")
+        code, status = "", "error"
+    generation_time = time.perf_counter() - start
+    if not code.strip():
+        print(f"[{label}] Aucun code généré (quota / modèle / erreur). On saute l'exécution.\n")
+        return {"code": None, "usage": usage, "generation_time": generation_time, "effort": effort,
+                "status": "no_code" if status == "ok" else status}
+    print(f"[{label}] Code généré ({filename}) en {generation_time:.1f}s\n")
+    return {"code": code, "usage": usage, "generation_time": generation_time, "effort": effort, "status": status}
+
+
+def execute_candidate_part2(label: str, model: str, repair_fn, filename: str, generated: dict,
+                            problem_part1_text: str, problem_part2_text: str,
+                            input_text: str | None, example: tuple[str, str] | None = None,
+                            store: ResultsStore | None = None) -> dict:
+    """Exécute (et répare au besoin) le code généré ; retourne le candidat complet."""
+    usage = dict(generated["usage"])
+    generation = {"model_time": generated["generation_time"], **generated["usage"]}
+    if not generated["code"]:
+        status = generated.get("status", "no_code")
+        candidate = {"provider": label, "filename": filename, "code": None,
+                     "answer": None, "elapsed": None, "status": status, "interpreter": None,
+                     "attempts": [dict(generation, attempt=0, effort=generated.get("effort"), status=status)]}
+    else:
+        candidate = execute_with_repair(label, generated["code"], filename, repair_fn,
+                                        problem_part1_text, problem_part2_text, input_text, example,
+                                        usage=usage, store=store, effort=generated.get("effort"),
+                                        generation=generation)
+        elapsed = f" en {candidate['elapsed']:.2f}s ({candidate['interpreter']})" if candidate["elapsed"] is not None else ""
+        print(f"[{label}] Réponse : {candidate['answer']} ({candidate['status']}{elapsed})\n")
+    candidate.update(model=model, usage=usage, generation_time=generated["generation_time"])
+    return candidate
+
+
+def error_candidate(label: str, model: str, filename: str, status: str = "error") -> dict:
+    return {"provider": label, "filename": filename, "code": None, "answer": None, "elapsed": None,
+            "status": status, "interpreter": None, "attempts": [], "model": model,
+            "usage": {"input_tokens": 0, "output_tokens": 0}, "generation_time": None}
+
+
+def parse_day_from_url(problem_url: str) -> tuple[int | None, int]:
+    """'https://adventofcode.com/2025/day/10' -> (2025, 10)."""
+    m = re.search(r"/(\d{4})/day/(\d+)", problem_url)
+    if m:
+        return int(m.group(1)), int(m.group(2))
+    m = re.search(r"/day/(\d+)", problem_url)
+    if not m:
+        raise ValueError(f"Impossible de trouver le jour dans l'URL : {problem_url}")
+    return None, int(m.group(1))
+
+
+def record_candidates(store: ResultsStore, year: int | None, day: int, part: int, candidates: list[dict],
+                      input_bytes: int | None = None) -> None:
+    for c in candidates:
+        run_id = store.record_run(
+            year=year, day=day, part=part,
+            provider=c["provider"], model=c.get("model"), code=c["code"],
+            answer=c["answer"], status=c["status"],
+            generation_time=c.get("generation_time"), execution_time=c["elapsed"],
+            input_tokens=c["usage"]["input_tokens"], output_tokens=c["usage"]["output_tokens"],
+            interpreter=c.get("interpreter"), input_bytes=input_bytes,
+        )
+        store.record_attempts(run_id, c.get("attempts") or [])
+
+
+# Routage (model_router.py) : les modèles sont sollicités du moins cher au plus cher,
+# le suivant seulement si les réponses divergent ou qu'un solveur échoue.
+# False = les trois en parallèle à chaque fois.
+ROUTER_ENABLED = True
+
+# Version des étapes : à incrémenter quand leur logique change (invalide les artefacts)
+PIPELINE_VERSION = 2
+
+
+def build_part2_stages(problem_url: str, input_path: str, part2_path: str,
+                       store: ResultsStore | None = None, providers: list[tuple] | None = None) -> list[Stage]:
+    """
+    DAG du pipeline PARTIE 2 :
+        scrape, statement -> example
+        scrape -> compact (énoncé partie 1 sous PART1_TOKEN_BUDGET)
+        compact, statement -> generate:<fournisseur>
+        generate:<fournisseur>, compact, statement, input, example -> execute:<fournisseur>
+    scrape, compact, generate et execute sont mémorisés sur disque (clé = contenu des
+    dépendances) ; statement, input et example sont relus à chaque fois.
+    Une génération vide ou un candidat non "ok" n'est pas figé : il sera retenté.
+    providers : sous-ensemble de PROVIDERS_PART2 à solliciter (défaut : tous).
+    """
+    selector = "article.day-desc"
+
+    def scrape(_):
+        print("Scraping de l'énoncé (partie 1) sur :", problem_url)
+        html = fetch_page_html(problem_url)
+        example_input, _ = extract_example_from_html(html, selector)
+        from bs4 import BeautifulSoup
+        articles = "".join(str(a) for a in BeautifulSoup(html, "html.parser").select(selector))
+        return {"part1": scrape_text(problem_url, selector, html=html), "example_input": example_input,
+                "articles": articles}
+
+    def compact(inputs):
+        scraped = inputs["scrape"]
+        compacted, dropped = compact_part1(scraped["articles"], PART1_TOKEN_BUDGET, selector)
+        part1, smaller, report = pick_smaller(scraped["part1"], compacted, [label for label, *_ in PROVIDERS_PART2])
+        if not smaller:
+            print("✂️ Compaction sans gain : énoncé partie 1 gardé tel quel")
+            dropped = []
+        savings = ", ".join(f"{label} {before} -> {after}" for label, (before, after) in report.items())
+        print(f"✂️ Énoncé partie 1 compacté (tokens) : {savings} ; retirés : {len(dropped)} segment(s)")
+        return {"part1": part1, "dropped": dropped, "tokens": report}
+
+    def statement(_):
+        print("Lecture de l'énoncé PARTIE 2 depuis :", part2_path)
+        return {"part2": read_text_file(part2_path) or ""}
+
+    def read_input(_):
+        # Lecture locale de l'input : exécutions (lien tmpfs) et extraits des messages de réparation
+        print("Lecture de l'input depuis :", input_path)
+        text = read_text_file(input_path)
+        if text is None:
+            print("⚠️ Attention : 'input.txt' introuvable. Placez-le dans le même répertoire que ce programme et les scripts générés.")
+        return {"input": text}
+
+    def example(inputs):
+        # Exemple travaillé : input tiré du HTML (partie 1), réponse tirée de l'énoncé partie 2
+        example_input = inputs["scrape"]["example_input"]
+        expected = extract_expected_answer_from_text(inputs["statement"]["part2"])
+        if example_input and expected:
+            print(f"Exemple de l'énoncé extrait (réponse attendue : {expected}), pré-validation activée.")
+            return [example_input, expected]
+        print("⚠️ Pas d'exemple exploitable : pas de pré-validation.")
+        return None
+
+    stages = [
+        Stage("scrape", scrape, params={"url": problem_url, "version": PIPELINE_VERSION}),
+        Stage("statement", statement, cache=False),
+        Stage("input", read_input, cache=False),
+        Stage("example", example, deps=("scrape", "statement"), cache=False),
+        Stage("compact", compact, deps=("scrape",), params={"budget": PART1_TOKEN_BUDGET}),
+    ]
+    prompt_hash = value_hash([COMMON_INSTRUCTION_PART2, CLAUDE_SYSTEM_PART2])
+    for label, model, generate_fn, repair_fn, filename in (PROVIDERS_PART2 if providers is None else providers):
+        def generate(inputs, label=label, generate_fn=generate_fn, filename=filename):
+            return generate_candidate_part2(label, generate_fn, filename,
+                                            inputs["compact"]["part1"], inputs["statement"]["part2"])
+
+        def execute(inputs, label=label, model=model, repair_fn=repair_fn, filename=filename):
+            return execute_candidate_part2(label, model, repair_fn, filename, inputs[f"generate:{label}"],
+                                           inputs["compact"]["part1"], inputs["statement"]["part2"],
+                                           inputs["input"]["input"], inputs["example"], store)
+
+        stages.append(Stage(f"generate:{label}", generate, deps=("compact", "statement"),
+                            params={"model": model, "prompt": prompt_hash, "effort": initial_effort(),
+                                    "version": PIPELINE_VERSION},
+                            cacheable=lambda value: bool(value["code"])))
+        stages.append(Stage(f"execute:{label}", execute,
+                            deps=(f"generate:{label}", "compact", "statement", "input", "example"),
+                            params={"model": model, "budget": SOLVER_TIME_BUDGET, "version": PIPELINE_VERSION},
+                            cacheable=lambda value: value["status"] == "ok"))
+    return stages
+
+
+def solve_advent_of_code_part2_with_all(problem_url: str, input_path: str, part2_path: str,
+                                        results_db: str = RESULTS_DB_PATH, artifact_dir: str = ARTIFACT_DIR,
+                                        keep_warm: bool = False):
+    """
+    - Scrap l’énoncé AoC (partie 1)
+    - Lit l’énoncé spécifique de la partie 2 depuis un fichier (enonce2.txt)
+    - (Le script généré lira 'input.txt' lui-même dans son répertoire)
+    - Demande à GPT, Claude et Gemini de générer un solver Python pour la PARTIE 2 : tous en
+      parallèle, ou (ROUTER_ENABLED) le moins cher d'abord selon l'historique, en escaladant
+      vers les suivants tant que les réponses divergent ou qu'un solveur échoue
+    - Valide chaque solver sur l'exemple de l'énoncé (timeout serré) avant l'input complet
+    - Exécute les solvers (sans stdin), en réparant ceux qui plantent et en
+      régénérant ceux qui dépassent le budget de temps
+    - Affiche les trois réponses et retient la plus rapide parmi les majoritaires
+    - Enregistre chaque candidat dans la base de résultats (results_db)
+    Les étapes forment un DAG (build_part2_stages) dont les artefacts sont gardés
+    dans artifact_dir : une relance ne refait que ce dont les entrées ont changé.
+    keep_warm : laisse le forkserver démarré pour le run suivant (mode watch).
+    """
+    year, day = parse_day_from_url(problem_url)
+
+    store = ResultsStore(results_db)
+    known = store.fastest_solver(year, day, 2)
+    if known:
+        print(f"ℹ️ Déjà résolu : {known['answer']} ({known['provider']}, {known['execution_time']:.2f}s)")
+
+    input_bytes = os.path.getsize(input_path) if os.path.exists(input_path) else None
+    order = route(store, PROVIDERS_PART2, 2, input_bytes) if ROUTER_ENABLED else PROVIDERS_PART2
+
+    cache = ArtifactCache(artifact_dir)
+    values: dict = {}
+    hits: set[str] = set()
+    ran: list[tuple] = []
+    if FORKSERVER_ENABLED:
+        get_forkserver()   # préchargement pendant que les modèles génèrent
+    try:
+        if ROUTER_ENABLED:
+            # Étapes communes d'abord : avec un exemple, un seul solveur validé suffit
+            values, hits = run_dag(build_part2_stages(problem_url, input_path, part2_path, store, []), cache)
+            quorum = 1 if values.get("example") else 2
+            wave = order[:quorum]
+        else:
+            quorum = None
+            wave = order
+        while wave:
+            wave_values, wave_hits = run_dag(build_part2_stages(problem_url, input_path, part2_path, store, wave),
+                                             cache)
+            values.update(wave_values)
+            hits |= wave_hits
+            ran += wave
+            done = [values[f"execute:{label}"] for label, *_ in ran if f"execute:{label}" in values]
+            if quorum is None or answers_settled(done, quorum):
+                break
+            wave = order[len(ran):len(ran) + 1]
+            if wave:
+                print(f"\n⤴️ Réponses en désaccord ou solveur en échec : escalade vers {wave[0][0]} ({wave[0][1]})")
+    finally:
+        cleanup_shared_inputs()
+        if not keep_warm:
+            shutdown_forkserver()
+    if hits:
+        print(f"♻️ Artefacts réutilisés : {', '.join(sorted(hits))}")
+
+    # ========= Réconciliation =========
+    ran_labels = {label for label, *_ in ran}
+    candidates = [values.get(f"execute:{label}")
+                  or error_candidate(label, model, filename, "error" if label in ran_labels else "skipped")
+                  for label, model, _, _, filename in PROVIDERS_PART2]
+    # Un candidat relu depuis le cache a déjà été enregistré lors du run qui l'a produit ;
+    # un fournisseur non sollicité par le routeur n'a rien à enregistrer
+    record_candidates(store, year, day, 2, [c for (label, *_), c in zip(PROVIDERS_PART2, candidates)
+                                            if label in ran_labels and f"execute:{label}" not in hits],
+                      input_bytes)
+    store.close()
+    result_gpt, result_claude, result_gemini = [c["answer"] for c in candidates]
+    best = select_fastest_correct(candidates)
 
     # ========= Récap =========
     print("\n===== RÉPONSES FINALES PARTIE 2 =====")
-    print(f"ChatGPT : {result_gpt}")
-    print(f"Claude  : {result_claude}")
-    print(f"Gemini  : {result_gemini}")
+    for name, c in zip(("ChatGPT", "Claude ", "Gemini "), candidates):
+        print(f"{name} : {c['answer'] if c['status'] != 'skipped' else '(non sollicité)'}")
+    if best:
+        print(f"Retenue : {best['answer']} ({best['provider']}, {best['elapsed']:.2f}s, {best['interpreter']})")
     print("=====================================")
 
     return result_gpt, result_claude, result_gemini
 
 
 # =========================
-# 7. Main
+# 7. Mode watch : relance à chaque modification de enonce2.txt / input.txt
 # =========================
+# Le processus reste vivant : clients LLM, forkserver et file d'exécution
+# restent chauds. Chaque modification relance le DAG, dont les artefacts
+# font que seules les étapes touchées sont recalculées (énoncé -> génération
+# + exécution ; input -> exécution seulement).
 
-if __name__ == "__main__":
-    url = "https://adventofcode.com/2025/day/10"
-    input_file = "input.txt"
-    part2_file = "enonce2.txt"   # fichier où tu as collé l'énoncé de la partie 2
+WATCH_DEBOUNCE = 0.3        # secondes de calme après un événement avant de relancer
+WATCH_POLL_INTERVAL = 0.5   # secondes entre deux scans (repli sans inotify)
+
+
+def _file_signature(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
-    solve_advent_of_code_part2_with_all(url, input_file, part2_file)
+
+def file_signatures(paths: list[str]) -> dict[str, tuple[int, int] | None]:
+    """{chemin absolu: (mtime, taille)} : référence prise avant un run pour ne rien rater pendant."""
+    return {os.path.abspath(p): _file_signature(p) for p in paths}
+
+
+def _changed_since(since: dict[str, tuple[int, int] | None]) -> set[str]:
+    return {p for p, sig in since.items() if _file_signature(p) != sig}
+
+
+def _wait_inotify(since: dict[str, tuple[int, int] | None]) -> set[str] | None:
+    """
+    Bloque jusqu'à une écriture sur l'un des fichiers (inotify_simple, optionnel).
+    On surveille les répertoires : les éditeurs remplacent souvent le fichier
+    par renommage. Les modifications faites depuis la référence since (pendant
+    le run précédent) sont relevées une fois la surveillance en place.
+    Retourne None si inotify n'est pas disponible.
+    """
+    try:
+        from inotify_simple import INotify, flags
+    except ImportError:
+        return None
+    wanted = set(since)
+    mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+    with INotify() as inotify:
+        watches = {inotify.add_watch(d, mask): d for d in {os.path.dirname(p) for p in wanted}}
+        changed = _changed_since(since)
+        timeout = int(WATCH_DEBOUNCE * 1000) if changed else None
+        while True:
+            events = inotify.read(timeout=timeout)
+            if not events and changed:
+                return changed
+            for event in events:
+                path = os.path.join(watches.get(event.wd, ""), event.name)
+                if path in wanted:
+                    changed.add(path)
+            if changed:
+                timeout = int(WATCH_DEBOUNCE * 1000)
+
+
+def _wait_polling(since: dict[str, tuple[int, int] | None]) -> set[str]:
+    while True:
+        changed = _changed_since(since)
+        if changed:
+            # Laisse l'écriture se terminer (collage en plusieurs fois)
+            time.sleep(WATCH_DEBOUNCE)
+            return changed
+        time.sleep(WATCH_POLL_INTERVAL)
+
+
+def wait_for_change(paths: list[str], since: dict[str, tuple[int, int] | None] | None = None) -> set[str]:
+    """
+    Chemins (absolus) modifiés parmi paths depuis la référence since
+    (file_signatures, défaut : maintenant) : inotify si disponible, sinon scrutation.
+    """
+    since = since if since is not None else file_signatures(paths)
+    changed = _wait_inotify(since)
+    return changed if changed is not None else _wait_polling(since)
+
+
+def prewarm_part2() -> None:
+    """Construit les clients LLM, le forkserver et la file d'exécution avant le premier run."""
+    for label, factory in (("OpenAI", get_openai_client), ("Claude", get_claude_client),
+                           ("Gemini", lambda: get_gemini_model(GEMINI_MODEL))):
+        try:
+            factory()
+        except Exception as e:
+            print(f"⚠️ Client {label} indisponible : {e}")
+    if FORKSERVER_ENABLED:
+        get_forkserver()
+    if EXECUTION_QUEUE_URL:
+        get_execution_queue()
+
+
+def watch_part2(problem_url: str, input_path: str, part2_path: str,
+                results_db: str = RESULTS_DB_PATH, artifact_dir: str = ARTIFACT_DIR,
+                initial_run: bool = True) -> None:
+    """
+    Run initial puis relance à chaque modification de l'énoncé ou de l'input (Ctrl-C pour quitter).
+    initial_run=False : attend d'abord une modification (énoncé partie 2 pas encore collé).
+    """
+    prewarm_part2()
+    try:
+        if not initial_run:
+            print(f"En attente de l'énoncé de la partie 2 dans {part2_path}...")
+            wait_for_change([part2_path])
+        while True:
+            start = time.perf_counter()
+            # Référence prise avant le run : une édition pendant le run relance aussitôt après
+            before = file_signatures([part2_path, input_path])
+            solve_advent_of_code_part2_with_all(problem_url, input_path, part2_path, results_db,
+                                                artifact_dir, keep_warm=True)
+            print(f"⏱️ Run en {time.perf_counter() - start:.1f}s. "
+                  f"En attente de modifications de {part2_path} / {input_path}...")
+            changed = wait_for_change([part2_path, input_path], before)
+            print(f"\n🔁 Modifié : {', '.join(sorted(os.path.basename(p) for p in changed))}")
+    except KeyboardInterrupt:
+        print("\nArrêt du mode watch.")
+    finally:
+        shutdown_forkserver()
+
+
+# =========================
+# 8. Main
+# =========================
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="AoC partie 2 : solveurs générés par GPT, Claude et Gemini")
+    parser.add_argument("--url", default="https://adventofcode.com/2025/day/10",
+                        help="page de l'énoncé (partie 1)")
+    parser.add_argument("--input", default="input.txt", help="input du puzzle")
+    parser.add_argument("--statement", default="enonce2.txt",
+                        help="fichier où est collé l'énoncé de la partie 2")
+    parser.add_argument("--results-db", default=RESULTS_DB_PATH, help="base SQLite des résultats")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR, help="répertoire des artefacts du DAG")
+    parser.add_argument("--all-models", action="store_true",
+                        help="sollicite les trois modèles en parallèle (pas de routage)")
+    parser.add_argument("--watch", action="store_true",
+                        help="reste actif et relance à chaque modification de l'énoncé ou de l'input")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.all_models:
+        ROUTER_ENABLED = False
+    if args.watch:
+        watch_part2(args.url, args.input, args.statement, args.results_db, args.artifacts)
+    else:
+        solve_advent_of_code_part2_with_all(args.url, args.input, args.statement, args.results_db, args.artifacts)
@@ -0,0 +1,226 @@
+import re
+import sys
+from collections import deque
+from heapq import heappush, heappop
+
+# =========================
+# Bibliothèque d'aide pour les solveurs générés (import aoc_fast)
+# =========================
+# Disponible pour tous les solveurs (PYTHONPATH) et préchargée par le
+# forkserver. NumPy / SciPy ne sont importés qu'à l'appel des fonctions qui
+# en ont besoin : `import aoc_fast` reste quasi gratuit (et marche sous PyPy).
+
+# Description de l'API jointe aux prompts (garder synchronisée avec le code).
+# PROMPT_DOC : solveurs qui lisent input.txt (partie 2) ; PROMPT_DOC_STDIN :
+# solveurs qui lisent stdin (partie 1), sans les helpers fondés sur un fichier.
+_DOC_HEADER = """
+HELPER LIBRARY (optional, preinstalled, fast): `import aoc_fast`
+"""
+_DOC_FILE_INPUT = """- aoc_fast.read_input(path='input.txt') -> str
+- aoc_fast.ints(text) -> list[int]                 all signed integers in text
+- aoc_fast.lines_ints(text) -> list[list[int]]     signed integers of each non-empty line
+- aoc_fast.load_grid(path='input.txt') -> numpy uint8 2-D array of the character grid
+  (memory-mapped; compare with ord('#'), e.g. walls = grid == ord('#'))
+"""
+_DOC_STDIN_INPUT = """- aoc_fast.read_stdin() -> str                    whole input from stdin
+- aoc_fast.ints(text) -> list[int]                 all signed integers in text
+- aoc_fast.lines_ints(text) -> list[list[int]]     signed integers of each non-empty line
+- aoc_fast.grid_from_text(text) -> numpy uint8 2-D array of the character grid
+  (compare with ord('#'), e.g. walls = grid == ord('#'))
+"""
+_DOC_ALGORITHMS = """- aoc_fast.bfs_grid(passable, start, diagonal=False) -> numpy int64 distances (-1 = unreachable);
+  passable: 2-D bool array, start: (row, col)
+- aoc_fast.dijkstra_grid(cost, start) -> numpy int64 distances (entering a cell costs cost[cell], -1 = unreachable)
+- aoc_fast.dijkstra(neighbors, start, goal=None) -> dict node -> distance; neighbors(node) yields (next, weight)
+- aoc_fast.ilp_minimize(A_eq, b_eq, c=None, upper=None) -> (value, x) integer optimum of c·x s.t. A_eq·x = b_eq,
+  0 <= x <= upper (default c = ones), or None if infeasible
+- aoc_fast.components(n, groups) -> list of (nodes, group_indices): connected components of nodes 0..n-1
+  where each group (iterable of nodes) links its members
+"""
+PROMPT_DOC = _DOC_HEADER + _DOC_FILE_INPUT + _DOC_ALGORITHMS
+PROMPT_DOC_STDIN = _DOC_HEADER + _DOC_STDIN_INPUT + _DOC_ALGORITHMS
+
+INT_RE = re.compile(r"-?\d+")
+
+
+def read_input(path: str = "input.txt") -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def read_stdin() -> str:
+    return sys.stdin.read()
+
+
+def ints(text: str) -> list[int]:
+    return list(map(int, INT_RE.findall(text)))
+
+
+def lines_ints(text: str) -> list[list[int]]:
+    return [ints(line) for line in text.splitlines() if line.strip()]
+
+
+def load_grid(path: str = "input.txt"):
+    """
+    Grille rectangulaire de caractères en tableau uint8 (lignes × colonnes) :
+    vue (sans copie) sur np.memmap, la fin de chaque ligne ('\n' ou '\r\n',
+    détectée sur la première) sautée par les strides.
+    """
+    import numpy as np
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    end = raw.size
+    while end and raw[end - 1] in (10, 13):
+        end -= 1
+    body = raw[:end]
+    newlines = np.flatnonzero(body == 10)
+    width = int(newlines[0]) if newlines.size else end
+    eol = 1
+    if newlines.size and width and body[width - 1] == 13:
+        width, eol = width - 1, 2
+    rows = newlines.size + 1
+    if end + eol != rows * (width + eol):
+        if eol == 1 and (body == 13).any():
+            raise ValueError("load_grid: mixed line endings ('\\r\\n' and '\\n') in the file")
+        raise ValueError("load_grid: lines do not all have the same length")
+    return np.lib.stride_tricks.as_strided(body, shape=(rows, width), strides=(width + eol, 1))
+
+
+def grid_from_text(text: str):
+    """Grille rectangulaire de caractères (texte déjà lu, ex. stdin) en tableau uint8 (lignes × colonnes)."""
+    import numpy as np
+    lines = text.rstrip("\r\n").splitlines()
+    width = len(lines[0]) if lines else 0
+    if any(len(line) != width for line in lines):
+        raise ValueError("grid_from_text: lines do not all have the same length")
+    return np.frombuffer("".join(lines).encode("latin-1"), dtype=np.uint8).reshape(len(lines), width)
+
+
+def _neighbor_offsets(diagonal: bool) -> list[tuple[int, int]]:
+    offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    if diagonal:
+        offsets += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    return offsets
+
+
+def bfs_grid(passable, start: tuple[int, int], diagonal: bool = False):
+    """Distances BFS (pas de coût 1) depuis start sur les cases passables ; -1 = inatteignable."""
+    import numpy as np
+    rows, cols = passable.shape
+    free = passable.ravel().tolist()
+    dist = [-1] * (rows * cols)
+    s = start[0] * cols + start[1]
+    dist[s] = 0
+    queue = deque([s])
+    offsets = _neighbor_offsets(diagonal)
+    while queue:
+        u = queue.popleft()
+        r, c = divmod(u, cols)
+        d = dist[u] + 1
+        for dr, dc in offsets:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                v = nr * cols + nc
+                if free[v] and dist[v] < 0:
+                    dist[v] = d
+                    queue.append(v)
+    return np.array(dist, dtype=np.int64).reshape(rows, cols)
+
+
+def dijkstra_grid(cost, start: tuple[int, int], diagonal: bool = False):
+    """Dijkstra 4- (ou 8-) connexe : entrer dans une case coûte cost[case] ; -1 = inatteignable."""
+    import numpy as np
+    rows, cols = cost.shape
+    weight = cost.ravel().tolist()
+    dist = [-1] * (rows * cols)
+    s = start[0] * cols + start[1]
+    best = {s: 0}
+    heap = [(0, s)]
+    offsets = _neighbor_offsets(diagonal)
+    while heap:
+        d, u = heappop(heap)
+        if dist[u] >= 0:
+            continue
+        dist[u] = d
+        r, c = divmod(u, cols)
+        for dr, dc in offsets:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                v = nr * cols + nc
+                nd = d + weight[v]
+                if dist[v] < 0 and nd < best.get(v, nd + 1):
+                    best[v] = nd
+                    heappush(heap, (nd, v))
+    return np.array(dist, dtype=np.int64).reshape(rows, cols)
+
+
+def dijkstra(neighbors, start, goal=None) -> dict:
+    """Distances depuis start ; neighbors(u) produit des (v, poids). S'arrête à goal si fourni."""
+    dist = {}
+    best = {start: 0}
+    heap = [(0, 0, start)]
+    tie = 1   # départage sans comparer les nœuds
+    while heap:
+        d, _, u = heappop(heap)
+        if u in dist:
+            continue
+        dist[u] = d
+        if u == goal:
+            break
+        for v, w in neighbors(u):
+            nd = d + w
+            if v not in dist and nd < best.get(v, nd + 1):
+                best[v] = nd
+                heappush(heap, (nd, tie, v))
+                tie += 1
+    return dist
+
+
+def ilp_minimize(A_eq, b_eq, c=None, upper=None):
+    """min c·x s.c. A_eq·x = b_eq, 0 <= x <= upper, x entier (scipy.optimize.milp / HiGHS)."""
+    import numpy as np
+    from scipy.optimize import milp, LinearConstraint, Bounds
+    A = np.asarray(A_eq, dtype=float)
+    n = A.shape[1]
+    c = np.ones(n) if c is None else np.asarray(c, dtype=float)
+    res = milp(
+        c=c,
+        constraints=LinearConstraint(A, b_eq, b_eq),
+        integrality=np.ones(n),
+        bounds=Bounds(0, np.inf if upper is None else upper),
+    )
+    if res.status != 0:
+        return None
+    x = [int(round(v)) for v in res.x]
+    return int(round(res.fun)), x
+
+
+def components(n: int, groups) -> list[tuple[list[int], list[int]]]:
+    """
+    Composantes connexes des nœuds 0..n-1, chaque groupe reliant ses membres
+    (ex. compteurs reliés par les boutons qui les touchent, cf. sol2.components).
+    Retourne [(nœuds triés, indices des groupes)], sans les nœuds isolés hors groupe.
+    """
+    parent = list(range(n))
+
+    def find(u: int) -> int:
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    groups = [list(g) for g in groups]
+    for g in groups:
+        for v in g[1:]:
+            ru, rv = find(g[0]), find(v)
+            if ru != rv:
+                parent[rv] = ru
+    nodes: dict[int, list[int]] = {}
+    members: dict[int, list[int]] = {}
+    for i, g in enumerate(groups):
+        if g:
+            members.setdefault(find(g[0]), []).append(i)
+    for u in range(n):
+        root = find(u)
+        if root in members:
+            nodes.setdefault(root, []).append(u)
+    return [(nodes[root], members[root]) for root in members]
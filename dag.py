@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# =========================
+# Mini-DAG d'étapes avec artefacts mémorisés sur disque
+# =========================
+# Chaque étape produit une valeur JSON. Sa clé = hash(nom, paramètres, hash
+# du contenu des valeurs dont elle dépend) : si rien n'a changé en amont,
+# l'artefact sur disque est relu au lieu de recalculer. Les étapes
+# indépendantes tournent en parallèle ; un arrêt en cours de route est repris
+# au prochain lancement à partir des artefacts déjà écrits.
+
+ARTIFACT_DIR = ".aoc_artifacts"
+
+
+def value_hash(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """Artefacts JSON rangés par étape : <root>/<étape>/<clé>.json (écriture atomique)."""
+
+    def __init__(self, root: str = ARTIFACT_DIR):
+        self.root = root
+
+    def _path(self, stage: str, key: str) -> str:
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in stage)
+        return os.path.join(self.root, safe, f"{key}.json")
+
+    def get(self, stage: str, key: str):
+        """(True, valeur) si l'artefact existe, sinon (False, None)."""
+        try:
+            with open(self._path(stage, key), "r", encoding="utf-8") as f:
+                return True, json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False, None
+
+    def put(self, stage: str, key: str, value) -> None:
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+
+
+class Stage:
+    """
+    Étape du DAG.
+    - fn(inputs) : inputs = {nom de dépendance: valeur} ; retourne une valeur JSON ;
+    - params : ce qui, hors dépendances, influe sur le résultat (modèle, URL, version...) ;
+    - cache=False : toujours recalculée (lecture de fichiers, récapitulatif...) ;
+    - cacheable(valeur) : False pour ne pas figer un échec (défaut : tout est gardé) ;
+    - allow_missing : s'exécute même si une dépendance a échoué (valeur None).
+    """
+
+    def __init__(self, name: str, fn, deps: tuple[str, ...] | list[str] = (), params=None,
+                 cache: bool = True, cacheable=None, allow_missing: bool = False):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.params = params
+        self.cache = cache
+        self.cacheable = cacheable or (lambda value: True)
+        self.allow_missing = allow_missing
+
+    def key(self, dep_hashes: dict[str, str | None]) -> str:
+        return value_hash([self.name, self.params, [(d, dep_hashes.get(d)) for d in self.deps]])
+
+
+def _run_stage(stage: Stage, inputs: dict, dep_hashes: dict, cache: ArtifactCache | None):
+    key = stage.key(dep_hashes)
+    if stage.cache and cache is not None:
+        found, value = cache.get(stage.name, key)
+        if found:
+            return value, True
+    value = stage.fn(inputs)
+    if stage.cache and cache is not None and stage.cacheable(value):
+        cache.put(stage.name, key, value)
+    return value, False
+
+
+def run_dag(stages: list[Stage], cache: ArtifactCache | None = None, max_workers: int = 8,
+            log=print) -> tuple[dict, set[str]]:
+    """
+    Exécute les étapes dans l'ordre des dépendances, en parallèle quand c'est
+    possible. Une étape qui lève une exception est notée en échec et ses
+    dépendantes sont sautées (sauf allow_missing).
+    Retourne ({nom: valeur}, noms des étapes relues depuis le cache).
+    """
+    remaining = {s.name: s for s in stages}
+    unknown = {d for s in stages for d in s.deps} - set(remaining)
+    if unknown:
+        raise ValueError(f"Unknown stage dependencies: {sorted(unknown)}")
+    values: dict = {}
+    hashes: dict[str, str] = {}
+    hits: set[str] = set()
+    failed: set[str] = set()
+    running: dict = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while remaining or running:
+            # Planifie tout ce qui est prêt (et propage les échecs jusqu'au point fixe)
+            changed = True
+            while changed:
+                changed = False
+                for name, stage in list(remaining.items()):
+                    if not stage.allow_missing and any(d in failed for d in stage.deps):
+                        log(f"⏭️ Étape {name} sautée (dépendance en échec)")
+                        failed.add(name)
+                        del remaining[name]
+                        changed = True
+                    elif all(d in values or d in failed for d in stage.deps):
+                        del remaining[name]
+                        inputs = {d: values.get(d) for d in stage.deps}
+                        running[pool.submit(_run_stage, stage, inputs, dict(hashes), cache)] = name
+                        changed = True
+            if not running:
+                raise ValueError(f"Dependency cycle between stages: {sorted(remaining)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    value, hit = future.result()
+                except Exception as e:
+                    log(f"❌ Étape {name} en échec : {e}")
+                    failed.add(name)
+                    continue
+                values[name] = value
+                hashes[name] = value_hash(value)
+                if hit:
+                    hits.add(name)
+    return values, hits
@@ -0,0 +1,222 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import traceback
+
+# =========================
+# Forkserver : interpréteur CPython préchargé pour les solveurs générés
+# =========================
+# Un processus serveur importe une fois aoc_fast, numpy et scipy.optimize
+# (~1 s de démarrage évité par exécution), puis forke un enfant par solveur.
+# L'enfant se place dans le répertoire du script, redirige stdout/stderr vers
+# des fichiers et exécute le script comme __main__ (runpy).
+# Protocole (lignes JSON) : requête {"id", "script", "stdout", "stderr"} ;
+# réponses {"id", "pid"} après le fork puis {"id", "returncode"} à la fin.
+
+HELPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+PRELOAD_MODULES = ("aoc_fast", "numpy", "scipy.optimize", "networkx")
+
+
+def helpers_env() -> dict[str, str]:
+    """Environnement des solveurs : HELPERS_DIR en tête du PYTHONPATH (import aoc_fast)."""
+    env = dict(os.environ)
+    path = env.get("PYTHONPATH")
+    env["PYTHONPATH"] = HELPERS_DIR + (os.pathsep + path if path else "")
+    return env
+
+
+# ---------- côté serveur ----------
+
+def _run_child(script: str, stdout_path: str, stderr_path: str) -> None:
+    """Dans l'enfant forké : exécute script et sort avec son code de retour (ne revient pas)."""
+    code = 0
+    try:
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        for fd, path in ((1, stdout_path), (2, stderr_path)):
+            target = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.dup2(target, fd)
+            os.close(target)
+        # Objets fichiers neufs : ceux du serveur ont pu être verrouillés par un autre thread au fork
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", closefd=False)
+        sys.stderr = open(2, "w", closefd=False)
+        directory = os.path.dirname(script)
+        os.chdir(directory)
+        sys.path.insert(0, directory)
+        sys.argv = [script]
+        import runpy
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def serve() -> None:
+    for name in PRELOAD_MODULES:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+    pids: dict[int, str] = {}
+    lock = threading.Lock()
+    out = sys.stdout.fileno()
+
+    def send(message: dict) -> None:
+        # os.write direct : aucun verrou d'objet fichier que le fork pourrait figer
+        os.write(out, (json.dumps(message) + "\n").encode("utf-8"))
+
+    def reap() -> None:
+        while True:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                threading.Event().wait(0.01)
+                continue
+            with lock:
+                request_id = pids.pop(pid, None)
+            if request_id is not None:
+                send({"id": request_id, "returncode": os.waitstatus_to_exitcode(status)})
+
+    threading.Thread(target=reap, daemon=True).start()
+    for line in sys.stdin:
+        request = json.loads(line)
+        with lock:
+            pid = os.fork()
+            if pid == 0:
+                _run_child(request["script"], request["stdout"], request["stderr"])
+            pids[pid] = request["id"]
+        send({"id": request["id"], "pid": pid})
+
+
+# ---------- côté client ----------
+
+class ForkedProcess:
+    """Enfant du forkserver, avec l'interface de subprocess.Popen utilisée par le pipeline."""
+
+    def __init__(self, server: "ForkServer", request_id: str, args, stdout_path: str, stderr_path: str):
+        self.args = args
+        self.pid: int | None = None
+        self.returncode: int | None = None
+        self._server = server
+        self._id = request_id
+        self._paths = (stdout_path, stderr_path)
+        self._started = threading.Event()
+        self._done = threading.Event()
+
+    def poll(self) -> int | None:
+        return self.returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        if not self._done.wait(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.returncode
+
+    def kill(self) -> None:
+        self._started.wait()
+        if self.returncode is None and self.pid:
+            try:
+                os.kill(self.pid, 9)
+            except ProcessLookupError:
+                pass
+
+    def communicate(self, timeout: float | None = None) -> tuple[str, str]:
+        self.wait(timeout)
+        outputs = []
+        for path in self._paths:
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    outputs.append(f.read())
+                os.remove(path)
+            except FileNotFoundError:
+                outputs.append("")
+        return outputs[0], outputs[1]
+
+
+class ForkServer:
+    """Client : démarre le serveur (python forkserver.py) et lui délègue les exécutions."""
+
+    def __init__(self, command: str = "python", scratch_dir: str | None = None):
+        self.scratch_dir = scratch_dir
+        self._proc = subprocess.Popen(
+            [command, os.path.abspath(__file__)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, env=helpers_env(),
+        )
+        self._pending: dict[str, ForkedProcess] = {}
+        self._lock = threading.Lock()
+        self._counter = 0
+        threading.Thread(target=self._read_replies, daemon=True).start()
+
+    def _read_replies(self) -> None:
+        for line in self._proc.stdout:
+            reply = json.loads(line)
+            with self._lock:
+                child = self._pending.get(reply["id"])
+                if child is not None and "returncode" in reply:
+                    del self._pending[reply["id"]]
+            if child is None:
+                continue
+            if "pid" in reply:
+                child.pid = reply["pid"]
+                child._started.set()
+            else:
+                child.returncode = reply["returncode"]
+                child._started.set()
+                child._done.set()
+        # Serveur mort : on libère tous ceux qui attendent
+        with self._lock:
+            orphans = list(self._pending.values())
+            self._pending.clear()
+        for child in orphans:
+            child.returncode = -9 if child.returncode is None else child.returncode
+            child._started.set()
+            child._done.set()
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def start(self, script: str) -> ForkedProcess:
+        """Lance script (chemin absolu, cwd = son répertoire) ; retourne un objet façon Popen."""
+        import tempfile
+        with self._lock:
+            self._counter += 1
+            request_id = str(self._counter)
+        scratch = self.scratch_dir or tempfile.gettempdir()
+        stdout_path = os.path.join(scratch, f"aoc_fork_{os.getpid()}_{request_id}.out")
+        stderr_path = os.path.join(scratch, f"aoc_fork_{os.getpid()}_{request_id}.err")
+        child = ForkedProcess(self, request_id, ["forkserver", script], stdout_path, stderr_path)
+        with self._lock:
+            self._pending[request_id] = child
+            self._proc.stdin.write(json.dumps({"id": request_id, "script": os.path.abspath(script),
+                                               "stdout": stdout_path, "stderr": stderr_path}) + "\n")
+            self._proc.stdin.flush()
+        return child
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+
+
+if __name__ == "__main__":
+    serve()
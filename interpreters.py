@@ -0,0 +1,95 @@
+import ast
+import shutil
+import subprocess
+import sys
+import threading
+
+from forkserver import helpers_env
+
+# =========================
+# Interpréteurs disponibles pour les solveurs générés (CPython / PyPy)
+# =========================
+# Beaucoup de solveurs AoC sont des boucles Python pures, bien plus rapides
+# sous PyPy ; ceux qui importent numpy/scipy restent sur CPython.
+
+# nom -> commande (la première commande trouvée dans le PATH est retenue)
+INTERPRETER_COMMANDS = {
+    "cpython": ("python", "python3"),
+    "pypy": ("pypy3", "pypy"),
+}
+DEFAULT_INTERPRETER = "cpython"
+
+# Modules importables sous PyPy mais beaucoup plus lents (extensions C via cpyext)
+CPYTHON_ONLY_MODULES = {"numpy", "scipy", "pandas", "numba", "sympy"}
+
+MODULE_PROBE_TIMEOUT = 10.0   # secondes pour vérifier les imports d'un interpréteur
+
+_available: dict[str, str] | None = None
+_missing_cache: dict[tuple[str, str], bool] = {}   # (commande, module) -> absent ?
+_lock = threading.Lock()
+
+
+def available_interpreters() -> dict[str, str]:
+    """{nom: chemin} des interpréteurs présents, CPython en premier."""
+    global _available
+    with _lock:
+        if _available is None:
+            _available = {}
+            for name, commands in INTERPRETER_COMMANDS.items():
+                path = next((p for p in map(shutil.which, commands) if p), None)
+                if path:
+                    _available[name] = path
+        return dict(_available)
+
+
+def imported_modules(code: str) -> set[str]:
+    """Modules de premier niveau importés par le code (vide si le code ne parse pas)."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return set()
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module.split(".")[0])
+    return modules
+
+
+def third_party_modules(code: str) -> set[str]:
+    return {m for m in imported_modules(code) if m not in sys.stdlib_module_names}
+
+
+def missing_modules(command: str, modules: set[str]) -> set[str]:
+    """Modules introuvables sous `command` (un seul sous-processus pour les modules pas encore vus)."""
+    with _lock:
+        unknown = sorted(m for m in modules if (command, m) not in _missing_cache)
+    if unknown:
+        probe = ("import importlib.util, sys\n"
+                 "print(' '.join(m for m in sys.argv[1:] if importlib.util.find_spec(m) is None))")
+        try:
+            out = subprocess.run([command, "-c", probe, *unknown], capture_output=True, text=True,
+                                 timeout=MODULE_PROBE_TIMEOUT, env=helpers_env()).stdout.split()
+        except (OSError, subprocess.TimeoutExpired):
+            out = unknown
+        with _lock:
+            for m in unknown:
+                _missing_cache[(command, m)] = m in out
+    with _lock:
+        return {m for m in modules if _missing_cache[(command, m)]}
+
+
+def compatible_interpreters(code: str) -> list[str]:
+    """
+    Interpréteurs (noms) capables d'exécuter le code : tous ses imports tiers
+    doivent y être installés, et PyPy est exclu pour CPYTHON_ONLY_MODULES.
+    """
+    modules = third_party_modules(code)
+    compatible = []
+    for name, command in available_interpreters().items():
+        if name == "pypy" and modules & CPYTHON_ONLY_MODULES:
+            continue
+        if not missing_modules(command, modules):
+            compatible.append(name)
+    return compatible
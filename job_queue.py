@@ -0,0 +1,412 @@
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import threading
+import time
+
+# =========================
+# File de jobs d'exécution des solveurs (workers locaux ou distants)
+# =========================
+# Le pipeline dépose chaque exécution (code, input, timeout, interpréteurs)
+# dans une file ; des workers (python job_queue.py worker ...) sur une ou
+# plusieurs machines la vident, exécutent dans leur bac à sable tmpfs et
+# renvoient le résultat. Deux backends :
+#   - SQLite (fichier local ou partagé, un seul hôte de préférence) ;
+#   - Redis (redis://hôte:port/db, plusieurs hôtes), paquet `redis` requis.
+# Les inputs sont stockés une fois par hash, pas recopiés dans chaque job.
+
+QUEUE_URL_ENV = "AOC_QUEUE_URL"
+DEFAULT_QUEUE_PATH = "aoc_jobs.db"
+QUEUE_POLL_INTERVAL = 0.05       # secondes entre deux lectures de la file (SQLite)
+QUEUE_POLL_MAX_INTERVAL = 0.5
+LEASE_MARGIN = 30.0              # secondes au-delà du timeout avant de redonner un job à un autre worker
+RESULT_WAIT_MARGIN = 300.0       # secondes d'attente d'un résultat au-delà du timeout du job
+HEARTBEAT_INTERVAL = 2.0         # secondes minimum entre deux battements d'un même worker
+HEARTBEAT_TTL = 10.0             # secondes sans battement ni bail en cours : plus aucun worker vivant
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at  REAL    NOT NULL,
+    status      TEXT    NOT NULL,          -- queued / running / done
+    payload     TEXT    NOT NULL,          -- JSON : code, input_hash, timeout, interpreters
+    result      TEXT,                      -- JSON : returncode, stdout, stderr, elapsed, interpreter, timed_out
+    worker      TEXT,
+    lease_until REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id);
+
+CREATE TABLE IF NOT EXISTS inputs (
+    input_hash TEXT PRIMARY KEY,
+    text       TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS workers (
+    worker    TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL                -- dernier battement (appel à claim)
+);
+"""
+
+
+def input_hash(input_text: str) -> str:
+    return hashlib.sha256(input_text.encode("utf-8")).hexdigest()
+
+
+class SqliteJobQueue:
+    """File de jobs dans une base SQLite (WAL) ; réclamation atomique par BEGIN IMMEDIATE."""
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SQLITE_SCHEMA)
+        self._beats: dict[str, float] = {}
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def put_input(self, input_text: str) -> str:
+        digest = input_hash(input_text)
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO inputs (input_hash, text) VALUES (?, ?)", (digest, input_text))
+        return digest
+
+    def get_input(self, digest: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM inputs WHERE input_hash = ?", (digest,)).fetchone()
+        return row["text"] if row else None
+
+    def submit(self, payload: dict) -> str:
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO jobs (created_at, status, payload) VALUES (?, 'queued', ?)",
+                (time.time(), json.dumps(payload)),
+            )
+        return str(cur.lastrowid)
+
+    def heartbeat(self, worker: str) -> None:
+        """Signale que worker est vivant (au plus un écrit par HEARTBEAT_INTERVAL)."""
+        now = time.time()
+        if now - self._beats.get(worker, 0.0) < HEARTBEAT_INTERVAL:
+            return
+        self._beats[worker] = now
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO workers (worker, last_seen) VALUES (?, ?)", (worker, now))
+
+    def workers_alive(self) -> bool:
+        """Vrai si un worker a battu depuis HEARTBEAT_TTL secondes ou tient un bail en cours."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT 1 FROM workers WHERE last_seen >= ?
+                UNION ALL
+                SELECT 1 FROM jobs WHERE status = 'running' AND lease_until >= ?
+                LIMIT 1
+                """,
+                (now - HEARTBEAT_TTL, now),
+            ).fetchone()
+        return row is not None
+
+    def claim(self, worker: str, block: float = 0.0) -> tuple[str, dict] | None:
+        """Réserve le plus ancien job en attente (ou dont le bail a expiré) ; None après `block` secondes."""
+        deadline = time.monotonic() + block
+        interval = QUEUE_POLL_INTERVAL
+        while True:
+            self.heartbeat(worker)
+            with self._lock:
+                now = time.time()
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._conn.execute(
+                        """
+                        SELECT id, payload FROM jobs
+                        WHERE status = 'queued' OR (status = 'running' AND lease_until < ?)
+                        ORDER BY id LIMIT 1
+                        """,
+                        (now,),
+                    ).fetchone()
+                    if row is not None:
+                        payload = json.loads(row["payload"])
+                        self._conn.execute(
+                            "UPDATE jobs SET status = 'running', worker = ?, lease_until = ? WHERE id = ?",
+                            (worker, now + payload["timeout"] + LEASE_MARGIN, row["id"]),
+                        )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            if row is not None:
+                return str(row["id"]), payload
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            interval = min(interval * 2, QUEUE_POLL_MAX_INTERVAL)
+
+    def complete(self, job_id: str, result: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, finished_at = ? WHERE id = ?",
+                (json.dumps(result), time.time(), int(job_id)),
+            )
+
+    def wait_result(self, job_id: str, timeout: float) -> dict | None:
+        deadline = time.monotonic() + timeout
+        interval = QUEUE_POLL_INTERVAL
+        while True:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT result FROM jobs WHERE id = ? AND status = 'done'", (int(job_id),)
+                ).fetchone()
+            if row is not None:
+                return json.loads(row["result"])
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(interval)
+            interval = min(interval * 2, QUEUE_POLL_MAX_INTERVAL)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+
+class RedisJobQueue:
+    """
+    File de jobs Redis : liste `<prefix>:queue` (LPUSH / script de réclamation),
+    payload dans `<prefix>:job:<id>`, résultat poussé sur `<prefix>:result:<id>`
+    (BLPOP). Les jobs réclamés sont indexés dans `<prefix>:running` (score = fin
+    du bail) par le même script Lua que le retrait de la file : un worker qui
+    meurt après la réclamation laisse toujours un bail que _requeue_expired
+    remet en file. Battements des workers dans `<prefix>:workers` (score = date).
+    """
+
+    INPUT_TTL = 7 * 24 * 3600   # secondes de rétention des inputs
+    RESULT_TTL = 24 * 3600
+
+    # KEYS : queue, running, préfixe des payloads ; ARGV : maintenant, LEASE_MARGIN
+    CLAIM_SCRIPT = """
+    local job_id = redis.call('RPOP', KEYS[1])
+    if not job_id then return false end
+    local raw = redis.call('GET', KEYS[3] .. job_id)
+    if not raw then return false end
+    local lease = tonumber(ARGV[1]) + cjson.decode(raw)['timeout'] + tonumber(ARGV[2])
+    redis.call('ZADD', KEYS[2], lease, job_id)
+    return {job_id, raw}
+    """
+
+    def __init__(self, url: str, prefix: str = "aoc"):
+        import redis   # dépendance optionnelle : uniquement pour ce backend
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._claim_script = self._redis.register_script(self.CLAIM_SCRIPT)
+        self._beats: dict[str, float] = {}
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    def close(self) -> None:
+        self._redis.close()
+
+    def put_input(self, input_text: str) -> str:
+        digest = input_hash(input_text)
+        self._redis.set(self._key("input", digest), input_text, ex=self.INPUT_TTL)
+        return digest
+
+    def get_input(self, digest: str) -> str | None:
+        return self._redis.get(self._key("input", digest))
+
+    def submit(self, payload: dict) -> str:
+        job_id = str(self._redis.incr(self._key("next_id")))
+        pipe = self._redis.pipeline()
+        pipe.set(self._key("job", job_id), json.dumps(payload), ex=self.RESULT_TTL)
+        pipe.lpush(self._key("queue"), job_id)
+        pipe.execute()
+        return job_id
+
+    def _requeue_expired(self) -> None:
+        for job_id in self._redis.zrangebyscore(self._key("running"), 0, time.time()):
+            if self._redis.zrem(self._key("running"), job_id):
+                self._redis.lpush(self._key("queue"), job_id)
+
+    def heartbeat(self, worker: str) -> None:
+        now = time.time()
+        if now - self._beats.get(worker, 0.0) < HEARTBEAT_INTERVAL:
+            return
+        self._beats[worker] = now
+        pipe = self._redis.pipeline()
+        pipe.zadd(self._key("workers"), {worker: now})
+        pipe.zremrangebyscore(self._key("workers"), 0, now - HEARTBEAT_TTL)
+        pipe.execute()
+
+    def workers_alive(self) -> bool:
+        now = time.time()
+        return bool(self._redis.zcount(self._key("workers"), now - HEARTBEAT_TTL, "+inf")
+                    or self._redis.zcount(self._key("running"), now, "+inf"))
+
+    def claim(self, worker: str, block: float = 0.0) -> tuple[str, dict] | None:
+        """Retrait de la file et bail en une opération atomique (CLAIM_SCRIPT) ; None après `block` secondes."""
+        deadline = time.monotonic() + block
+        interval = QUEUE_POLL_INTERVAL
+        while True:
+            self.heartbeat(worker)
+            self._requeue_expired()
+            claimed = self._claim_script(keys=[self._key("queue"), self._key("running"), self._key("job", "")],
+                                         args=[time.time(), LEASE_MARGIN])
+            if claimed:
+                job_id, raw = claimed
+                return job_id, json.loads(raw)
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            interval = min(interval * 2, QUEUE_POLL_MAX_INTERVAL)
+
+    def complete(self, job_id: str, result: dict) -> None:
+        pipe = self._redis.pipeline()
+        pipe.zrem(self._key("running"), job_id)
+        pipe.lpush(self._key("result", job_id), json.dumps(result))
+        pipe.expire(self._key("result", job_id), self.RESULT_TTL)
+        pipe.delete(self._key("job", job_id))
+        pipe.execute()
+
+    def wait_result(self, job_id: str, timeout: float) -> dict | None:
+        popped = self._redis.blpop(self._key("result", job_id), timeout=max(1, int(timeout)))
+        return json.loads(popped[1]) if popped else None
+
+    def stats(self) -> dict[str, int]:
+        return {"queued": self._redis.llen(self._key("queue")), "running": self._redis.zcard(self._key("running"))}
+
+
+def open_queue(url: str | None = None):
+    """
+    'redis://...' -> RedisJobQueue ; 'sqlite:///chemin.db' ou un chemin -> SqliteJobQueue.
+    Sans argument : variable d'environnement AOC_QUEUE_URL, sinon DEFAULT_QUEUE_PATH.
+    """
+    url = url or os.environ.get(QUEUE_URL_ENV) or DEFAULT_QUEUE_PATH
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobQueue(url)
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///"):]
+    return SqliteJobQueue(url)
+
+
+def run_remote(queue, code: str, input_text: str, timeout: float,
+               interpreters: list[str]) -> tuple[int, str, str, float, str]:
+    """
+    Dépose le job et attend son résultat (même contrat que memoized_run) :
+    (code de retour, stdout, stderr, durée, interpréteur), ou
+    subprocess.TimeoutExpired si le worker a dépassé le timeout.
+    RuntimeError si aucun worker n'a rendu de résultat à temps, et tout de suite
+    (sans attendre le timeout) si aucun worker n'est vivant (queue.workers_alive).
+    """
+    if not queue.workers_alive():
+        raise RuntimeError(f"No job queue worker alive (no heartbeat or lease within {HEARTBEAT_TTL:.0f}s)")
+    digest = queue.put_input(input_text)
+    job_id = queue.submit({"code": code, "input_hash": digest, "timeout": timeout, "interpreters": interpreters})
+    # Attente par tranches de HEARTBEAT_TTL : on abandonne dès que plus aucun worker n'est vivant
+    deadline = time.monotonic() + timeout + RESULT_WAIT_MARGIN
+    result = None
+    while result is None and time.monotonic() < deadline:
+        result = queue.wait_result(job_id, min(HEARTBEAT_TTL, max(0.0, deadline - time.monotonic())))
+        if result is None and not queue.workers_alive():
+            raise RuntimeError(f"Job queue workers vanished while waiting for job {job_id}")
+    if result is None:
+        raise RuntimeError(f"No worker returned job {job_id} within {timeout + RESULT_WAIT_MARGIN:.0f}s")
+    if result.get("error"):
+        raise RuntimeError(f"Worker {result.get('worker')} failed on job {job_id}: {result['error']}")
+    if result["timed_out"]:
+        raise subprocess.TimeoutExpired(interpreters, timeout)
+    return result["returncode"], result["stdout"], result["stderr"], result["elapsed"], result["interpreter"]
+
+
+# =========================
+# Worker
+# =========================
+
+def execute_job(payload: dict, input_text: str) -> dict:
+    """Exécute un job dans le bac à sable local (all2V2.memoized_run, sans nouvelle mise en file)."""
+    import all2V2
+    from interpreters import available_interpreters, DEFAULT_INTERPRETER
+    # Cet hôte n'a pas forcément les mêmes interpréteurs que le pipeline
+    interpreters = [i for i in payload["interpreters"] if i in available_interpreters()] or [DEFAULT_INTERPRETER]
+    try:
+        returncode, stdout, stderr, elapsed, interpreter = all2V2.memoized_run(
+            payload["code"], input_text, payload["timeout"], interpreters, local=True)
+    except subprocess.TimeoutExpired:
+        return {"timed_out": True}
+    return {"timed_out": False, "returncode": returncode, "stdout": stdout, "stderr": stderr,
+            "elapsed": elapsed, "interpreter": interpreter}
+
+
+def run_worker(url: str | None = None, concurrency: int = 1, once: bool = False) -> None:
+    """Boucle de worker : `concurrency` threads réclament, exécutent et rendent des jobs."""
+    import all2V2
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    if all2V2.FORKSERVER_ENABLED:
+        all2V2.get_forkserver()
+    print(f"Worker {worker} sur {url or os.environ.get(QUEUE_URL_ENV) or DEFAULT_QUEUE_PATH} "
+          f"({concurrency} thread(s))")
+
+    def loop() -> None:
+        queue = open_queue(url)   # une connexion par thread
+        try:
+            while True:
+                claimed = queue.claim(worker, block=1.0)
+                if claimed is None:
+                    if once:
+                        return
+                    continue
+                job_id, payload = claimed
+                input_text = queue.get_input(payload["input_hash"])
+                try:
+                    if input_text is None:
+                        raise RuntimeError(f"input {payload['input_hash']} not found")
+                    result = execute_job(payload, input_text)
+                except Exception as e:
+                    result = {"timed_out": False, "error": str(e)}
+                result["worker"] = worker
+                queue.complete(job_id, result)
+                status = "timeout" if result["timed_out"] else result.get("error") or f"rc={result['returncode']}"
+                print(f"[{worker}] job {job_id} : {status}")
+        finally:
+            queue.close()
+
+    threads = [threading.Thread(target=loop, daemon=True) for _ in range(max(1, concurrency))]
+    for t in threads:
+        t.start()
+    try:
+        for t in threads:
+            t.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        all2V2.cleanup_shared_inputs()
+        all2V2.shutdown_forkserver()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="File d'exécution des solveurs AoC")
+    parser.add_argument("command", choices=["worker", "stats"])
+    parser.add_argument("--url", default=None,
+                        help=f"redis://hôte:port/db ou chemin SQLite (défaut : ${QUEUE_URL_ENV} ou {DEFAULT_QUEUE_PATH})")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1,
+                        help="exécutions simultanées par worker")
+    parser.add_argument("--once", action="store_true", help="s'arrête quand la file est vide")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "worker":
+        run_worker(args.url, args.concurrency, args.once)
+    else:
+        q = open_queue(args.url)
+        print(q.stats())
+        q.close()
@@ -0,0 +1,118 @@
+# =========================
+# Routage des modèles d'après l'historique (latence, coût, justesse)
+# =========================
+# Chaque fournisseur/modèle reçoit un profil tiré de la base de résultats,
+# du plus spécifique au plus général : même partie et même tranche de taille
+# d'input, puis même partie, puis tout l'historique ; à défaut, un a priori.
+# Score = (coût moyen en $ + latence moyenne × LATENCY_COST_PER_SECOND) / taux
+# de réponses justes : le coût attendu d'une réponse juste. Le pipeline
+# interroge les modèles dans l'ordre du score et n'escalade vers les suivants
+# que si les réponses divergent ou qu'un solveur échoue (answers_settled).
+
+# Prix publics en USD par million de tokens (entrée, sortie), indexés par les
+# identifiants exacts des constantes *_MODEL de all.py / all2V2.py : un modèle
+# absent de la table est une erreur (pas de prix par défaut qui fausserait le tri)
+MODEL_PRICES = {
+    "o3": (2.0, 8.0),
+    "o3-mini": (1.10, 4.40),
+    "gpt-5.1": (1.25, 10.0),
+    "claude-sonnet-4-20250514": (3.0, 15.0),
+    "claude-haiku-4-5": (1.0, 5.0),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.0),
+}
+
+# Tranches de taille d'input (octets) : [min, max)
+INPUT_SIZE_BUCKETS = ((0, 10_000), (10_000, 100_000), (100_000, None))
+
+ROUTER_MIN_RUNS = 3               # runs minimum pour se fier à un niveau de l'historique
+LATENCY_COST_PER_SECOND = 0.002   # $ équivalents à une seconde d'attente
+MIN_CORRECT_RATE = 0.05           # plancher (évite la division par 0 d'un modèle toujours faux)
+
+# Profil d'un modèle sans historique suffisant
+PRIOR_PROFILE = {"correct_rate": 0.6, "avg_latency": 60.0,
+                 "avg_input_tokens": 3000.0, "avg_output_tokens": 4000.0}
+
+
+def check_prices(providers: list[tuple]) -> None:
+    """ValueError si un modèle des fournisseurs (tuples (libellé, modèle, ...)) n'a pas de prix."""
+    missing = sorted({model for _, model, *_ in providers if model not in MODEL_PRICES})
+    if missing:
+        raise ValueError(f"Modèle(s) sans prix dans MODEL_PRICES : {', '.join(missing)}")
+
+
+def run_cost(model: str, input_tokens: float | None, output_tokens: float | None) -> float:
+    if model not in MODEL_PRICES:
+        raise ValueError(f"Modèle sans prix dans MODEL_PRICES : {model}")
+    price_in, price_out = MODEL_PRICES[model]
+    return ((input_tokens or 0) * price_in + (output_tokens or 0) * price_out) / 1e6
+
+
+def size_bucket(input_bytes: int | None) -> tuple[int, int | None] | None:
+    if input_bytes is None:
+        return None
+    for low, high in INPUT_SIZE_BUCKETS:
+        if input_bytes >= low and (high is None or input_bytes < high):
+            return low, high
+    return None
+
+
+def model_profiles(store, providers: list[tuple], part: int, input_bytes: int | None) -> dict[str, dict]:
+    """
+    {libellé: profil} pour les fournisseurs (tuples (libellé, modèle, ...)).
+    Profil = stats de store.model_stats au niveau le plus spécifique ayant
+    au moins ROUTER_MIN_RUNS runs, "level" indiquant lequel ("prior" sinon).
+    """
+    bucket = size_bucket(input_bytes)
+    levels = []
+    if bucket is not None:
+        levels.append(("part+size", store.model_stats(part, bucket[0], bucket[1])))
+    levels.append(("part", store.model_stats(part)))
+    levels.append(("all", store.model_stats()))
+
+    profiles = {}
+    for label, model, *_ in providers:
+        profile = dict(PRIOR_PROFILE, level="prior", runs=0)
+        for level, rows in levels:
+            row = next((r for r in rows if r["provider"] == label and r["model"] == model), None)
+            if row is not None and row["runs"] >= ROUTER_MIN_RUNS:
+                profile = dict(row, level=level)
+                break
+        profiles[label] = profile
+    return profiles
+
+
+def expected_cost(model: str, profile: dict) -> float:
+    """Coût attendu ($ + latence convertie) d'une réponse juste."""
+    cost = run_cost(model, profile["avg_input_tokens"], profile["avg_output_tokens"])
+    latency = profile["avg_latency"] or 0.0
+    return (cost + latency * LATENCY_COST_PER_SECOND) / max(profile["correct_rate"] or 0.0, MIN_CORRECT_RATE)
+
+
+def route(store, providers: list[tuple], part: int, input_bytes: int | None = None,
+          log=print) -> list[tuple]:
+    """Fournisseurs triés du moins cher au plus cher (coût attendu d'une réponse juste)."""
+    check_prices(providers)
+    profiles = model_profiles(store, providers, part, input_bytes)
+    ranked = sorted(providers, key=lambda p: expected_cost(p[1], profiles[p[0]]))
+    for label, model, *_ in ranked:
+        profile = profiles[label]
+        log(f"🧭 {label} ({model}) : {expected_cost(model, profile):.4f} $/réponse juste, "
+            f"justesse {profile['correct_rate']:.0%}, latence {profile['avg_latency']:.0f}s "
+            f"[{profile['level']}, {profile['runs']} run(s)]")
+    return ranked
+
+
+def answers_settled(candidates: list[dict], quorum: int) -> bool:
+    """
+    Vrai si une réponse est donnée par au moins quorum candidats 'ok' et
+    strictement plus souvent que toute autre (pas de désaccord à trancher).
+    """
+    votes: dict[str, int] = {}
+    for c in candidates:
+        if c["status"] == "ok":
+            votes[c["answer"]] = votes.get(c["answer"], 0) + 1
+    if not votes:
+        return False
+    counts = sorted(votes.values(), reverse=True)
+    return counts[0] >= quorum and (len(counts) == 1 or counts[0] > counts[1])
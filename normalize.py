@@ -0,0 +1,179 @@
+import ast
+import hashlib
+import symtable
+
+# =========================
+# Normalisation AST des solveurs candidats (déduplication)
+# =========================
+# Deux candidats qui ne diffèrent que par les espaces, les commentaires, les
+# docstrings ou le nom de leurs variables locales ont la même forme normale,
+# donc le même hash : un seul des deux est réellement exécuté.
+
+# Si le code y fait référence, les noms locaux sont observables : pas de renommage
+INTROSPECTION_NAMES = {"locals", "vars", "eval", "exec"}
+
+
+def _strip_docstrings(tree: ast.AST) -> None:
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            body = node.body
+            if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+                    and isinstance(body[0].value.value, str):
+                body.pop(0)
+                if not body:
+                    body.append(ast.Pass())
+
+
+def _scope_nodes(func: ast.AST):
+    """
+    Nœuds appartenant à la portée propre de func : on ne descend pas dans le
+    corps des fonctions, lambdas, classes et compréhensions imbriquées (seulement
+    dans ce qui est évalué dans la portée courante : décorateurs, valeurs par
+    défaut, bases, premier itérable d'une compréhension).
+    """
+    stack = list(reversed(func.body))
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            children = list(node.args.defaults) + [d for d in node.args.kw_defaults if d is not None]
+            if not isinstance(node, ast.Lambda):
+                children += node.decorator_list
+        elif isinstance(node, ast.ClassDef):
+            children = node.decorator_list + node.bases + [k.value for k in node.keywords]
+        elif isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+            children = [node.generators[0].iter]
+        else:
+            children = list(ast.iter_child_nodes(node))
+        stack.extend(reversed(children))
+
+
+def _function_tables(table: symtable.SymbolTable, out: dict) -> dict:
+    """{(nom, ligne): table} des fonctions ; None si deux fonctions partagent la clé."""
+    for child in table.get_children():
+        if child.get_type() == "function":
+            key = (child.get_name(), child.get_lineno())
+            out[key] = None if key in out else child
+        _function_tables(child, out)
+    return out
+
+
+def _free_in_children(table: symtable.SymbolTable) -> set[str]:
+    """Noms lus par une portée imbriquée dans celle-ci (variables de fermeture)."""
+    names = set()
+    for child in table.get_children():
+        names.update(sym.get_name() for sym in child.get_symbols() if sym.is_free())
+        names |= _free_in_children(child)
+    return names
+
+
+def _renamable(table: symtable.SymbolTable, func: ast.AST) -> set[str]:
+    """
+    Variables locales de func liées uniquement par des affectations simples
+    (ast.Name) : ni paramètres, ni imports, ni global/nonlocal, ni noms de
+    def/class, ni variables capturées par une fermeture. Par prudence, un nom
+    qui apparaît aussi dans une portée imbriquée (compréhension avec :=,
+    lambda, fonction interne) n'est pas renommé.
+    """
+    own = {id(node) for node in _scope_nodes(func)}
+    nested = {n.id for n in ast.walk(func) if isinstance(n, ast.Name) and id(n) not in own}
+    captured = _free_in_children(table) | nested
+    local = {sym.get_name() for sym in table.get_symbols()
+             if sym.is_local() and sym.is_assigned() and not sym.is_parameter()
+             and not sym.is_imported() and not sym.is_namespace() and sym.get_name() not in captured}
+    bound_by_name, bound_otherwise = set(), set()
+    for node in _scope_nodes(func):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            bound_by_name.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound_otherwise.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            bound_otherwise.update(node.names)
+        elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name:
+            bound_otherwise.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            bound_otherwise.add(node.rest)
+    return (local & bound_by_name) - bound_otherwise
+
+
+def _module_names(tree: ast.AST) -> set[str]:
+    """Tous les identifiants du module (variables, paramètres, def/class, imports, attributs...)."""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast.alias):
+            names.add(node.asname or node.name.split(".")[0])
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            names.add(node.rest)
+        elif isinstance(getattr(node, "name", None), str):
+            names.add(node.name)   # def, class, except ... as, motifs match
+    return names
+
+
+def _rename_locals(tree: ast.AST, tables: dict) -> None:
+    """
+    Renomme, fonction par fonction (ordre du source), les variables locales
+    (au sens de symtable) en _v0, _v1... dans l'ordre de première apparition,
+    en sautant les noms déjà présents dans le module (un global _v0 lu dans
+    une fonction ne doit pas être confondu avec une locale renommée).
+    Seuls les nœuds de la portée propre de la fonction sont touchés : un même
+    nom lu comme global ou lié dans une fonction imbriquée garde son sens.
+    """
+    taken = _module_names(tree)
+    counter = 0
+
+    def fresh() -> str:
+        nonlocal counter
+        while f"_v{counter}" in taken:
+            counter += 1
+        counter += 1
+        return f"_v{counter - 1}"
+
+    for func in [n for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]:
+        table = tables.get((func.name, func.lineno))
+        if table is None:
+            continue
+        names = _renamable(table, func)
+        mapping: dict[str, str] = {}
+        for node in _scope_nodes(func):
+            if isinstance(node, ast.Name) and node.id in names:
+                if node.id not in mapping:
+                    mapping[node.id] = fresh()
+                node.id = mapping[node.id]
+
+
+def normalize_code(code: str) -> str:
+    """
+    Forme normale du code : docstrings retirées, variables locales renommées,
+    puis ast.unparse (ce qui efface espaces et commentaires). Le code qui ne
+    parse pas est rendu tel quel.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code
+    _strip_docstrings(tree)
+    introspects = any(isinstance(n, ast.Name) and n.id in INTROSPECTION_NAMES for n in ast.walk(tree))
+    if not introspects:
+        try:
+            tables = _function_tables(symtable.symtable(code, "<candidate>", "exec"), {})
+        except SyntaxError:
+            tables = {}   # ex. nonlocal mal placé : parse mais ne compile pas
+        _rename_locals(tree, tables)
+    normalized = ast.unparse(tree)
+    try:
+        compile(normalized, "<normalized>", "exec")
+    except SyntaxError:
+        return code
+    return normalized
+
+
+def normalized_hash(code: str) -> str:
+    return hashlib.sha256(normalize_code(code).encode("utf-8")).hexdigest()
@@ -0,0 +1,135 @@
+import math
+import re
+
+# =========================
+# Compaction de l'énoncé partie 1 sous un budget de tokens
+# =========================
+# L'article AoC est découpé en segments (titre, paragraphes, listes, blocs
+# <pre>). On garde les règles (paragraphes avec <code>, mots-clés de l'input ou
+# du format, question en <em>) et un seul exemple ; les doublons disparaissent,
+# puis, tant que le budget est dépassé, on retire le récit (le reste, y compris
+# l'emphase seule) et les exemples supplémentaires (traces déroulées, les plus
+# longs d'abord). Les règles ne sont jamais retirées, même au-delà du budget.
+# Si le résultat n'est pas plus court que le texte d'origine, on garde ce dernier.
+
+CHARS_PER_TOKEN = 4.0          # estimation quand le tokenizer du fournisseur n'est pas disponible
+OPENAI_ENCODING = "o200k_base"
+
+_encoders: dict = {}
+
+# Mots qui font d'un paragraphe une règle (description de l'input, du format, de la réponse)
+RULE_KEYWORDS = re.compile(r"\b(input|format|answer|each line)\b", re.IGNORECASE)
+
+
+def count_tokens(text: str, provider: str | None = None) -> int:
+    """
+    Taille de text en tokens pour provider (libellé de PROVIDERS_PART2 : "ChatGPT", "Claude", "Gemini") :
+    tiktoken pour ChatGPT s'il est installé, sinon estimation len / CHARS_PER_TOKEN
+    (pas de tokenizer hors ligne pour Claude et Gemini).
+    """
+    if provider == "ChatGPT":
+        if "tiktoken" not in _encoders:
+            try:
+                import tiktoken
+                _encoders["tiktoken"] = tiktoken.get_encoding(OPENAI_ENCODING)
+            except Exception:
+                _encoders["tiktoken"] = None
+        encoder = _encoders["tiktoken"]
+        if encoder is not None:
+            return len(encoder.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def article_segments(html: str, selector: str = "article.day-desc") -> list[dict]:
+    """
+    Segments de premier niveau des articles : {"kind", "text"} avec kind parmi
+    "title", "rule", "narrative", "example" (premier <pre> annoncé comme exemple,
+    à défaut le premier <pre> ; la phrase qui l'introduit est gardée comme règle)
+    et "extra_example" (autres <pre>).
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    segments = []
+    for article in soup.select(selector):
+        for element in article.find_all(recursive=False):
+            if element.name == "pre":
+                segments.append({"kind": "extra_example", "text": element.get_text().rstrip("\n")})
+                continue
+            text = re.sub(r"\s+", " ", element.get_text()).strip()
+            if not text:
+                continue
+            if element.name in ("h1", "h2", "h3"):
+                kind = "title"
+            elif element.find("code") is not None or RULE_KEYWORDS.search(text):
+                kind = "rule"
+            elif element.find("em") is not None and "?" in text:
+                kind = "rule"   # la question posée ("What is ...?" en <em>)
+            else:
+                kind = "narrative"
+            segments.append({"kind": kind, "text": text})
+
+    examples = [i for i, s in enumerate(segments) if s["kind"] == "extra_example"]
+    announced = [i for i in examples if i > 0 and "example" in segments[i - 1]["text"].lower()]
+    if examples:
+        kept = (announced or examples)[0]
+        segments[kept]["kind"] = "example"
+        if kept > 0 and segments[kept - 1]["kind"] == "narrative":
+            segments[kept - 1]["kind"] = "rule"   # phrase qui introduit l'exemple ("For example:")
+    return segments
+
+
+def render_segments(segments: list[dict]) -> str:
+    return "\n\n".join(s["text"] for s in segments)
+
+
+def compact_part1(html: str, budget: int | None, selector: str = "article.day-desc",
+                  provider: str | None = None) -> tuple[str, list[str]]:
+    """
+    Texte de l'énoncé partie 1 tenant si possible dans budget tokens (None = pas
+    de limite, seulement la déduplication). Retourne (texte, kinds retirés).
+    """
+    seen: set[str] = set()
+    segments = []
+    dropped = []
+    for segment in article_segments(html, selector):
+        key = _normalize(segment["text"])
+        if key in seen:
+            dropped.append("duplicate")
+            continue
+        seen.add(key)
+        segments.append(segment)
+
+    if budget is None:
+        return render_segments(segments), dropped
+
+    # Ordre de retrait : récit (dans l'ordre du texte), puis exemples supplémentaires (plus longs d'abord)
+    removable = [s for s in segments if s["kind"] == "narrative"]
+    removable += sorted((s for s in segments if s["kind"] == "extra_example"), key=lambda s: -len(s["text"]))
+    for segment in removable:
+        if count_tokens(render_segments(segments), provider) <= budget:
+            break
+        segments.remove(segment)
+        dropped.append(segment["kind"])
+    return render_segments(segments), dropped
+
+
+def compaction_report(original: str, compacted: str, providers: list[str]) -> dict[str, tuple[int, int]]:
+    """{fournisseur: (tokens avant, tokens après)}."""
+    return {p: (count_tokens(original, p), count_tokens(compacted, p)) for p in providers}
+
+
+def pick_smaller(original: str, compacted: str,
+                 providers: list[str]) -> tuple[str, bool, dict[str, tuple[int, int]]]:
+    """
+    (texte, compacté ?, rapport) : le texte compacté seulement s'il est
+    strictement plus court pour chaque fournisseur, sinon l'original (gain nul,
+    jamais négatif).
+    """
+    report = compaction_report(original, compacted, providers)
+    if all(after < before for before, after in report.values()):
+        return compacted, True, report
+    return original, False, {p: (before, before) for p, (before, _) in report.items()}
@@ -0,0 +1,85 @@
+import os
+import sys
+import threading
+import time
+
+# =========================
+# Registre des clients LLM (import + construction paresseux)
+# =========================
+# Les SDK (openai, anthropic, google.generativeai) ne sont importés et les
+# clients construits qu'au premier appel : un run qui n'utilise qu'un
+# fournisseur ne paie pas les deux autres imports, et une clé manquante
+# ne fait échouer que le fournisseur concerné.
+
+IMPORT_TIME_BUDGET = 1.0   # secondes : au-delà, on signale l'import (import + construction) trop lent
+
+# Temps mesurés (secondes) par client : "openai", "anthropic", "gemini:<modèle>"
+PROVIDER_IMPORT_TIMES: dict[str, float] = {}
+
+_clients: dict[str, object] = {}
+_locks: dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def _get_or_create(key: str, factory):
+    with _registry_lock:
+        if key in _clients:
+            return _clients[key]
+        lock = _locks.setdefault(key, threading.Lock())
+    # Verrou par client : deux fournisseurs différents s'initialisent en parallèle
+    with lock:
+        if key not in _clients:
+            start = time.perf_counter()
+            client = factory()
+            elapsed = time.perf_counter() - start
+            PROVIDER_IMPORT_TIMES[key] = elapsed
+            if elapsed > IMPORT_TIME_BUDGET:
+                print(f"⏱️ Initialisation de {key} : {elapsed:.2f}s (budget {IMPORT_TIME_BUDGET:.1f}s)",
+                      file=sys.stderr)
+            _clients[key] = client
+        return _clients[key]
+
+
+def get_openai_client():
+    """Client OpenAI (utilise OPENAI_API_KEY)."""
+    def factory():
+        from openai import OpenAI
+        return OpenAI()
+    return _get_or_create("openai", factory)
+
+
+def get_claude_client():
+    """Client Anthropic (utilise ANTHROPIC_API_KEY)."""
+    def factory():
+        import anthropic
+        return anthropic.Anthropic()
+    return _get_or_create("anthropic", factory)
+
+
+def get_gemini_model(model_name: str):
+    """GenerativeModel Gemini (utilise GOOGLE_API_KEY)."""
+    def factory():
+        import google.generativeai as genai
+        genai.configure(api_key=os.environ.get("GOOGLE_API_KEY", ""))
+        return genai.GenerativeModel(model_name)
+    return _get_or_create(f"gemini:{model_name}", factory)
+
+
+def gemini_api_error() -> type:
+    """
+    Classe GoogleAPIError, importée à la demande. Utilisable directement dans
+    une clause `except gemini_api_error() as e:` (évaluée seulement si une
+    exception remonte, donc après l'import du SDK Gemini).
+    """
+    try:
+        from google.api_core.exceptions import GoogleAPIError
+    except ImportError:
+        # SDK absent : aucune exception de ce type ne peut être levée
+        class GoogleAPIError(Exception):
+            pass
+    return GoogleAPIError
+
+
+def loaded_providers() -> dict[str, float]:
+    """Clients déjà initialisés et temps d'initialisation correspondant."""
+    return dict(PROVIDER_IMPORT_TIMES)
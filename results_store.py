@@ -0,0 +1,290 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+# =========================
+# Base SQLite des résultats (runs, candidats, réponses)
+# =========================
+
+RESULTS_DB_PATH = "aoc_results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at      REAL    NOT NULL,
+    year            INTEGER,
+    day             INTEGER NOT NULL,
+    part            INTEGER NOT NULL,
+    provider        TEXT    NOT NULL,
+    model           TEXT,
+    code_hash       TEXT,
+    answer          TEXT,
+    status          TEXT    NOT NULL,
+    generation_time REAL,
+    execution_time  REAL,
+    input_tokens    INTEGER,
+    output_tokens   INTEGER,
+    interpreter     TEXT,
+    input_bytes     INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_runs_day_part ON runs(year, day, part);
+CREATE INDEX IF NOT EXISTS idx_runs_provider ON runs(provider, model);
+CREATE INDEX IF NOT EXISTS idx_runs_code_hash ON runs(code_hash);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    code_hash  TEXT PRIMARY KEY,
+    code       TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+
+-- Tentatives d'un run (génération puis tours de suivi) : effort de raisonnement, coût, issue
+CREATE TABLE IF NOT EXISTS attempts (
+    run_id        INTEGER NOT NULL REFERENCES runs(id),
+    attempt       INTEGER NOT NULL,
+    effort        TEXT,
+    model_time    REAL,
+    input_tokens  INTEGER,
+    output_tokens INTEGER,
+    status        TEXT    NOT NULL,
+    PRIMARY KEY (run_id, attempt)
+);
+
+-- Mémo des exécutions : (hash du code normalisé, hash de l'input, interpréteur) -> résultat
+CREATE TABLE IF NOT EXISTS executions (
+    normalized_hash TEXT    NOT NULL,
+    input_hash      TEXT    NOT NULL,
+    interpreter     TEXT    NOT NULL,
+    returncode      INTEGER,
+    stdout          TEXT,
+    stderr          TEXT,
+    elapsed         REAL    NOT NULL,
+    timed_out       INTEGER NOT NULL DEFAULT 0,
+    created_at      REAL    NOT NULL,
+    PRIMARY KEY (normalized_hash, input_hash, interpreter)
+);
+"""
+
+# Colonnes ajoutées après la création du schéma : (nom, type) ajoutés aux bases existantes
+MIGRATIONS = [
+    ("interpreter", "TEXT"),
+    ("input_bytes", "INTEGER"),
+]
+
+
+def code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+class ResultsStore:
+    """
+    Historique des exécutions du pipeline (un enregistrement par candidat).
+    Partagé entre threads : les écritures sont sérialisées par un verrou.
+    """
+
+    def __init__(self, path: str = RESULTS_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        with self._conn:
+            for name, sql_type in MIGRATIONS:
+                if name not in columns:
+                    self._conn.execute(f"ALTER TABLE runs ADD COLUMN {name} {sql_type}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def record_run(self, *, day: int, part: int, provider: str, status: str,
+                   year: int | None = None, model: str | None = None,
+                   code: str | None = None, answer: str | None = None,
+                   generation_time: float | None = None, execution_time: float | None = None,
+                   input_tokens: int | None = None, output_tokens: int | None = None,
+                   interpreter: str | None = None, input_bytes: int | None = None) -> int:
+        """Enregistre un run (et le code du candidat, dédupliqué par hash). Retourne l'id du run."""
+        digest = code_hash(code) if code else None
+        now = time.time()
+        with self._lock, self._conn:
+            if code:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO candidates (code_hash, code, created_at) VALUES (?, ?, ?)",
+                    (digest, code, now),
+                )
+            cur = self._conn.execute(
+                """
+                INSERT INTO runs (created_at, year, day, part, provider, model, code_hash, answer, status,
+                                  generation_time, execution_time, input_tokens, output_tokens, interpreter,
+                                  input_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (now, year, day, part, provider, model, digest, answer, status,
+                 generation_time, execution_time, input_tokens, output_tokens, interpreter, input_bytes),
+            )
+            return cur.lastrowid
+
+    def record_attempts(self, run_id: int, attempts: list[dict]) -> None:
+        """Tentatives {"attempt", "effort", "model_time", "input_tokens", "output_tokens", "status"} du run."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO attempts (run_id, attempt, effort, model_time, input_tokens,
+                                                 output_tokens, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [(run_id, a["attempt"], a.get("effort"), a.get("model_time"), a.get("input_tokens"),
+                  a.get("output_tokens"), a["status"]) for a in attempts],
+            )
+
+    def effort_stats(self) -> list[dict]:
+        """Par modèle et effort : tentatives, taux de succès, temps modèle et tokens moyens."""
+        rows = self._conn.execute(
+            """
+            SELECT r.provider, r.model, a.effort, COUNT(*) AS attempts,
+                   AVG(a.status = 'ok') AS success_rate,
+                   AVG(a.model_time) AS avg_model_time,
+                   AVG(a.input_tokens) AS avg_input_tokens,
+                   AVG(a.output_tokens) AS avg_output_tokens
+            FROM attempts a JOIN runs r ON r.id = a.run_id
+            GROUP BY r.provider, r.model, a.effort
+            ORDER BY r.provider, r.model, a.effort
+            """
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def solved_answer(self, year: int | None, day: int, part: int) -> str | None:
+        """Réponse la plus souvent obtenue (runs 'ok') pour ce jour/partie, ou None."""
+        row = self._conn.execute(
+            """
+            SELECT answer, COUNT(*) AS n FROM runs
+            WHERE year IS ? AND day = ? AND part = ? AND status = 'ok'
+            GROUP BY answer ORDER BY n DESC LIMIT 1
+            """,
+            (year, day, part),
+        ).fetchone()
+        return row["answer"] if row else None
+
+    def fastest_solver(self, year: int | None, day: int, part: int) -> dict | None:
+        """
+        Solveur connu le plus rapide donnant la réponse majoritaire.
+        Retourne {"code", "code_hash", "answer", "execution_time", "provider", "model", "interpreter"} ou None.
+        """
+        answer = self.solved_answer(year, day, part)
+        if answer is None:
+            return None
+        row = self._conn.execute(
+            """
+            SELECT r.code_hash, r.answer, r.execution_time, r.provider, r.model, r.interpreter, c.code
+            FROM runs r JOIN candidates c ON c.code_hash = r.code_hash
+            WHERE r.year IS ? AND r.day = ? AND r.part = ? AND r.status = 'ok' AND r.answer = ?
+            ORDER BY r.execution_time ASC LIMIT 1
+            """,
+            (year, day, part, answer),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def fastest_interpreter(self, digest: str) -> str | None:
+        """Interpréteur du run 'ok' le plus rapide de ce code (hash), ou None si jamais exécuté."""
+        row = self._conn.execute(
+            """
+            SELECT interpreter FROM runs
+            WHERE code_hash = ? AND status = 'ok' AND interpreter IS NOT NULL
+            ORDER BY execution_time ASC LIMIT 1
+            """,
+            (digest,),
+        ).fetchone()
+        return row["interpreter"] if row else None
+
+    def cached_execution(self, normalized_hash: str, input_hash: str, interpreter: str) -> dict | None:
+        """
+        Résultat mémorisé {"returncode", "stdout", "stderr", "elapsed", "timed_out"} ou None.
+        Si timed_out, elapsed est le timeout qui a expiré. Seuls les résultats
+        déterministes (code 0 ou timeout) sont rendus.
+        """
+        row = self._conn.execute(
+            """
+            SELECT returncode, stdout, stderr, elapsed, timed_out FROM executions
+            WHERE normalized_hash = ? AND input_hash = ? AND interpreter = ?
+              AND (timed_out = 1 OR returncode = 0)
+            """,
+            (normalized_hash, input_hash, interpreter),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def record_execution(self, *, normalized_hash: str, input_hash: str, interpreter: str,
+                         elapsed: float, returncode: int | None = None, stdout: str | None = None,
+                         stderr: str | None = None, timed_out: bool = False) -> None:
+        """Enregistre un run terminé avec le code 0 ou un timeout ; les échecs (transitoires possibles) sont ignorés."""
+        if not timed_out and returncode != 0:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO executions (normalized_hash, input_hash, interpreter, returncode,
+                                                   stdout, stderr, elapsed, timed_out, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (normalized_hash, input_hash, interpreter, returncode, stdout, stderr, elapsed,
+                 int(timed_out), time.time()),
+            )
+
+    def provider_stats(self, part: int | None = None) -> list[dict]:
+        """Agrégats par fournisseur/modèle (taux de succès, temps moyens, tokens) pour les tableaux de bord."""
+        rows = self._conn.execute(
+            """
+            SELECT provider, model, COUNT(*) AS runs,
+                   AVG(status = 'ok') AS success_rate,
+                   AVG(generation_time) AS avg_generation_time,
+                   AVG(execution_time) AS avg_execution_time,
+                   SUM(input_tokens) AS input_tokens,
+                   SUM(output_tokens) AS output_tokens
+            FROM runs
+            WHERE ? IS NULL OR part = ?
+            GROUP BY provider, model
+            ORDER BY provider, model
+            """,
+            (part, part),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def model_stats(self, part: int | None = None, min_input_bytes: int | None = None,
+                    max_input_bytes: int | None = None) -> list[dict]:
+        """
+        Agrégats par fournisseur/modèle pour le routage, filtrés par partie et
+        taille d'input [min, max) : runs, correct_rate (run 'ok' donnant la
+        réponse majoritaire du jour), avg_latency (génération + exécution),
+        tokens moyens.
+        """
+        rows = self._conn.execute(
+            """
+            WITH votes AS (
+                SELECT year, day, part, answer, COUNT(*) AS n FROM runs
+                WHERE status = 'ok' GROUP BY year, day, part, answer
+            ),
+            consensus AS (
+                SELECT v.year, v.day, v.part, v.answer FROM votes v
+                WHERE v.n = (SELECT MAX(w.n) FROM votes w
+                             WHERE w.year IS v.year AND w.day = v.day AND w.part = v.part)
+            )
+            SELECT r.provider, r.model, COUNT(*) AS runs,
+                   AVG(r.status = 'ok' AND EXISTS (
+                       SELECT 1 FROM consensus c
+                       WHERE c.year IS r.year AND c.day = r.day AND c.part = r.part AND c.answer = r.answer
+                   )) AS correct_rate,
+                   AVG(COALESCE(r.generation_time, 0) + COALESCE(r.execution_time, 0)) AS avg_latency,
+                   AVG(r.input_tokens) AS avg_input_tokens,
+                   AVG(r.output_tokens) AS avg_output_tokens
+            FROM runs r
+            WHERE (? IS NULL OR r.part = ?)
+              AND (? IS NULL OR r.input_bytes >= ?)
+              AND (? IS NULL OR r.input_bytes < ?)
+            GROUP BY r.provider, r.model
+            """,
+            (part, part, min_input_bytes, min_input_bytes, max_input_bytes, max_input_bytes),
+        ).fetchall()
+        return [dict(r) for r in rows]
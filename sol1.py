@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+import sys
+from typing import List, Tuple, FrozenSet
+
+from sol2 import parse_lines_with_lights
+
+def lights_to_mask(lights: str) -> int:
+    # '#' = voyant à allumer ; bit j = voyant j
+    mask = 0
+    for j, ch in enumerate(lights):
+        if ch == '#':
+            mask |= 1 << j
+    return mask
+
+def button_to_mask(button: FrozenSet[int]) -> int:
+    mask = 0
+    for j in button:
+        mask |= 1 << j
+    return mask
+
+def gf2_solve(n: int, target: int, buttons: List[int]) -> Tuple[int, List[int]]:
+    """
+    Résout A·x = target sur GF(2), où la colonne i de A est buttons[i]
+    (masque des voyants basculés par le bouton i) et x le masque des boutons pressés.
+    Retourne (solution particulière, base du noyau), les deux en masques de boutons.
+    """
+    B = len(buttons)
+    # Ligne j : bits 0..B-1 = boutons qui touchent le voyant j, bit B = cible
+    rows = []
+    for j in range(n):
+        row = 0
+        for i, b in enumerate(buttons):
+            if (b >> j) & 1:
+                row |= 1 << i
+        if (target >> j) & 1:
+            row |= 1 << B
+        rows.append(row)
+
+    pivots: List[int] = []   # pivots[r] = colonne pivot de la ligne r
+    r = 0
+    for col in range(B):
+        sel = next((k for k in range(r, n) if (rows[k] >> col) & 1), -1)
+        if sel == -1:
+            continue
+        rows[r], rows[sel] = rows[sel], rows[r]
+        for k in range(n):
+            if k != r and (rows[k] >> col) & 1:
+                rows[k] ^= rows[r]
+        pivots.append(col)
+        r += 1
+        if r == n:
+            break
+
+    # Ligne nulle avec cible 1 => incohérent
+    for k in range(r, n):
+        if rows[k] == 1 << B:
+            raise ValueError("Unsolvable: indicator lights cannot reach the target pattern")
+
+    pivot_set = set(pivots)
+    particular = 0
+    for k, col in enumerate(pivots):
+        if (rows[k] >> B) & 1:
+            particular |= 1 << col
+
+    # Un vecteur du noyau par variable libre : x_free = 1, pivots ajustés
+    null_basis = []
+    for free in range(B):
+        if free in pivot_set:
+            continue
+        v = 1 << free
+        for k, col in enumerate(pivots):
+            if (rows[k] >> free) & 1:
+                v |= 1 << col
+        null_basis.append(v)
+    return particular, null_basis
+
+def min_presses_lights(lights: str, button_sets: List[FrozenSet[int]]) -> int:
+    """
+    Minimum de pressions pour obtenir le schéma `lights` (tous éteints au départ).
+    Presser deux fois un bouton l'annule : x ∈ GF(2)^B, poids minimal sur
+    particular ⊕ noyau, énuméré en code de Gray (2^k avec k = dim du noyau).
+    """
+    buttons = [button_to_mask(s) for s in button_sets]
+    particular, null_basis = gf2_solve(len(lights), lights_to_mask(lights), buttons)
+    best = particular.bit_count()
+    x = particular
+    for step in range(1, 1 << len(null_basis)):
+        # Code de Gray : un seul vecteur de base change à chaque pas
+        x ^= null_basis[(step & -step).bit_length() - 1]
+        w = x.bit_count()
+        if w < best:
+            best = w
+    return best
+
+def total_min_presses_part1(text: str) -> int:
+    total = 0
+    for lights, _, button_sets in parse_lines_with_lights(text):
+        total += min_presses_lights(lights, button_sets)
+    return total
+
+def main():
+    print("Reading input...")
+    data = sys.stdin.read()
+    if not data.strip():
+        print("Usage: pipe your input text into stdin or run: python sol1.py < input.txt")
+        return
+    ans = total_min_presses_part1(data)
+    print(ans)
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,62 @@
 #!/usr/bin/env python3
 import sys
 import re
+import argparse
+import json
 import math
+import multiprocessing
+import os
+import random
+import time
 from heapq import heappush, heappop
 from typing import List, Tuple, Set, FrozenSet, Optional, Dict
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
+from fractions import Fraction
+from queue import Empty
+
+try:
+    import resource
+except ImportError:  # Windows : pas de RSS max dans les stats
+    resource = None
+
+# NumPy / SciPy (~0.9 s d'import) ne sont importés qu'à l'appel des fonctions
+# qui en ont besoin, comme dans aoc_fast.py. L'arrondi LP de l'heuristique
+# primale n'importe pas SciPy lui-même : il ne sert que si un moteur (ilp) l'a
+# déjà chargé, si bien que A* et IDA* n'en paient jamais le prix.
+
+def _numpy():
+    """Module numpy, ou None s'il n'est pas installé (requis par les moteurs "numpy" et "ilp")."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _scipy_optimize(load: bool = True):
+    """
+    Module scipy.optimize avec milp (SciPy >= 1.9), ou None (moteur "ilp",
+    arrondi LP du primal). load=False : seulement s'il est déjà importé.
+    """
+    if not load and "scipy.optimize" not in sys.modules:
+        return None
+    try:
+        from scipy import optimize
+    except ImportError:
+        return None
+    return optimize if hasattr(optimize, "milp") else None
 
 PAREN_RE = re.compile(r"\((.*?)\)")
 BRACE_RE = re.compile(r"\{(.*?)\}")
+BRACKET_RE = re.compile(r"\[([.#]*)\]")
 
 def parse_lines(text: str) -> List[Tuple[List[int], List[FrozenSet[int]]]]:
+    return [(targets, button_sets) for _, targets, button_sets in parse_lines_with_lights(text)]
+
+def parse_lines_with_lights(text: str) -> List[Tuple[str, List[int], List[FrozenSet[int]]]]:
+    """
+    Comme parse_lines, mais conserve aussi le schéma des voyants ('..##.#.')
+    utilisé par la partie 1 (sol1). Chaîne vide si la ligne n'en a pas.
+    """
     machines = []
     for raw in text.strip().splitlines():
         line = raw.strip()
@@ -42,7 +89,9 @@ def parse_lines(text: str) -> List[Tuple[List[int], List[FrozenSet[int]]]]:
                     raise ValueError(f"Index {j} out of range for {n} counters in line: {line}")
                 s.add(j)
             button_sets.append(frozenset(s))
-        machines.append((targets, button_sets))
+        lm = BRACKET_RE.search(line)
+        lights = lm.group(1) if lm else ""
+        machines.append((lights, targets, button_sets))
     return machines
 
 def compress_zeros(targets: List[int], buttons: List[FrozenSet[int]]) -> Tuple[List[int], List[FrozenSet[int]]]:
@@ -74,10 +123,99 @@ def feasibility_checks(targets: List[int], buttons: List[FrozenSet[int]]) -> Non
         else:
             signature[sig] = targets[j]
 
-def components(targets: List[int], buttons: List[FrozenSet[int]]) -> List[Tuple[List[int], List[FrozenSet[int]]]]:
+def presolve(targets: List[int], buttons: List[FrozenSet[int]],
+             fixed_out: Optional[Dict[FrozenSet[int], int]] = None) -> Tuple[int, List[int], List[FrozenSet[int]], List[int]]:
+    """
+    Réductions sûres, itérées jusqu'au point fixe :
+    - boutons no-op et doublons supprimés ;
+    - compteur à 0 => tous les boutons qui le touchent sont interdits (borne sup 0) ;
+    - compteur couvert par un seul bouton => nombre de presses de ce bouton fixé ;
+    - deux compteurs j, k avec couverture(j) ⊆ couverture(k) : les boutons de
+      D = couverture(k) \ couverture(j) totalisent t_k - t_j presses, donc
+      t_k < t_j ou (D vide et t_k != t_j) => infaisable, |D| == 1 => bouton fixé.
+    Retourne (presses fixées, cibles réduites, boutons restants, borne sup par bouton),
+    la borne sup d'un bouton étant la plus petite cible des compteurs qu'il
+    couvre, resserrée à t_k - t_j pour chaque bouton de D ci-dessus.
+    Pas de suppression par dominance : les contraintes sont des égalités, un
+    bouton inclus dans un autre ne peut pas être remplacé par lui (il déborderait
+    sur les compteurs en plus), ni l'inverse sans presses supplémentaires.
+    Si fixed_out est fourni, il reçoit {bouton: presses fixées}.
+    Lève ValueError si la machine est infaisable.
+    """
+    targets = list(targets)
+    buttons = list(dict.fromkeys(s for s in buttons if s))
+    fixed_presses = 0
+    changed = True
+    while changed:
+        changed = False
+        zero = frozenset(j for j, v in enumerate(targets) if v == 0)
+        if zero:
+            kept = [s for s in buttons if not (s & zero)]
+            if len(kept) != len(buttons):
+                buttons = kept
+                changed = True
+
+        cover: List[Set[int]] = [set() for _ in targets]
+        for i, s in enumerate(buttons):
+            for j in s:
+                cover[j].add(i)
+        for j, v in enumerate(targets):
+            if v > 0 and not cover[j]:
+                raise ValueError("Unsolvable: a counter with a positive target has no usable button")
+
+        forced: Dict[int, int] = {}
+
+        def force(i: int, presses: int) -> None:
+            if forced.setdefault(i, presses) != presses:
+                raise ValueError("Unsolvable: conflicting forced press counts for one button")
+
+        for j, v in enumerate(targets):
+            if v > 0 and len(cover[j]) == 1:
+                force(next(iter(cover[j])), v)
+        for j in range(len(targets)):
+            for k in range(len(targets)):
+                if j == k or not cover[j] <= cover[k]:
+                    continue
+                diff = targets[k] - targets[j]
+                extra = cover[k] - cover[j]
+                if diff < 0 or (not extra and diff != 0):
+                    raise ValueError("Unsolvable: nested counter coverage contradicts the targets")
+                if len(extra) == 1:
+                    force(next(iter(extra)), diff)
+
+        if forced:
+            for i, presses in forced.items():
+                for j in buttons[i]:
+                    targets[j] -= presses
+                    if targets[j] < 0:
+                        raise ValueError("Unsolvable: forced presses overshoot a counter")
+                fixed_presses += presses
+                if fixed_out is not None:
+                    fixed_out[buttons[i]] = fixed_out.get(buttons[i], 0) + presses
+            buttons = [s for i, s in enumerate(buttons) if i not in forced]
+            changed = True
+
+    upper_bounds = [min(targets[j] for j in s) for s in buttons]
+    cover = [set() for _ in targets]
+    for i, s in enumerate(buttons):
+        for j in s:
+            cover[j].add(i)
+    for j in range(len(targets)):
+        for k in range(len(targets)):
+            if j != k and cover[j] <= cover[k]:
+                for i in cover[k] - cover[j]:
+                    upper_bounds[i] = min(upper_bounds[i], targets[k] - targets[j])
+    return fixed_presses, targets, buttons, upper_bounds
+
+def components(targets: List[int], buttons: List[FrozenSet[int]],
+               counter_ids: Optional[List[List[int]]] = None,
+               button_ids: Optional[List[List[int]]] = None) -> List[Tuple[List[int], List[FrozenSet[int]]]]:
     """
     Décompose une machine en composantes connexes dans un graphe bipartite
     (compteurs ↔ boutons). Chaque composante est indépendante et se résout séparément.
+    Si counter_ids est fourni, on y ajoute pour chaque composante les indices
+    d'origine de ses compteurs (compteur local j = counter_ids[k][j]) ; de même
+    pour button_ids et les boutons (bouton local i = buttons[button_ids[k][i]]).
     """
     m = len(targets)
     B = len(buttons)
@@ -122,11 +260,17 @@ def components(targets: List[int], buttons: List[FrozenSet[int]]) -> List[Tuple[
             # remapper boutons vers indices locaux
             idx_map_c = {old: new for new, old in enumerate(sorted(cur_c))}
             sub_buttons = []
+            sub_ids = []
             for bi in sorted(cur_b):
                 s = frozenset(idx_map_c[j] for j in graph_b_to_c[bi] if j in cur_c)
                 if s:
                     sub_buttons.append(s)
+                    sub_ids.append(bi)
             comps.append((sub_targets, sub_buttons))
+            if counter_ids is not None:
+                counter_ids.append(sorted(cur_c))
+            if button_ids is not None:
+                button_ids.append(sub_ids)
     return comps
 
 def greedy_upper_bound(targets: List[int], button_sets: List[FrozenSet[int]]) -> Optional[int]:
@@ -158,15 +302,413 @@ def greedy_upper_bound(targets: List[int], button_sets: List[FrozenSet[int]]) ->
             r[j] -= t
         presses += t
 
-def min_presses_component(targets: List[int], button_sets: List[FrozenSet[int]]) -> int:
+# =========================
+# Heuristique primale : incumbent serré pour l'élagage
+# =========================
+
+PRIMAL_TIME_BUDGET = 0.05     # secondes par composante
+PRIMAL_NODE_LIMIT = 400       # nœuds max par complétion DFS
+PRIMAL_CLOCK_EVERY = 64       # nœuds entre deux lectures de l'horloge (complétion par le noyau)
+
+def complete_presses(r: List[int], buttons: List[Tuple[int, ...]], cover: List[List[int]],
+                     rng: random.Random, max_cost: float = math.inf,
+                     node_limit: int = PRIMAL_NODE_LIMIT,
+                     hint: Optional[List[float]] = None) -> Optional[List[int]]:
+    """
+    Complète exactement le reste r (presses par bouton), par DFS bornée qui
+    fixe les boutons un par un (les plus larges d'abord, égalités tirées au
+    hasard). Quand un bouton est le dernier à couvrir un compteur, sa valeur
+    est imposée ; sinon on essaie d'abord les valeurs proches de `hint`
+    (relaxation LP) ou, à défaut, les plus grandes. Coupe si
+    coût + borne inf >= max_cost. Retourne None si rien trouvé dans node_limit nœuds.
+    """
+    if any(v > 0 and not cover[j] for j, v in enumerate(r)):
+        return None
+    order = sorted(range(len(buttons)), key=lambda i: (-len(buttons[i]), rng.random()))
+    position = {i: p for p, i in enumerate(order)}
+    last_cover = [max((position[i] for i in cover[j]), default=-1) for j in range(len(r))]
+    closing: List[List[int]] = [[] for _ in order]   # compteurs fermés à chaque position
+    for j, p in enumerate(last_cover):
+        if p >= 0:
+            closing[p].append(j)
+    # Taille max des boutons restants (borne inf sur le nombre de presses)
+    suffix_max = [0] * (len(order) + 1)
+    for p in range(len(order) - 1, -1, -1):
+        suffix_max[p] = max(suffix_max[p + 1], len(buttons[order[p]]))
+
+    x = [0] * len(buttons)
+    r = list(r)
+    nodes = 0
+
+    def dfs(p: int, cost: int) -> bool:
+        nonlocal nodes
+        nodes += 1
+        total = sum(r)
+        if total == 0:
+            return True
+        if p == len(order) or nodes > node_limit:
+            return False
+        if cost + (total + suffix_max[p] - 1) // suffix_max[p] >= max_cost:
+            return False
+        i = order[p]
+        b = buttons[i]
+        hi = min(r[k] for k in b)
+        forced = {r[j] for j in closing[p]}
+        if len(forced) > 1:
+            return False
+        if forced:
+            v = forced.pop()
+            if v > hi:
+                return False
+            values = [v]
+        elif hint is not None:
+            values = sorted(range(hi + 1), key=lambda v: (abs(v - hint[i]), rng.random()))
+        else:
+            values = list(range(hi, -1, -1))
+            if hi > 0 and rng.random() < 1 / 3:
+                # Diversifie les redémarrages : une valeur tirée au hasard d'abord
+                v = rng.randint(0, hi)
+                values.remove(v)
+                values.insert(0, v)
+        for v in values:
+            for k in b:
+                r[k] -= v
+            x[i] = v
+            if dfs(p + 1, cost + v):
+                return True
+            for k in b:
+                r[k] += v
+            x[i] = 0
+            if nodes > node_limit:
+                return False
+        return False
+
+    return x if dfs(0, 0) else None
+
+def nullspace_completion(r: List[int], buttons: List[Tuple[int, ...]],
+                         hint: Optional[List[float]] = None,
+                         node_limit: int = 64 * PRIMAL_NODE_LIMIT,
+                         deadline: Optional[float] = None) -> Optional[List[int]]:
+    """
+    Complétion par élimination de Gauss (rationnels exacts) : les boutons
+    pivots s'expriment en fonction des boutons libres, qu'on énumère (valeurs
+    proches de `hint` d'abord) jusqu'à obtenir des pivots entiers >= 0.
+    Efficace quand le noyau est de petite dimension, là où la DFS bouton par
+    bouton s'enlise sur de grandes cibles. None si rien dans node_limit nœuds
+    ou avant deadline (time.monotonic()).
+    """
+    m, n = len(r), len(buttons)
+    rows = [[Fraction(1 if j in b else 0) for b in buttons] + [Fraction(r[j])] for j in range(m)]
+    pivots: List[int] = []
+    k = 0
+    for col in range(n):
+        sel = next((q for q in range(k, m) if rows[q][col] != 0), -1)
+        if sel == -1:
+            continue
+        rows[k], rows[sel] = rows[sel], rows[k]
+        pv = rows[k][col]
+        rows[k] = [v / pv for v in rows[k]]
+        for q in range(m):
+            if q != k and rows[q][col] != 0:
+                f = rows[q][col]
+                rows[q] = [a - f * b for a, b in zip(rows[q], rows[k])]
+        pivots.append(col)
+        k += 1
+        if k == m:
+            break
+    if any(rows[q][n] != 0 for q in range(k, m)):
+        return None
+    free = [i for i in range(n) if i not in set(pivots)]
+    caps = [min(r[j] for j in buttons[i]) for i in free]
+    # Lignes pivots en entiers (multipliées par le ppcm de leurs dénominateurs) :
+    # den * x[pivot] = rhs - sum(c * x[i]), bien plus rapide que les Fraction aux feuilles
+    dense = []
+    for q in range(k):
+        den = math.lcm(*(v.denominator for v in rows[q]))
+        terms = [(i, int(rows[q][i] * den)) for i in free if rows[q][i] != 0]
+        dense.append((den, int(rows[q][n] * den), terms))
+    x = [0] * n
+    nodes = 0
+
+    def dfs(f: int) -> bool:
+        nonlocal nodes
+        nodes += 1
+        if nodes > node_limit:
+            return False
+        if deadline is not None and nodes % PRIMAL_CLOCK_EVERY == 0 and time.monotonic() >= deadline:
+            nodes = node_limit + 1   # arrête toute l'énumération
+            return False
+        if f == len(free):
+            for col, (den, rhs, terms) in zip(pivots, dense):
+                v = rhs - sum(c * x[i] for i, c in terms)
+                if v < 0 or v % den:
+                    return False
+                x[col] = v // den
+            return True
+        i = free[f]
+        target = hint[i] if hint is not None else 0.0
+        for v in sorted(range(caps[f] + 1), key=lambda v: abs(v - target)):
+            x[i] = v
+            if dfs(f + 1):
+                return True
+            if nodes > node_limit:
+                break
+        x[i] = 0
+        return False
+
+    return list(x) if dfs(0) else None
+
+def lp_relaxation(targets: List[int], buttons: List[Tuple[int, ...]],
+                  time_limit: Optional[float] = None) -> Optional[List[float]]:
+    """
+    Solution de la relaxation LP (si SciPy est déjà chargé), sert de guide à
+    la complétion ; time_limit (secondes) est transmis à HiGHS.
+    """
+    optimize = _scipy_optimize(load=False)
+    np = _numpy() if optimize is not None else None
+    if optimize is None or np is None:
+        return None
+    A = np.zeros((len(targets), len(buttons)))
+    for i, b in enumerate(buttons):
+        A[list(b), i] = 1
+    options = {} if time_limit is None else {"time_limit": max(time_limit, 1e-3)}
+    res = optimize.linprog(np.ones(len(buttons)), A_eq=A, b_eq=targets, bounds=(0, None), method="highs",
+                           options=options)
+    if res.status != 0:
+        return None
+    return [float(v) for v in res.x]
+
+def primal_solution(targets: List[int], button_sets: List[FrozenSet[int]],
+                    time_budget: float = PRIMAL_TIME_BUDGET, seed: int = 0) -> Optional[Tuple[int, List[int]]]:
+    """
+    Meilleure solution réalisable trouvée dans time_budget secondes :
+    arrondi LP (complétion guidée par la relaxation, sinon énumération du
+    noyau autour de la relaxation), glouton randomisé avec
+    redémarrages (budget de nœuds croissant tant que rien n'est trouvé), puis recherche locale (on retire des presses à 1 à 3
+    boutons et on recomplète le reste avec un coût strictement inférieur).
+    Retourne (nombre de presses, presses par bouton) ou None ; les boutons sont
+    dédupliqués en gardant leur ordre d'apparition (dict.fromkeys(button_sets)).
+    """
+    rng = random.Random(seed)
+    deadline = time.monotonic() + time_budget
+    buttons = [tuple(sorted(s)) for s in dict.fromkeys(button_sets)]
+    cover: List[List[int]] = [[] for _ in targets]
+    for i, b in enumerate(buttons):
+        for j in b:
+            cover[j].append(i)
+
+    def residual(x: List[int]) -> List[int]:
+        r = list(targets)
+        for i, b in enumerate(buttons):
+            for j in b:
+                r[j] -= x[i]
+        return r
+
+    best: Optional[List[int]] = None
+    best_cost = math.inf
+
+    def offer(x: Optional[List[int]]) -> None:
+        nonlocal best, best_cost
+        if x is not None and sum(x) < best_cost:
+            best, best_cost = x, sum(x)
+
+    # Arrondi LP : complétion guidée par la solution fractionnaire. Ces étapes
+    # passent avant la boucle : elles relisent l'horloge pour tenir le budget.
+    hint = None
+    if time.monotonic() < deadline:
+        hint = lp_relaxation(targets, buttons, time_limit=deadline - time.monotonic())
+    if hint is not None:
+        offer(complete_presses(targets, buttons, cover, rng, hint=hint))
+    if best is None and time.monotonic() < deadline:
+        offer(nullspace_completion(targets, buttons, hint, deadline=deadline))
+
+    node_limit = PRIMAL_NODE_LIMIT
+    while time.monotonic() < deadline:
+        if best is None or rng.random() < 0.2:
+            # Redémarrage glouton randomisé ; tant qu'aucune solution n'est
+            # connue, on double le nombre de nœuds autorisés
+            if best is None:
+                node_limit = min(2 * node_limit, 64 * PRIMAL_NODE_LIMIT)
+            offer(complete_presses(targets, buttons, cover, rng, max_cost=best_cost,
+                                   node_limit=node_limit))
+            continue
+        # Recherche locale : on retire des presses à 1-3 boutons puis on
+        # recomplète pour moins cher que ce qu'on a retiré
+        x = list(best)
+        pressed = [i for i, v in enumerate(x) if v > 0]
+        removed = 0
+        for i in rng.sample(pressed, min(len(pressed), rng.randint(1, 3))):
+            d = rng.randint(1, x[i])
+            x[i] -= d
+            removed += d
+        fill = complete_presses(residual(x), buttons, cover, rng, max_cost=removed)
+        if fill is not None:
+            offer([a + b for a, b in zip(x, fill)])
+
+    if best is None:
+        return None
+    return best_cost, best
+
+def quick_upper_bound(targets: List[int], button_sets: List[FrozenSet[int]]) -> Optional[int]:
+    """
+    Borne sup bon marché (mode anytime, deadline passée) : glouton, sinon
+    complétion par le noyau sans LP (PRIMAL_NODE_LIMIT nœuds), sinon arrondi
+    LP puis complétion par le noyau guidée, 64 fois plus de nœuds.
+    """
+    ub = greedy_upper_bound(targets, button_sets)
+    if ub is not None:
+        return ub
+    buttons = [tuple(sorted(s)) for s in dict.fromkeys(button_sets)]
+    x = nullspace_completion(targets, buttons, node_limit=PRIMAL_NODE_LIMIT)
+    if x is None:
+        cover: List[List[int]] = [[] for _ in targets]
+        for i, b in enumerate(buttons):
+            for j in b:
+                cover[j].append(i)
+        hint = lp_relaxation(targets, buttons)
+        if hint is not None:
+            x = complete_presses(targets, buttons, cover, random.Random(0), hint=hint)
+        if x is None:
+            x = nullspace_completion(targets, buttons, hint)
+    return None if x is None else sum(x)
+
+def primal_upper_bound(targets: List[int], button_sets: List[FrozenSet[int]],
+                       time_budget: float = PRIMAL_TIME_BUDGET,
+                       deadline: Optional[float] = None) -> Optional[int]:
+    """
+    Borne sup = min(glouton historique, heuristique primale). Si deadline
+    (time.monotonic()) est donnée, le budget est ramené au temps restant et
+    l'heuristique (LP comprise) est sautée une fois la deadline passée.
+    """
+    ub = greedy_upper_bound(targets, button_sets)
+    if deadline is not None:
+        time_budget = min(time_budget, deadline - time.monotonic())
+    if time_budget <= 0:
+        return ub
+    found = primal_solution(targets, button_sets, time_budget)
+    if found is not None and (ub is None or found[0] < ub):
+        ub = found[0]
+    return ub
+
+# =========================
+# Certificats : presses par bouton
+# =========================
+
+def presses_vector(button_sets: List[FrozenSet[int]], counts: Dict[FrozenSet[int], int]) -> List[int]:
+    """Presses par bouton alignées sur button_sets (un bouton en double reçoit 0)."""
+    x = [0] * len(button_sets)
+    seen: Set[FrozenSet[int]] = set()
+    for i, s in enumerate(button_sets):
+        if s not in seen:
+            seen.add(s)
+            x[i] = counts.get(s, 0)
+    return x
+
+def verify_certificates(machines: List[Tuple[List[int], List[FrozenSet[int]]]],
+                        certificates: List[List[int]],
+                        totals: Optional[List[int]] = None) -> List[int]:
+    """
+    Vérifie en lot A·x == cibles, x >= 0 (et Σx == totals[k] si fourni) pour
+    toutes les machines. Avec NumPy, un seul produit sur des tableaux
+    (machines × compteurs × boutons) complétés par des zéros.
+    Retourne les indices des machines dont le certificat est faux.
+    """
+    if totals is None:
+        totals = [sum(x) for x in certificates]
+    np = _numpy()
+    if np is None:
+        bad = []
+        for k, ((targets, button_sets), x) in enumerate(zip(machines, certificates)):
+            got = [0] * len(targets)
+            for s, v in zip(button_sets, x):
+                for j in s:
+                    got[j] += v
+            if got != list(targets) or min(x, default=0) < 0 or sum(x) != totals[k] \
+                    or len(x) != len(button_sets):
+                bad.append(k)
+        return bad
+    M = len(machines)
+    C = max((len(t) for t, _ in machines), default=0)
+    B = max((len(b) for _, b in machines), default=0)
+    A = np.zeros((M, C, B), dtype=np.int8)
+    X = np.zeros((M, B), dtype=np.int64)
+    T = np.zeros((M, C), dtype=np.int64)
+    wrong_length = np.zeros(M, dtype=bool)
+    ks, js, iis = [], [], []
+    for k, ((targets, button_sets), x) in enumerate(zip(machines, certificates)):
+        T[k, :len(targets)] = targets
+        if len(x) != len(button_sets):
+            wrong_length[k] = True
+            continue
+        X[k, :len(x)] = x
+        for i, s in enumerate(button_sets):
+            for j in s:
+                ks.append(k)
+                js.append(j)
+                iis.append(i)
+    A[ks, js, iis] = 1
+    got = np.einsum("kci,ki->kc", A, X)
+    bad = wrong_length | (got != T).any(axis=1) | (X < 0).any(axis=1) | (X.sum(axis=1) != np.asarray(totals))
+    return [int(k) for k in np.nonzero(bad)[0]]
+
+# =========================
+# Instrumentation : compteurs de recherche par composante (--stats)
+# =========================
+
+# Remis à zéro avant chaque composante ; les moteurs y ajoutent leurs
+# compteurs en sortie (pas d'appel dans les boucles chaudes).
+SEARCH_STATS: Dict[str, object] = {}
+
+def reset_search_stats() -> None:
+    SEARCH_STATS.clear()
+    SEARCH_STATS.update(engine=None, nodes=0, peak_open=0)
+
+def note_search(engine: str, nodes: int, peak_open: int) -> None:
+    # Bascule (A* -> IDA*) : les nœuds s'additionnent, le moteur devient "astar>idastar"
+    prev = SEARCH_STATS.get("engine")
+    SEARCH_STATS["engine"] = engine if not prev else f"{prev}>{engine}"
+    SEARCH_STATS["nodes"] = SEARCH_STATS.get("nodes", 0) + nodes
+    SEARCH_STATS["peak_open"] = max(SEARCH_STATS.get("peak_open", 0), peak_open)
+
+def peak_rss_kb() -> Optional[int]:
+    """RSS max du processus (Ko), ou None si le module resource est absent."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss   # macOS : octets
+
+reset_search_stats()
+
+# Mémoire : limite utilisateur (Mo) convertie en nombre d'états retenus
+MEMORY_LIMIT_MB: Optional[float] = None
+IDA_DEFAULT_TABLE_SIZE = 1_000_000
+
+def state_bytes_estimate(m: int) -> int:
+    # tuple de m petits int + entrée de dict + entrée de tas (ordre de grandeur CPython)
+    return 200 + 8 * m
+
+def state_budget(m: int) -> Optional[int]:
+    """Nombre max d'états (open list + table) autorisé par MEMORY_LIMIT_MB, ou None."""
+    if MEMORY_LIMIT_MB is None:
+        return None
+    return max(1000, int(MEMORY_LIMIT_MB * 2**20) // state_bytes_estimate(m))
+
+def min_presses_component(targets: List[int], button_sets: List[FrozenSet[int]],
+                          certificate: bool = False, caps: Optional[Dict[FrozenSet[int], int]] = None):
     """
     A* exact sur une seule composante.
     État = demandes restantes (tuple d’int >=0).
     Action = presser un bouton (tous les indices du set décrémentés de 1),
     jamais d’overshoot (interdit si une composante du set vaut déjà 0).
+    Si MEMORY_LIMIT_MB est fixé et que pq + best dépassent le budget d'états,
+    on libère tout et on bascule sur IDA* (mémoire bornée).
+    Avec certificate=True, retourne (presses, presses par bouton) : les
+    parents sont alors mémorisés pour reconstruire le chemin.
+    caps ({bouton: presses max}, cf. presolve) : l'état (demandes restantes)
+    ne compte pas les presses par bouton, seul le repli IDA* s'en sert.
     """
     if sum(targets) == 0:
-        return 0
+        return (0, [0] * len(button_sets)) if certificate else 0
     unique_buttons = list(set(button_sets))
     Smax = max(len(s) for s in unique_buttons)
 
@@ -177,7 +719,7 @@ def min_presses_component(targets: List[int], button_sets: List[FrozenSet[int]])
         # Chaque press réduit la somme au plus de Smax => borne inf admissible
         return (s + Smax - 1) // Smax
 
-    ub = greedy_upper_bound(targets, unique_buttons)
+    ub = primal_upper_bound(targets, unique_buttons)
     if ub is None:
         ub = math.inf
 
@@ -188,14 +730,28 @@ def min_presses_component(targets: List[int], button_sets: List[FrozenSet[int]])
     heappush(pq, (f0, g0, start))
     best: Dict[Tuple[int, ...], int] = {start: 0}
     buttons_idx = [tuple(sorted(s)) for s in unique_buttons]
+    max_states = state_budget(len(targets))
+    parent: Optional[Dict[Tuple[int, ...], Tuple[Tuple[int, ...], int]]] = {} if certificate else None
+    expanded = 0
+    peak = 1
 
     while pq:
+        if len(pq) > peak:
+            peak = len(pq)
         f, g, state = heappop(pq)
         if sum(state) == 0:
-            return g
+            note_search("astar", expanded, peak)
+            if parent is None:
+                return g
+            counts: Dict[FrozenSet[int], int] = defaultdict(int)
+            while state != start:
+                state, i = parent[state]
+                counts[unique_buttons[i]] += 1
+            return g, presses_vector(button_sets, counts)
         if f > ub:
             continue
-        for s in buttons_idx:
+        expanded += 1
+        for i, s in enumerate(buttons_idx):
             # press 'safe' uniquement
             if any(state[j] == 0 for j in s):
                 continue
@@ -207,40 +763,732 @@ def min_presses_component(targets: List[int], button_sets: List[FrozenSet[int]])
             if ns_t in best and best[ns_t] <= ng:
                 continue
             best[ns_t] = ng
+            if parent is not None:
+                parent[ns_t] = (state, i)
             nf = ng + heuristic(ns_t)
             if nf <= ub:
                 heappush(pq, (nf, ng, ns_t))
+                if max_states is not None and len(pq) + len(best) > max_states:
+                    note_search("astar", expanded, max(peak, len(pq)))
+                    pq.clear()
+                    best.clear()
+                    parent = None
+                    return min_presses_component_idastar(targets, button_sets, certificate=certificate, caps=caps)
+    note_search("astar", expanded, peak)
+    raise ValueError("Search exhausted without solution; input may be unsolvable.")
+
+def min_presses_component_idastar(targets: List[int], button_sets: List[FrozenSet[int]],
+                                  table_size: Optional[int] = None, certificate: bool = False,
+                                  caps: Optional[Dict[FrozenSet[int], int]] = None):
+    """
+    IDA* (mémoire bornée) : DFS itérative sous un seuil f croissant, même
+    heuristique et même borne sup que l'A*. Une table de transposition LRU de
+    taille table_size (par défaut déduite de MEMORY_LIMIT_MB) élague les états
+    déjà atteints, pendant l'itération courante, avec un g et un premier bouton
+    autorisé inférieurs ou égaux.
+    Avec certificate=True, retourne (presses, presses par bouton), lues sur la
+    pile ; si la borne sup est optimale, une dernière itération à f <= ub la
+    reconstruit.
+    caps ({bouton: presses max}, cf. presolve) : un bouton n'est plus pressé
+    une fois son plafond atteint sur le chemin courant.
+    """
+    if sum(targets) == 0:
+        return (0, [0] * len(button_sets)) if certificate else 0
+    unique_buttons = list(set(button_sets))
+    Smax = max(len(s) for s in unique_buttons)
+    buttons_idx = [tuple(sorted(s)) for s in unique_buttons]
+    cap = [(caps or {}).get(s, math.inf) for s in unique_buttons]
+    if table_size is None:
+        table_size = state_budget(len(targets)) or IDA_DEFAULT_TABLE_SIZE
+
+    def heuristic(r: Tuple[int, ...]) -> int:
+        return (sum(r) + Smax - 1) // Smax
+
+    ub = primal_upper_bound(targets, unique_buttons)
+    if ub is None:
+        ub = math.inf
+
+    start = tuple(targets)
+    bound = heuristic(start)
+    expanded = 0
+    peak = 0
+    while bound < ub or (certificate and bound == ub):
+        # Chaque itération explore tout f <= bound ; échec => optimum > bound.
+        # L'ordre des presses est indifférent : on ne presse que des boutons
+        # d'indice >= au dernier pressé (multiensembles, pas séquences).
+        # Table : état -> (g, premier bouton autorisé, presses déjà faites de
+        # ce bouton) de la meilleure visite.
+        table: "OrderedDict[Tuple[int, ...], Tuple[int, int, int]]" = OrderedDict({start: (0, 0, 0)})
+        # [état, g, prochain bouton à essayer, premier bouton autorisé, presses de celui-ci]
+        stack = [[start, 0, 0, 0, 0]]
+        next_bound = math.inf
+        while stack:
+            top = stack[-1]
+            state, g, k, first, used = top
+            while k < len(buttons_idx) and (any(state[j] == 0 for j in buttons_idx[k])
+                                            or (used if k == first else 0) >= cap[k]):
+                k += 1
+            if k == len(buttons_idx):
+                stack.pop()
+                continue
+            top[2] = k + 1
+            ns = list(state)
+            for j in buttons_idx[k]:
+                ns[j] -= 1
+            ns_t = tuple(ns)
+            ng = g + 1
+            expanded += 1
+            h = heuristic(ns_t)
+            if h == 0:
+                note_search("idastar", expanded, max(peak, len(stack)))
+                if not certificate:
+                    return ng
+                # Bouton pressé depuis chaque état de la pile = son prochain bouton - 1
+                counts: Dict[FrozenSet[int], int] = defaultdict(int)
+                for entry in stack:
+                    counts[unique_buttons[entry[2] - 1]] += 1
+                return ng, presses_vector(button_sets, counts)
+            if ng + h > bound:
+                next_bound = min(next_bound, ng + h)
+                continue
+            nused = used + 1 if k == first else 1
+            # Une visite domine si elle autorisait plus de boutons (premier
+            # bouton plus petit) ou autant avec moins de presses du premier
+            seen = table.get(ns_t)
+            if seen is not None and seen[0] <= ng and (seen[1] < k or (seen[1] == k and seen[2] <= nused)):
+                continue
+            table[ns_t] = (ng, k, nused)
+            table.move_to_end(ns_t)
+            if len(table) > table_size:
+                table.popitem(last=False)
+            stack.append([ns_t, ng, k, k, nused])
+            if len(stack) > peak:
+                peak = len(stack)
+        if next_bound == math.inf:
+            note_search("idastar", expanded, peak)
+            raise ValueError("Search exhausted without solution; input may be unsolvable.")
+        bound = next_bound
+    note_search("idastar", expanded, peak)
+    # Aucune solution de coût < ub : la solution gloutonne est optimale
+    return ub
+
+ANYTIME_INCUMBENT_EVERY = 2000   # expansions entre deux tentatives d'amélioration de l'incumbent
+ANYTIME_CLOCK_EVERY = 256        # expansions entre deux lectures de l'horloge
+
+def min_presses_component_anytime(targets: List[int], button_sets: List[FrozenSet[int]],
+                                  deadline: Optional[float] = None,
+                                  on_update=None) -> Tuple[int, int]:
+    """
+    A* "anytime" : renvoie (borne inf, borne sup) sur l'optimum.
+    - borne sup : primal_upper_bound au départ, puis g + glouton depuis des
+      états de l'open list (toutes les ANYTIME_INCUMBENT_EVERY expansions) ;
+    - borne inf : plus petit f de l'open list (f dépilés croissants, heuristique cohérente).
+    on_update(lb, ub) est appelé à chaque amélioration. Si deadline
+    (time.monotonic()) est dépassée, on rend la meilleure paire courante ;
+    sinon lb == ub == optimum. La borne sup rendue est toujours finie : sans
+    incumbent à la deadline, on tente quick_upper_bound, puis on poursuit la
+    recherche jusqu'au premier incumbent.
+    """
+    if sum(targets) == 0:
+        return 0, 0
+    unique_buttons = list(set(button_sets))
+    Smax = max(len(s) for s in unique_buttons)
+
+    def heuristic(r: Tuple[int, ...]) -> int:
+        return (sum(r) + Smax - 1) // Smax
+
+    start = tuple(targets)
+    lb = heuristic(start)
+    ub = primal_upper_bound(targets, unique_buttons, deadline=deadline)
+    if ub is None and deadline is not None and time.monotonic() >= deadline:
+        ub = quick_upper_bound(targets, unique_buttons)
+    if ub is None:
+        ub = math.inf
+
+    def report() -> None:
+        if on_update is not None:
+            on_update(lb, ub)
+
+    def expired() -> bool:
+        return deadline is not None and ub < math.inf and time.monotonic() >= deadline
+
+    report()
+    if expired():
+        return lb, ub
+    pq = [(lb, 0, start)]
+    best: Dict[Tuple[int, ...], int] = {start: 0}
+    buttons_idx = [tuple(sorted(s)) for s in unique_buttons]
+    expanded = 0
+
+    while pq:
+        f, g, state = heappop(pq)
+        if f > lb:
+            lb = min(f, ub)
+            report()
+        if sum(state) == 0:
+            lb = ub = g
+            report()
+            return lb, ub
+        if f >= ub:
+            # Tout ce qui reste a f >= ub : l'incumbent est optimal
+            break
+        expanded += 1
+        if expanded % ANYTIME_CLOCK_EVERY == 0 and expired():
+            return lb, ub
+        if expanded % ANYTIME_INCUMBENT_EVERY == 0:
+            rest = greedy_upper_bound(list(state), unique_buttons)
+            if rest is not None and g + rest < ub:
+                ub = g + rest
+                report()
+        for s in buttons_idx:
+            if any(state[j] == 0 for j in s):
+                continue
+            ns = list(state)
+            for j in s:
+                ns[j] -= 1
+            ns_t = tuple(ns)
+            ng = g + 1
+            if ns_t in best and best[ns_t] <= ng:
+                continue
+            best[ns_t] = ng
+            nf = ng + heuristic(ns_t)
+            if nf < ub:
+                heappush(pq, (nf, ng, ns_t))
+    if ub == math.inf:
+        raise ValueError("Search exhausted without solution; input may be unsolvable.")
+    lb = ub
+    report()
+    return lb, ub
+
+def min_presses_component_numpy(targets: List[int], button_sets: List[FrozenSet[int]],
+                                certificate: bool = False, caps: Optional[Dict[FrozenSet[int], int]] = None):
+    """
+    BFS par niveaux vectorisé sur une composante (chaque press coûte 1, donc
+    le premier niveau qui contient l'état nul donne l'optimum).
+    Frontière = tableau 2-D (états × compteurs) ; tous les boutons sont
+    appliqués d'un coup par soustraction broadcastée de la matrice d'incidence,
+    les lignes négatives (overshoot) sont masquées et les doublons retirés via
+    np.unique sur une clé entière (base mixte) des lignes.
+    Avec certificate=True, retourne (presses, presses par bouton) : chaque
+    niveau garde l'indice (parent × bouton) de ses lignes.
+    caps : ignoré (les lignes ne comptent pas les presses par bouton).
+    """
+    np = _numpy()
+    if np is None:
+        raise RuntimeError("The 'numpy' engine requires NumPy (pip install numpy)")
+    if sum(targets) == 0:
+        return (0, [0] * len(button_sets)) if certificate else 0
+    unique_buttons = list(set(button_sets))
+    m = len(targets)
+    Smax = max(len(s) for s in unique_buttons)
+    dtype = np.int16 if max(targets) < np.iinfo(np.int16).max else np.int32
+    incidence = np.zeros((len(unique_buttons), m), dtype=dtype)
+    for i, s in enumerate(unique_buttons):
+        incidence[i, sorted(s)] = 1
+
+    ub = primal_upper_bound(targets, unique_buttons)
+    if ub is None:
+        ub = math.inf
+
+    # Clé unique par état : base mixte (t_j + 1), si elle tient dans un int64.
+    # Sinon, on déduplique sur les octets des lignes (vue np.void).
+    if math.prod(t + 1 for t in targets) < 2 ** 62:
+        radix = np.cumprod([1] + [t + 1 for t in targets[:-1]], dtype=np.int64)
+        def row_keys(rows):
+            return rows.astype(np.int64) @ radix
+    else:
+        def row_keys(rows):
+            rows = np.ascontiguousarray(rows)
+            return rows.view(np.dtype((np.void, rows.dtype.itemsize * m))).ravel()
+
+    frontier = np.array([targets], dtype=dtype)
+    visited = row_keys(frontier)
+    level = 0
+    expanded = 0
+    peak = 1
+    B = len(unique_buttons)
+    links: List = []   # links[L-1][r] = indice (ligne du niveau L-1) * B + bouton de la ligne r du niveau L
+    while frontier.shape[0]:
+        level += 1
+        expanded += frontier.shape[0]
+        peak = max(peak, frontier.shape[0])
+        # (F, 1, m) - (1, B, m) -> (F*B, m)
+        cand = (frontier[:, None, :] - incidence[None, :, :]).reshape(-1, m)
+        ok = (cand >= 0).all(axis=1)
+        cand = cand[ok]
+        if cand.shape[0] == 0:
+            break
+        src = np.nonzero(ok)[0] if certificate else None
+        sums = cand.sum(axis=1)
+        if (sums == 0).any():
+            note_search("numpy", expanded, peak)
+            if not certificate:
+                return level
+            counts: Dict[FrozenSet[int], int] = defaultdict(int)
+            r = int(src[np.argmax(sums == 0)])
+            for lvl in range(level - 1, -1, -1):
+                counts[unique_buttons[r % B]] += 1
+                if lvl:
+                    r = int(links[lvl - 1][r // B])
+            return level, presses_vector(button_sets, counts)
+        # Borne inf admissible (cf. A*) : on élague ce qui ne peut battre ub
+        keep = level + (sums + Smax - 1) // Smax <= ub
+        cand = cand[keep]
+        keys, first = np.unique(row_keys(cand), return_index=True)
+        fresh = ~np.isin(keys, visited, assume_unique=True)
+        frontier = cand[first[fresh]]
+        if certificate:
+            links.append(src[keep][first[fresh]])
+        visited = np.union1d(visited, keys[fresh])
+    note_search("numpy", expanded, peak)
     raise ValueError("Search exhausted without solution; input may be unsolvable.")
 
-def min_presses_machine(targets: List[int], buttons: List[FrozenSet[int]]) -> int:
-    # Compression des 0
+def min_presses_component_ilp(targets: List[int], button_sets: List[FrozenSet[int]],
+                              certificate: bool = False, caps: Optional[Dict[FrozenSet[int], int]] = None):
+    """
+    Programme linéaire en nombres entiers (scipy.optimize.milp / HiGHS) :
+    min Σx  s.c.  A·x = cibles, 0 <= x_i <= min des cibles couvertes par i, x entier.
+    caps ({bouton: presses max}, cf. presolve) resserre ces bornes.
+    Avec certificate=True, retourne (presses, x arrondi).
+    """
+    np, optimize = _numpy(), _scipy_optimize()
+    if optimize is None or np is None:
+        raise RuntimeError("The 'ilp' engine requires SciPy >= 1.9 and NumPy")
+    if sum(targets) == 0:
+        return (0, [0] * len(button_sets)) if certificate else 0
+    unique_buttons = list(set(button_sets))
+    m, B = len(targets), len(unique_buttons)
+    A = np.zeros((m, B))
+    for i, s in enumerate(unique_buttons):
+        A[sorted(s), i] = 1
+    upper = [min(min(targets[j] for j in s), (caps or {}).get(s, math.inf)) for s in unique_buttons]
+    res = optimize.milp(
+        c=np.ones(B),
+        constraints=optimize.LinearConstraint(A, targets, targets),
+        integrality=np.ones(B),
+        bounds=optimize.Bounds(0, upper),
+    )
+    note_search("ilp", int(getattr(res, "mip_node_count", 0) or 0), 0)
+    if res.status == 2:
+        raise ValueError("Search exhausted without solution; input may be unsolvable.")
+    if res.status != 0:
+        raise RuntimeError(f"ILP solver did not prove optimality: {res.message}")
+    if certificate:
+        counts = {s: int(round(v)) for s, v in zip(unique_buttons, res.x)}
+        return int(round(res.fun)), presses_vector(button_sets, counts)
+    return int(round(res.fun))
+
+# =========================
+# Portfolio : plusieurs moteurs en course par composante
+# =========================
+
+PORTFOLIO_ENGINES = ["ilp", "astar", "numpy", "idastar"]
+PORTFOLIO_TIME_BUDGET: Optional[float] = None      # secondes par composante (None = illimité)
+PORTFOLIO_MAX_PARALLEL = max(1, os.cpu_count() or 1)
+PORTFOLIO_STATS_PATH = "sol2_portfolio_stats.json"
+
+_portfolio_stats: Optional[Dict[str, Dict[str, int]]] = None
+
+# Composantes dont aucun moteur n'a fini dans PORTFOLIO_TIME_BUDGET : (forme, borne inf, presses rendues)
+PORTFOLIO_UNPROVEN: List[Tuple[str, int, int]] = []
+
+def component_shape(targets: List[int], button_sets: List[FrozenSet[int]]) -> str:
+    # Forme = (compteurs, boutons, ordre de grandeur de la somme des cibles)
+    return f"c{len(targets)}-b{len(set(button_sets))}-s{max(1, sum(targets)).bit_length()}"
+
+def load_portfolio_stats() -> Dict[str, Dict[str, int]]:
+    global _portfolio_stats
+    if _portfolio_stats is None:
+        try:
+            with open(PORTFOLIO_STATS_PATH, "r", encoding="utf-8") as f:
+                _portfolio_stats = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _portfolio_stats = {}
+    return _portfolio_stats
+
+def save_portfolio_stats() -> None:
+    if _portfolio_stats is None:
+        return
+    with open(PORTFOLIO_STATS_PATH, "w", encoding="utf-8") as f:
+        json.dump(_portfolio_stats, f, indent=1, sort_keys=True)
+
+def available_engines(names: List[str]) -> List[str]:
+    usable = []
+    for name in names:
+        if name == "numpy" and _numpy() is None:
+            continue
+        if name == "ilp" and (_scipy_optimize() is None or _numpy() is None):
+            continue
+        usable.append(name)
+    return usable
+
+def _portfolio_worker(name: str, targets: List[int], button_sets: List[FrozenSet[int]], queue,
+                      certificate: bool = False, caps: Optional[Dict[FrozenSet[int], int]] = None) -> None:
+    reset_search_stats()
+    try:
+        result = ENGINES[name](targets, button_sets, certificate=certificate, caps=caps)
+        queue.put((name, result, None, dict(SEARCH_STATS)))
+    except Exception as e:
+        queue.put((name, None, e, dict(SEARCH_STATS)))
+
+def portfolio_fallback(targets: List[int], button_sets: List[FrozenSet[int]], shape: str,
+                       certificate: bool = False):
+    """
+    Budget épuisé sans résultat exact : meilleure solution réalisable trouvée
+    en PRIMAL_TIME_BUDGET (heuristique primale, sinon complétion par le noyau),
+    notée dans PORTFOLIO_UNPROVEN avec sa borne inf. Une machine lente ne fait
+    donc plus échouer tout le run ; TimeoutError seulement si rien n'est trouvé.
+    """
+    buttons = list(dict.fromkeys(button_sets))
+    found = primal_solution(targets, buttons)
+    if found is None:
+        x = nullspace_completion(targets, [tuple(sorted(s)) for s in buttons])
+        found = None if x is None else (sum(x), x)
+    if found is None:
+        raise TimeoutError(f"No engine finished component {shape} within {PORTFOLIO_TIME_BUDGET}s "
+                           f"and no feasible fallback was found")
+    presses, x = found
+    lb = (sum(targets) + max(len(s) for s in buttons) - 1) // max(len(s) for s in buttons)
+    PORTFOLIO_UNPROVEN.append((shape, lb, presses))
+    note_search("portfolio:fallback", 0, 0)
+    print(f"⚠️ Component {shape}: no engine finished within {PORTFOLIO_TIME_BUDGET}s, "
+          f"using a feasible {presses} presses (lower bound {lb})", file=sys.stderr)
+    if certificate:
+        return presses, presses_vector(button_sets, dict(zip(buttons, x)))
+    return presses
+
+def min_presses_component_portfolio(targets: List[int], button_sets: List[FrozenSet[int]],
+                                    certificate: bool = False, caps: Optional[Dict[FrozenSet[int], int]] = None):
+    """
+    Lance plusieurs moteurs exacts en parallèle (un processus chacun) et garde
+    le premier résultat ; les autres sont tués. Les moteurs sont ordonnés par
+    nombre de victoires passées sur la même forme de composante, et seuls les
+    PORTFOLIO_MAX_PARALLEL premiers sont lancés. Si PORTFOLIO_TIME_BUDGET
+    s'écoule avant, on rend une solution réalisable (portfolio_fallback).
+    Avec certificate=True, retourne (presses, presses par bouton) du gagnant.
+    """
+    if sum(targets) == 0:
+        return (0, [0] * len(button_sets)) if certificate else 0
+    stats = load_portfolio_stats()
+    shape = component_shape(targets, button_sets)
+    wins = stats.get(shape, {})
+    engines = available_engines(PORTFOLIO_ENGINES)
+    engines.sort(key=lambda name: -wins.get(name, 0))   # tri stable : ordre par défaut à égalité
+    engines = engines[:PORTFOLIO_MAX_PARALLEL]
+
+    ctx = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=_portfolio_worker, args=(name, targets, button_sets, queue, certificate, caps),
+                         daemon=True)
+             for name in engines]
+    for p in procs:
+        p.start()
+    deadline = None if PORTFOLIO_TIME_BUDGET is None else time.monotonic() + PORTFOLIO_TIME_BUDGET
+    errors = []
+    try:
+        while len(errors) < len(procs):
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                name, result, error, counters = queue.get(timeout=timeout)
+            except Empty:
+                for p in procs:
+                    p.terminate()   # libère les cœurs pour l'heuristique de repli
+                return portfolio_fallback(targets, button_sets, shape, certificate)
+            if error is not None:
+                if isinstance(error, ValueError):
+                    raise error   # infaisabilité prouvée : inutile d'attendre les autres
+                errors.append((name, error))
+                continue
+            wins[name] = wins.get(name, 0) + 1
+            stats[shape] = wins
+            note_search(f"portfolio:{counters['engine']}", counters["nodes"], counters["peak_open"])
+            return result
+        raise RuntimeError(f"All portfolio engines failed: {errors}")
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+        for p in procs:
+            p.join()
+
+ENGINES = {
+    "astar": min_presses_component,
+    "numpy": min_presses_component_numpy,
+    "idastar": min_presses_component_idastar,
+    "ilp": min_presses_component_ilp,
+    "portfolio": min_presses_component_portfolio,
+}
+
+def min_presses_machine(targets: List[int], buttons: List[FrozenSet[int]], engine: str = "astar",
+                        stats: Optional[dict] = None, certificate: Optional[List[int]] = None) -> int:
+    """
+    Minimum de presses pour une machine. Si `stats` (dict) est fourni, il est
+    rempli avec la taille de la machine, les temps par phase et, pour chaque
+    composante, les compteurs du moteur (cf. SEARCH_STATS) et le RSS max.
+    Si `certificate` (liste) est fourni, il reçoit les presses par bouton,
+    alignées sur `buttons` (presolve + composantes remappés).
+    """
+    t0 = time.perf_counter()
+    original_buttons = buttons
+    if stats is not None:
+        stats.update(counters=len(targets), buttons=len(buttons), engine=engine, components=[])
+    # Presolve : presses forcées, boutons interdits / doublons (avant la
+    # compression, qui suppose qu'aucun bouton ne touche un compteur à 0)
+    counts: Optional[Dict[FrozenSet[int], int]] = {} if certificate is not None else None
+    fixed, targets, buttons, upper = presolve(targets, buttons, counts)
+    active = [j for j, v in enumerate(targets) if v > 0]
+    # Compression des 0 (les boutons gardent leur ordre : upper reste aligné)
     targets, buttons = compress_zeros(targets, buttons)
+    caps_by_button = dict(zip(buttons, upper))
     # Checks de faisabilité
     feasibility_checks(targets, buttons)
+    if stats is not None:
+        stats.update(fixed=fixed, presolve_time=time.perf_counter() - t0, search_time=0.0)
     if sum(targets) == 0:
-        return 0
+        if certificate is not None:
+            certificate[:] = presses_vector(original_buttons, counts)
+        return fixed
     # Décomposition en composantes
-    comps = components(targets, buttons)
+    counter_ids: Optional[List[List[int]]] = [] if certificate is not None else None
+    button_ids: List[List[int]] = []
+    comps = components(targets, buttons, counter_ids, button_ids)
     # Certaines machines peuvent n’avoir qu’une seule composante (cas général)
-    total = 0
-    for ct, cb in comps:
-        total += min_presses_component(ct, cb)
+    total = fixed
+    solve = ENGINES[engine]
+    for k, (ct, cb) in enumerate(comps):
+        # Bornes du presolve, remappées sur les boutons locaux de la composante
+        caps = {s: caps_by_button[buttons[bi]] for s, bi in zip(cb, button_ids[k])}
+        if stats is None and certificate is None:
+            total += solve(ct, cb, caps=caps)
+            continue
+        reset_search_stats()
+        t1 = time.perf_counter()
+        if certificate is None:
+            presses = solve(ct, cb, caps=caps)
+        else:
+            presses, x = solve(ct, cb, certificate=True, caps=caps)
+            # Compteur local j -> compteur compressé counter_ids[k][j] -> compteur d'origine
+            ids = [active[c] for c in counter_ids[k]]
+            for s, v in zip(cb, x):
+                if v:
+                    key = frozenset(ids[j] for j in s)
+                    counts[key] = counts.get(key, 0) + v
+        elapsed = time.perf_counter() - t1
+        if stats is not None:
+            stats["search_time"] += elapsed
+            stats["components"].append(dict(
+                counters=len(ct), buttons=len(set(cb)), presses=presses, time=elapsed,
+                peak_rss_kb=peak_rss_kb(), **SEARCH_STATS,
+            ))
+        total += presses
+    if certificate is not None:
+        certificate[:] = presses_vector(original_buttons, counts)
     return total
 
-def total_min_presses_part2(text: str) -> int:
+def min_presses_machine_anytime(targets: List[int], buttons: List[FrozenSet[int]],
+                                deadline: Optional[float] = None, on_update=None) -> Tuple[int, int]:
+    """
+    Bornes (inf, sup) sur le minimum de la machine, composante par composante
+    (chacune relit l'horloge : passé la deadline, elle ne reçoit que ses bornes
+    initiales). on_update(lb, ub) reçoit les bornes de la machine, composantes
+    restantes exclues.
+    """
+    fixed, targets, buttons, _ = presolve(targets, buttons)
+    targets, buttons = compress_zeros(targets, buttons)
+    feasibility_checks(targets, buttons)
+    lb, ub = fixed, fixed
+    if sum(targets) == 0:
+        return lb, ub
+    for ct, cb in components(targets, buttons):
+        done_lb, done_ub = lb, ub
+        component_update = None
+        if on_update is not None:
+            component_update = lambda clb, cub: on_update(done_lb + clb, done_ub + cub)
+        clb, cub = min_presses_component_anytime(ct, cb, deadline, component_update)
+        lb += clb
+        ub += cub
+    return lb, ub
+
+def total_min_presses_part2_anytime(text: str, deadline: float, on_update=None) -> Tuple[int, int]:
+    """
+    Mode anytime : après la deadline (time.monotonic()), les composantes
+    restantes ne reçoivent plus que leurs bornes initiales ; retourne (inf, sup).
+    on_update(lb, ub, done, total) suit les bornes cumulées des machines déjà
+    traitées (done sur total, machine courante comprise).
+    """
     machines = parse_lines(text)
+    lb, ub = 0, 0
+    for k, (targets, button_sets) in enumerate(machines, 1):
+        machine_update = None
+        if on_update is not None:
+            done_lb, done_ub = lb, ub
+            machine_update = lambda mlb, mub: on_update(done_lb + mlb, done_ub + mub, k, len(machines))
+        mlb, mub = min_presses_machine_anytime(targets, button_sets, deadline, machine_update)
+        lb += mlb
+        ub += mub
+    return lb, ub
+
+def bound_gap(lb: int, ub: float) -> float:
+    """Écart relatif (ub - lb) / ub ; 0 quand l'optimum est prouvé."""
+    if ub == math.inf:
+        return math.inf
+    return (ub - lb) / ub if ub else 0.0
+
+# Moteurs dont les résultats sont toujours vérifiés par certificat
+AUTO_VERIFY_ENGINES = {"portfolio"}
+
+def total_min_presses_part2(text: str, engine: str = "astar", stats: Optional[dict] = None,
+                            verify: bool = False) -> int:
+    """
+    Total sur toutes les machines. Si `stats` est fourni, il reçoit
+    {"engine", "parse_time", "total_time", "peak_rss_kb", "total", "machines": [...]}
+    (une entrée par ligne d'entrée, cf. min_presses_machine).
+    Avec verify (ou un moteur de AUTO_VERIFY_ENGINES), chaque machine rend un
+    certificat, vérifié en lot à la fin ; RuntimeError si l'un est faux.
+    """
+    t0 = time.perf_counter()
+    machines = parse_lines(text)
+    verify = verify or engine in AUTO_VERIFY_ENGINES
+    if stats is not None:
+        stats.update(engine=engine, parse_time=time.perf_counter() - t0, machines=[])
     total = 0
-    for targets, button_sets in machines:
-        total += min_presses_machine(targets, button_sets)
+    certificates: List[List[int]] = []
+    totals: List[int] = []
+    for line, (targets, button_sets) in enumerate(machines, 1):
+        machine_stats = None
+        if stats is not None:
+            machine_stats = {"line": line}
+            stats["machines"].append(machine_stats)
+        x: Optional[List[int]] = [] if verify else None
+        presses = min_presses_machine(targets, button_sets, engine, machine_stats, x)
+        if machine_stats is not None:
+            machine_stats["presses"] = presses
+        if x is not None:
+            certificates.append(x)
+            totals.append(presses)
+        total += presses
+    if engine == "portfolio":
+        save_portfolio_stats()
+    if verify:
+        t1 = time.perf_counter()
+        bad = verify_certificates(machines, certificates, totals)
+        if stats is not None:
+            stats["verify_time"] = time.perf_counter() - t1
+        if bad:
+            lines = ", ".join(str(k + 1) for k in bad)
+            raise RuntimeError(f"Engine '{engine}' returned invalid certificates for line(s) {lines}")
+    if stats is not None:
+        stats.update(total=total, total_time=time.perf_counter() - t0, peak_rss_kb=peak_rss_kb())
     return total
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="AoC 2025 day 10 part 2 (joltage counters)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="astar",
+                        help="moteur de recherche par composante (défaut : astar)")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="portfolio : budget en secondes par composante")
+    parser.add_argument("--max-parallel", type=int, default=PORTFOLIO_MAX_PARALLEL,
+                        help="portfolio : nombre max de moteurs lancés en parallèle")
+    parser.add_argument("--memory-limit-mb", type=float, default=None,
+                        help="plafond mémoire de la recherche ; au-delà, A* bascule sur IDA*")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="mode anytime : secondes max, rend la meilleure borne sup et l'écart")
+    parser.add_argument("--stats", metavar="PATH", default=None,
+                        help="écrit les stats par machine/composante en JSON ('-' = stderr)")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="profil cProfile (pstats) écrit dans PATH, top 25 affiché sur stderr")
+    parser.add_argument("--tracemalloc", metavar="N", type=int, default=None,
+                        help="trace les allocations et rapporte les N lignes qui allouent le plus")
+    parser.add_argument("--verify", action="store_true",
+                        help="reconstruit les presses par bouton et vérifie A·x = cibles pour chaque machine")
+    args = parser.parse_args(argv)
+    if args.deadline is not None and args.stats is not None:
+        parser.error("--stats is not available in anytime mode (--deadline)")
+    return args
+
+STATS_SLOWEST_SHOWN = 5   # machines les plus lentes résumées sur stderr avec --stats
+
+def write_stats(stats: dict, path: str) -> None:
+    """Écrit les stats JSON et résume les machines les plus lentes sur stderr."""
+    text = json.dumps(stats, indent=1)
+    if path == "-":
+        print(text, file=sys.stderr)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    slowest = sorted(stats["machines"], key=lambda m: -m.get("search_time", 0.0))
+    for m in slowest[:STATS_SLOWEST_SHOWN]:
+        nodes = sum(c["nodes"] for c in m["components"])
+        print(f"line {m['line']}: {m['search_time']:.3f}s search, {len(m['components'])} component(s), "
+              f"{nodes} nodes", file=sys.stderr)
+
+def top_allocations(limit: int) -> List[dict]:
+    """Lignes qui allouent le plus (tracemalloc doit être démarré)."""
+    import tracemalloc
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    print(f"tracemalloc: current {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB", file=sys.stderr)
+    top = []
+    for stat in snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        print(f"  {frame.filename}:{frame.lineno}: {stat.size / 1024:.1f} KiB in {stat.count} blocks",
+              file=sys.stderr)
+        top.append({"file": frame.filename, "line": frame.lineno, "size": stat.size, "count": stat.count})
+    return top
+
+def run_profiled(func, path: str):
+    """Exécute func() sous cProfile, écrit le profil dans path et affiche le top 25."""
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        profiler.dump_stats(path)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+
 def main():
+    global PORTFOLIO_TIME_BUDGET, PORTFOLIO_MAX_PARALLEL, MEMORY_LIMIT_MB
+    args = parse_args()
+    MEMORY_LIMIT_MB = args.memory_limit_mb
+    PORTFOLIO_TIME_BUDGET = args.time_budget
+    PORTFOLIO_MAX_PARALLEL = max(1, args.max_parallel)
     print("Reading input...")
     data = sys.stdin.read()
     if not data.strip():
         print("Usage: pipe your input text into stdin or run: python solve_factory_part2.py < input.txt")
         return
-    ans = total_min_presses_part2(data)
+    if args.deadline is not None:
+        def show_bounds(lb: int, ub: int, done: int, total: int) -> None:
+            sys.stderr.write(f"\r[{done}/{total}] {lb} <= min <= {ub} (gap {bound_gap(lb, ub):.2%})")
+            sys.stderr.flush()
+
+        lb, ub = total_min_presses_part2_anytime(data, time.monotonic() + args.deadline, show_bounds)
+        sys.stderr.write("\n")
+        if lb == ub:
+            print(ub)
+        else:
+            print(f"{ub} (lower bound {lb}, gap {bound_gap(lb, ub):.2%})")
+        return
+    stats = {} if args.stats is not None else None
+    if args.tracemalloc is not None:
+        import tracemalloc
+        tracemalloc.start()
+
+    def solve() -> int:
+        return total_min_presses_part2(data, args.engine, stats, args.verify)
+
+    ans = run_profiled(solve, args.profile) if args.profile else solve()
+    if args.tracemalloc is not None:
+        allocations = top_allocations(args.tracemalloc)
+        if stats is not None:
+            stats["tracemalloc"] = allocations
+    if stats is not None:
+        write_stats(stats, args.stats)
+    if PORTFOLIO_UNPROVEN:
+        lb = ans - sum(presses - clb for _, clb, presses in PORTFOLIO_UNPROVEN)
+        print(f"{ans} (lower bound {lb}, gap {bound_gap(lb, ans):.2%})")
+        return
     print(ans)
 
 if __name__ == "__main__":
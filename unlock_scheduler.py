@@ -0,0 +1,268 @@
+import argparse
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+# =========================
+# Ordonnanceur d'ouverture : tout est chaud quand le puzzle se débloque
+# =========================
+# Quelques dizaines de secondes avant l'heure d'ouverture (minuit, heure de
+# New York), on résout les DNS, on ouvre les connexions TLS (AoC + API des
+# modèles), on lance le navigateur avec la session edge_state.json et on
+# démarre le forkserver des solveurs. À l'heure pile : énoncé (requests) et
+# input (navigateur) en parallèle, puis génération immédiate (all.py).
+# Ensuite, optionnellement, mode watch de la partie 2 (all2V2.py), toujours chaud.
+
+UNLOCK_TIMEZONE = "America/New_York"
+UNLOCK_HOUR = 0
+PREWARM_LEAD = 90.0            # secondes avant l'ouverture pour tout préchauffer
+UNLOCK_RETRY_INTERVAL = 0.5    # secondes avant le deuxième essai si la page n'est pas encore ouverte
+UNLOCK_RETRY_MAX_INTERVAL = 2.0  # l'intervalle double à chaque essai, jusqu'à ce plafond
+UNLOCK_RETRY_WINDOW = 30.0     # secondes d'essais après l'heure d'ouverture
+UNLOCK_SPIN = 0.05             # dernière fraction de seconde attendue par petits pas
+
+AOC_URL = "https://adventofcode.com"
+STATEMENT_SELECTOR = "article.day-desc"
+WARM_HOSTS = ("adventofcode.com", "api.openai.com", "api.anthropic.com",
+              "generativelanguage.googleapis.com")
+BROWSER_STATE = "edge_state.json"
+
+
+def unlock_timezone():
+    """Fuseau de l'ouverture ; heure normale de l'Est (UTC-5, décembre) si tzdata est absent."""
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(UNLOCK_TIMEZONE)
+    except Exception:
+        return timezone(timedelta(hours=-5), "EST")
+
+
+def next_unlock(now: datetime | None = None) -> datetime:
+    """Prochaine ouverture (datetime avec fuseau), strictement après now."""
+    tz = unlock_timezone()
+    now = (now or datetime.now(tz)).astimezone(tz)
+    unlock = now.replace(hour=UNLOCK_HOUR, minute=0, second=0, microsecond=0)
+    if unlock <= now:
+        unlock += timedelta(days=1)
+    return unlock
+
+
+def puzzle_url(unlock: datetime) -> str:
+    day = unlock.astimezone(unlock_timezone())
+    return f"{AOC_URL}/{day.year}/day/{day.day}"
+
+
+def sleep_until(moment: datetime) -> None:
+    """Dort jusqu'à moment (horloge murale), les UNLOCK_SPIN dernières secondes par petits pas."""
+    target = moment.timestamp()
+    while True:
+        remaining = target - time.time()
+        if remaining <= 0:
+            return
+        time.sleep(remaining - UNLOCK_SPIN if remaining > 2 * UNLOCK_SPIN else 0.001)
+
+
+# ---------- préchauffage ----------
+
+def resolve_hosts(hosts=WARM_HOSTS) -> None:
+    for host in hosts:
+        try:
+            socket.getaddrinfo(host, 443, proto=socket.IPPROTO_TCP)
+        except OSError as e:
+            print(f"⚠️ DNS {host} : {e}")
+
+
+def warm_llm_connections() -> None:
+    """
+    Construit les clients (import des SDK) et fait un appel gratuit par
+    fournisseur pour laisser une connexion TLS ouverte dans leur pool.
+    """
+    from providers import get_openai_client, get_claude_client, get_gemini_model
+    from all import GEMINI_MODEL
+
+    def openai_call():
+        get_openai_client().models.list()
+
+    def claude_call():
+        get_claude_client().models.list(limit=1)
+
+    def gemini_call():
+        get_gemini_model(GEMINI_MODEL)
+        import google.generativeai as genai
+        next(iter(genai.list_models()), None)
+
+    def warm(label, call):
+        try:
+            call()
+        except Exception as e:
+            print(f"⚠️ Préchauffage {label} : {e}")
+
+    threads = [threading.Thread(target=warm, args=(label, call), daemon=True)
+               for label, call in (("OpenAI", openai_call), ("Claude", claude_call), ("Gemini", gemini_call))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def warm_solver_runtime() -> None:
+    """Forkserver (numpy/scipy préchargés) et interpréteurs des solveurs (cache disque, probe des imports)."""
+    import all2V2
+    from interpreters import available_interpreters, missing_modules
+    if all2V2.FORKSERVER_ENABLED:
+        all2V2.get_forkserver()
+    if all2V2.EXECUTION_QUEUE_URL:
+        all2V2.get_execution_queue()
+    for command in available_interpreters().values():
+        missing_modules(command, {"numpy", "scipy"})
+
+
+def open_session():
+    """Session requests (keep-alive) avec une connexion TLS déjà ouverte vers AoC."""
+    import requests
+    session = requests.Session()
+    session.headers["User-Agent"] = "Mozilla/5.0"
+    try:
+        session.head(AOC_URL, timeout=10)
+    except requests.RequestException as e:
+        print(f"⚠️ Préchauffage {AOC_URL} : {e}")
+    return session
+
+
+class WarmBrowser:
+    """Chromium lancé avec la session edge_state.json, une page AoC déjà ouverte (TLS chaud)."""
+
+    def __init__(self, state_path: str = BROWSER_STATE):
+        from playwright.sync_api import sync_playwright
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(headless=True)
+        self.context = self._browser.new_context(storage_state=state_path)
+        page = self.context.new_page()
+        try:
+            page.goto(AOC_URL)
+        finally:
+            page.close()
+
+    def close(self) -> None:
+        self._browser.close()
+        self._playwright.stop()
+
+
+def prewarm(session_out: list, browser_out: list) -> None:
+    """Lance tous les préchauffages ; le navigateur reste sur ce thread (API sync de Playwright)."""
+    start = time.perf_counter()
+    threads = [threading.Thread(target=fn, daemon=True)
+               for fn in (resolve_hosts, warm_llm_connections, warm_solver_runtime)]
+    for t in threads:
+        t.start()
+    session_out.append(open_session())
+    try:
+        browser_out.append(WarmBrowser())
+    except Exception as e:
+        print(f"⚠️ Navigateur indisponible ({e}) : l'input sera récupéré par un navigateur froid (relancé à chaque essai).")
+    for t in threads:
+        t.join()
+    print(f"🔥 Préchauffage terminé en {time.perf_counter() - start:.1f}s")
+
+
+# ---------- ouverture ----------
+
+def retry_intervals():
+    """Attentes successives entre deux essais : UNLOCK_RETRY_INTERVAL doublé jusqu'au plafond."""
+    interval = UNLOCK_RETRY_INTERVAL
+    while True:
+        yield interval
+        interval = min(interval * 2, UNLOCK_RETRY_MAX_INTERVAL)
+
+
+def fetch_statement(session, url: str, deadline: float) -> str:
+    """Énoncé (texte du sélecteur), en réessayant (avec backoff) tant que la page n'est pas ouverte."""
+    from all2V2 import scrape_text
+    for interval in retry_intervals():
+        response = session.get(url, timeout=10)
+        if response.ok or time.time() >= deadline:
+            response.raise_for_status()
+            return scrape_text(url, STATEMENT_SELECTOR, html=response.text)
+        time.sleep(interval)
+
+
+def fetch_input(context, url: str, input_file: str, deadline: float) -> None:
+    """
+    Input via le navigateur chaud (ou, si context est None, un navigateur lancé
+    à chaque essai), en réessayant avec backoff tant que /input ne répond pas 200.
+    """
+    from all import fetch_and_save_to_file
+    for interval in retry_intervals():
+        status = fetch_and_save_to_file(f"{url}/input", "pre", input_file, context=context, settle_ms=0)
+        if status == 200 or time.time() >= deadline:
+            return
+        time.sleep(interval)
+
+
+def run_at_unlock(unlock: datetime, input_file: str = "input.txt", part2_file: str = "enonce2.txt",
+                  lead: float = PREWARM_LEAD, watch: bool = False) -> None:
+    import all as part1
+    import all2V2
+    url = puzzle_url(unlock)
+    print(f"⏰ Ouverture de {url} à {unlock.isoformat()} ; préchauffage {lead:.0f}s avant.")
+    sleep_until(unlock - timedelta(seconds=lead))
+
+    sessions: list = []
+    browsers: list = []
+    try:
+        prewarm(sessions, browsers)
+        sleep_until(unlock)
+        fired = time.perf_counter()
+        deadline = time.time() + UNLOCK_RETRY_WINDOW
+
+        statement: list = []
+        errors: list = []
+
+        def statement_job():
+            try:
+                statement.append(fetch_statement(sessions[0], url, deadline))
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=statement_job, daemon=True)
+        thread.start()
+        fetch_input(browsers[0].context if browsers else None, url, input_file, deadline)
+        thread.join()
+        print(f"📥 Énoncé et input récupérés en {time.perf_counter() - fired:.2f}s après l'ouverture")
+        if errors:
+            raise errors[0]
+
+        part1.solve_advent_of_code_with_all(url, input_file, problem_text=statement[0])
+        print(f"🏁 Partie 1 terminée {time.perf_counter() - fired:.1f}s après l'ouverture")
+    finally:
+        for browser in browsers:
+            browser.close()
+        if not watch:
+            all2V2.shutdown_forkserver()
+    if watch:
+        all2V2.watch_part2(url, input_file, part2_file, initial_run=False)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Préchauffe tout puis lance la partie 1 à l'ouverture du puzzle")
+    parser.add_argument("--at", default=None,
+                        help="heure d'ouverture ISO 8601 (défaut : prochain minuit à New York)")
+    parser.add_argument("--lead", type=float, default=PREWARM_LEAD,
+                        help="secondes de préchauffage avant l'ouverture")
+    parser.add_argument("--input", default="input.txt", help="fichier où écrire l'input")
+    parser.add_argument("--statement", default="enonce2.txt", help="énoncé de la partie 2 (mode watch)")
+    parser.add_argument("--watch", action="store_true",
+                        help="après la partie 1, reste chaud et surveille l'énoncé de la partie 2")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.at:
+        unlock = datetime.fromisoformat(args.at)
+        if unlock.tzinfo is None:
+            unlock = unlock.replace(tzinfo=unlock_timezone())
+    else:
+        unlock = next_unlock()
+    run_at_unlock(unlock, args.input, args.statement, args.lead, args.watch)